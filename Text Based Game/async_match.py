@@ -0,0 +1,515 @@
+"""
+Async Match Module for Grand Chess Realms
+Runs a chess match on an asyncio event loop. Engine searches, keyboard input,
+moves from the Chessnut Pro board and the clock display are concurrent tasks,
+so the clock keeps ticking while the engine thinks and any of them can be
+cancelled.
+"""
+
+import os
+import sys
+import time
+import queue
+import asyncio
+import logging
+from contextlib import ExitStack
+
+import chess
+import chess.engine
+
+from chess_clock import ChessClock
+from engine_strength import strength_profile, search_limit
+from opening_book import BookSession
+from builtin_engine import BuiltinEngine, DEFAULT_MOVE_TIME
+from move_input import AmbiguousMoveError, resolve_move, promotion_candidates
+from input_mux import line_reader
+
+logger = logging.getLogger("AsyncMatch")
+
+# Seconds between redraws of the on-screen clock
+CLOCK_TICK_INTERVAL = 1.0
+
+# Seconds between polls of the Chessnut move queue (or typed lines) on event loops that can't watch them
+QUEUE_POLL_INTERVAL = 0.05
+
+
+async def run_on_engine(engine, command):
+    """
+    Await an engine command without blocking the calling event loop.
+
+    A SimpleEngine drives its UCI protocol on a private event loop. The
+    protocol's coroutine is scheduled there and awaited here, so cancelling
+    the awaiting task cancels the command (a search receives "stop").
+
+    Args:
+        engine: A chess.engine.SimpleEngine
+        command: Function taking the engine's UciProtocol and returning a coroutine
+
+    Returns:
+        The result of the command
+    """
+    future = asyncio.run_coroutine_threadsafe(command(engine.protocol), engine.protocol.loop)
+    return await asyncio.wrap_future(future)
+
+
+async def queue_item(items, on_empty=None):
+    """
+    Wait for the next item of a SelectableQueue. The event loop watches the
+    queue, so the item is taken the moment it arrives and cancelling never
+    loses one.
+
+    Args:
+        items: SelectableQueue to take from
+        on_empty: Function called before each wait on an empty queue
+
+    Returns:
+        Tuple of (item, time.monotonic() at which it was put)
+    """
+    loop = asyncio.get_running_loop()
+
+    while True:
+        items.clear_wakeups()
+        try:
+            return items.get_nowait(), items.last_put_time
+        except queue.Empty:
+            pass
+        if on_empty:
+            on_empty()
+
+        readable = loop.create_future()
+        try:
+            loop.add_reader(items.fileno(), lambda: readable.done() or readable.set_result(None))
+        except NotImplementedError:
+            # Event loops without add_reader (Windows): poll
+            await asyncio.sleep(QUEUE_POLL_INTERVAL)
+            continue
+        try:
+            await readable
+        finally:
+            loop.remove_reader(items.fileno())
+
+
+async def read_line(prompt=""):
+    """
+    Read a line from stdin without blocking the event loop.
+
+    Args:
+        prompt: Text to show before reading
+
+    Returns:
+        The line without its trailing newline
+
+    Raises:
+        EOFError: If stdin was closed
+    """
+    print(prompt, end="", flush=True)
+    loop = asyncio.get_running_loop()
+
+    if os.name != "nt" and sys.stdin.isatty():
+        # Wait for the terminal to hand over a complete line; cancelling
+        # leaves nothing blocked behind
+        future = loop.create_future()
+
+        def on_readable():
+            if not future.done():
+                future.set_result(sys.stdin.readline())
+
+        fd = sys.stdin.fileno()
+        loop.add_reader(fd, on_readable)
+        try:
+            line = await future
+        finally:
+            loop.remove_reader(fd)
+    else:
+        # Read on the shared reader thread, one line per request. A read
+        # cancelled by a board move stays pending; its line goes to the
+        # next prompt, which takes it from the same reader (read_input)
+        reader = line_reader(sys.stdin)
+
+        def request_line():
+            if reader.closed:
+                raise EOFError("stdin closed")
+            reader.request()
+
+        line, _ = await queue_item(reader.lines, request_line)
+
+    if not line:
+        raise EOFError("stdin closed")
+    return line.rstrip("\n")
+
+
+class AsyncMatchDriver:
+    """
+    Drives one match between the player (White) and an engine opponent (Black).
+    """
+
+    def __init__(self, manager, opponent_name, opponent_elo, time_control="90/30", chessnut=None, ponder=False,
+                 repertoire=None):
+        """
+        Initialize the match.
+
+        Args:
+            manager: The ChessMatchManager providing the engine and display
+            opponent_name: Name of the opponent for display
+            opponent_elo: Elo rating of the opponent
+            time_control: Time control format (60/30, 90/30, 120/30, or None)
+            chessnut: Optional ChessnutInterface for moves on the physical board
+            ponder: Let the engine keep searching the expected reply on the player's time
+            repertoire: Optional file name of the opponent's own opening book
+        """
+        self.manager = manager
+        self.opponent_name = opponent_name
+        self.opponent_elo = opponent_elo
+        self.time_control = time_control
+        self.chessnut = chessnut
+
+        # Weak opponents get small search budgets, and pondering is only
+        # worth its CPU for opponents that search deeply
+        self.skill_level = manager.elo_to_skill_level(opponent_elo)
+        self.ponder = ponder and strength_profile(self.skill_level)["ponder"]
+
+        # The opening is played from the book without asking the engine
+        self.book = BookSession(manager.books.get_book(repertoire), personality=opponent_name,
+                                max_plies=manager.max_book_plies)
+        self.board = chess.Board()
+        self.tablebase_moves = 0
+
+        # Pondering statistics
+        self.expected_reply = None
+        self.pondering = False
+        self.ponder_hits = 0
+        self.ponder_misses = 0
+        self.reply_latencies = []
+
+        # Seconds from a move on the physical board to it being played
+        self.board_move_latencies = []
+        self._board_event_time = None
+
+        # Only runs while a side is choosing its move
+        self.clock = ChessClock.from_time_control(time_control) if time_control else None
+
+        self._task = None
+
+    def cancel(self):
+        """Abort the match; run() raises asyncio.CancelledError"""
+        if self._task:
+            self._task.get_loop().call_soon_threadsafe(self._task.cancel)
+
+    async def run(self):
+        """
+        Play the match to the end.
+
+        Returns:
+            Result of the match: "win", "loss", "draw"
+        """
+        self._task = asyncio.current_task()
+
+        # Leasing may have to wait for a free engine, so don't block the loop
+        with ExitStack() as stack:
+            engine = await asyncio.to_thread(stack.enter_context, self.manager.lease_engine(self.opponent_elo, builtin=True))
+            try:
+                return await self._play(engine)
+            finally:
+                # Stop pondering before the engine goes back to the pool
+                await self._stop_pondering(engine)
+                if self.reply_latencies:
+                    logger.info(f"Match vs {self.opponent_name}: {self.stats()}")
+
+    def stats(self):
+        """
+        Get engine reply statistics for the match.
+
+        Returns:
+            Dictionary with reply latencies, pondering hit rate and the latency
+            from moves on the physical board to the moves being played
+        """
+        pondered = self.ponder_hits + self.ponder_misses
+        latencies = self.reply_latencies
+        board_latencies = self.board_move_latencies
+        return {
+            "book_moves": self.book.moves_played,
+            "tablebase_moves": self.tablebase_moves,
+            "engine_moves": len(latencies),
+            "avg_reply_latency": sum(latencies) / len(latencies) if latencies else 0.0,
+            "max_reply_latency": max(latencies) if latencies else 0.0,
+            "ponder_hits": self.ponder_hits,
+            "ponder_misses": self.ponder_misses,
+            "ponder_hit_rate": self.ponder_hits / pondered if pondered else 0.0,
+            "board_moves": len(board_latencies),
+            "avg_board_move_latency": sum(board_latencies) / len(board_latencies) if board_latencies else 0.0,
+        }
+
+    async def _play(self, engine):
+        """Main game loop"""
+        board = self.board
+
+        # Set initial board position on Chessnut if connected
+        if self._chessnut_connected():
+            print("Synchronizing your Chessnut Pro board...")
+            if await asyncio.to_thread(self.chessnut.set_board_to_match_position, board):
+                print("Board synchronized. Make sure pieces are in the starting position.")
+            else:
+                print("Failed to synchronize board. Please set up the starting position manually.")
+
+        # Introduction to the match
+        self.manager.display_match_intro(self.opponent_name, self.opponent_elo, self.time_control)
+
+        while not board.is_game_over():
+            # Display the board
+            self.manager.display_board(board)
+
+            # End the match early if the tablebases show it is decided
+            verdict = self.manager.adjudicate(board)
+            if verdict:
+                return verdict
+
+            # Display remaining time if using a clock
+            if self.clock:
+                self.manager.display_clock(self.clock.remaining(chess.WHITE), self.clock.remaining(chess.BLACK))
+
+            # Player's turn (white)
+            if board.turn == chess.WHITE:
+                try:
+                    move = await self._on_clock(chess.WHITE, self.get_player_move())
+                except asyncio.TimeoutError:
+                    print("\nYou've run out of time!")
+                    return "loss"
+
+                if move is None:
+                    print("You resigned the match.")
+                    return "loss"
+
+                if self._board_event_time is not None:
+                    self.board_move_latencies.append(time.monotonic() - self._board_event_time)
+                    self._board_event_time = None
+
+                if self.expected_reply is not None:
+                    if move == self.expected_reply:
+                        self.ponder_hits += 1
+                    else:
+                        self.ponder_misses += 1
+                    self.expected_reply = None
+
+                board.push(move)
+
+            # Engine's turn (black)
+            else:
+                print(f"\n{self.opponent_name} is thinking...")
+
+                try:
+                    move = await self._on_clock(chess.BLACK, self.get_engine_move(engine))
+                except asyncio.TimeoutError:
+                    print(f"{self.opponent_name} has run out of time!")
+                    return "win"
+
+                board.push(move)
+                print(f"\n{self.opponent_name} played: {move.uci()}")
+                await self.after_engine_move(move)
+
+        # Display final position
+        self.manager.display_board(board)
+
+        # Determine and return the result
+        return self.manager.get_match_result(board)
+
+    async def _on_clock(self, color, coro):
+        """
+        Run a move-producing coroutine while the given side's clock runs.
+
+        Args:
+            color: Side whose clock is running
+            coro: Coroutine returning the move
+
+        Returns:
+            The coroutine's result
+
+        Raises:
+            asyncio.TimeoutError: If the side ran out of time
+        """
+        if not self.clock:
+            return await coro
+
+        self.clock.start(color)
+        ticker = asyncio.create_task(self._tick_clock())
+        completed = False
+        try:
+            result = await asyncio.wait_for(coro, timeout=max(0.0, self.clock.remaining(color)))
+            completed = True
+            return result
+        finally:
+            ticker.cancel()
+            self.clock.stop(add_increment=completed)
+
+    async def _tick_clock(self):
+        """Redraw the clock once a second while a side is thinking"""
+        while True:
+            await asyncio.sleep(CLOCK_TICK_INTERVAL)
+            self.manager.draw_live_clock(self.clock.remaining(chess.WHITE), self.clock.remaining(chess.BLACK))
+
+    async def get_player_move(self):
+        """
+        Wait for the player's move from the keyboard or the physical board,
+        whichever comes first.
+
+        Returns:
+            A legal chess.Move, or None if the player resigned
+        """
+        self._board_event_time = None
+        sources = [asyncio.create_task(self._keyboard_move())]
+        if self._chessnut_connected():
+            print("Waiting for move on Chessnut Pro board or enter move manually...")
+            sources.append(asyncio.create_task(self._physical_move()))
+
+        try:
+            done, _ = await asyncio.wait(sources, return_when=asyncio.FIRST_COMPLETED)
+            winner = next(task for task in sources if task in done)
+            if winner is sources[0]:
+                # Typed moves have no board latency
+                self._board_event_time = None
+            return winner.result()
+        finally:
+            for task in sources:
+                task.cancel()
+            await asyncio.gather(*sources, return_exceptions=True)
+
+    async def _keyboard_move(self):
+        """Read moves from the keyboard until a legal one (or a resignation) is entered"""
+        while True:
+            text = (await read_line("\nYour move (e.g., e4, Nf3, g1f3): ")).strip()
+
+            # Handle special commands
+            if text.lower() in ['quit', 'exit', 'resign']:
+                confirm = (await read_line("Are you sure you want to resign? (y/n): ")).lower()
+                if confirm.startswith('y'):
+                    return None
+                continue
+
+            try:
+                return self.manager.parse_move(self.board, text)
+            except AmbiguousMoveError as e:
+                # A pawn move to the last rank without the piece: just ask for it
+                choices = promotion_candidates(e)
+                if choices:
+                    return await self._choose_promotion(choices)
+                print(e)
+            except ValueError as e:
+                print(e)
+
+    async def _physical_move(self):
+        """Wait for a legal move on the Chessnut Pro board"""
+        while True:
+            physical_move, event_time = await self._next_board_move()
+
+            print(f"Move detected on physical board: {physical_move}")
+            move = await self._physical_to_move(physical_move)
+            if move:
+                self._board_event_time = event_time
+                return move
+            print("Illegal move detected on physical board. Please make a valid move.")
+
+    async def _next_board_move(self):
+        """
+        Wait for the next UCI move in the board's move queue.
+
+        Returns:
+            Tuple of (UCI move, time.monotonic() at which the board reported it)
+        """
+        return await queue_item(self.chessnut.move_queue)
+
+    async def _physical_to_move(self, physical_move):
+        """Convert a UCI string from the board to a legal move, asking for promotions"""
+        try:
+            return resolve_move(self.board, physical_move)
+        except AmbiguousMoveError as e:
+            # The board can't tell which piece a pawn promoted to
+            choices = promotion_candidates(e)
+            return await self._choose_promotion(choices) if choices else None
+        except ValueError:
+            return None
+
+    async def _choose_promotion(self, choices):
+        """Ask which piece to promote to among the legal promotions"""
+        piece = None
+        while piece not in choices:
+            piece = (await read_line("Promote to (q)ueen, (r)ook, (b)ishop, or k(n)ight? ")).lower()
+            if piece not in choices:
+                print("Invalid choice. Please enter q, r, b, or n.")
+        return choices[piece]
+
+    async def get_engine_move(self, engine):
+        """
+        Get the opponent's move.
+
+        Args:
+            engine: The leased Stockfish or built-in engine
+
+        Returns:
+            A legal chess.Move
+        """
+        book_move = self.book.probe(self.board)
+        if book_move:
+            return book_move
+
+        # Endgames with few pieces are played perfectly from the tablebases
+        tablebase_move = await asyncio.to_thread(self.manager.tablebase.best_move, self.board.copy())
+        if tablebase_move:
+            await self._stop_pondering(engine)
+            self.tablebase_moves += 1
+            return tablebase_move
+
+        if isinstance(engine, BuiltinEngine):
+            return await self._builtin_move(engine)
+
+        # Budget by opponent strength; full strength opponents let the engine's
+        # own time manager budget the clock
+        limit = search_limit(self.skill_level, self.clock, chess.BLACK)
+        board = self.board.copy()
+
+        # When pondering, the engine keeps searching its expected reply after
+        # returning a move. If the player then plays that reply, the next
+        # search continues with a ponderhit; otherwise it is stopped first.
+        started = time.monotonic()
+        self.pondering = False
+        result = await run_on_engine(
+            engine, lambda protocol: protocol.play(board, limit, ponder=self.ponder, game=self))
+        self.reply_latencies.append(time.monotonic() - started)
+
+        if self.ponder and result.ponder:
+            self.expected_reply = result.ponder
+            self.pondering = True
+        return result.move
+
+    async def _builtin_move(self, engine):
+        """Search with the built-in engine in a worker thread"""
+        # The engine's strength level caps its search; the clock only bounds it
+        limit = self.clock.engine_limit() if self.clock else chess.engine.Limit(time=DEFAULT_MOVE_TIME)
+        board = self.board.copy()
+
+        started = time.monotonic()
+        try:
+            result = await asyncio.to_thread(engine.play, board, limit)
+        except asyncio.CancelledError:
+            # The thread can't be cancelled, but the search can be cut short
+            engine.stop()
+            raise
+        self.reply_latencies.append(time.monotonic() - started)
+        return result.move
+
+    async def _stop_pondering(self, engine):
+        """Stop the engine's ponder search, if one is running"""
+        if engine and self.pondering:
+            await run_on_engine(engine, lambda protocol: protocol.ping())
+        self.pondering = False
+
+    async def after_engine_move(self, move):
+        """Give the player time to follow the engine's move"""
+        if self._chessnut_connected():
+            # The board shows the move's squares and notices when it has been made
+            print("Please make this move on your physical Chessnut board.")
+            self.chessnut.sync_board(self.board)
+        else:
+            await asyncio.sleep(1)  # Small pause for readability
+
+    def _chessnut_connected(self):
+        """Check whether a physical board is connected for this match"""
+        return self.chessnut is not None and self.chessnut.connected
@@ -0,0 +1,219 @@
+"""
+Board Reactor Module for Grand Chess Realms
+A single thread that runs everything the Chessnut Pro connection needs:
+callbacks handed over from other threads, timers (heartbeats, reconnects)
+kept in a heap, and file descriptors watched with a selector. The thread
+sleeps in select() until the next timer is due or something arrives, so an
+idle board costs no wakeups and events are handled the moment they come in.
+"""
+
+import time
+import heapq
+import socket
+import logging
+import selectors
+import threading
+import itertools
+from collections import deque
+from concurrent.futures import Future
+
+logger = logging.getLogger("BoardReactor")
+
+
+class TimerHandle:
+    """A scheduled call that can be cancelled"""
+
+    __slots__ = ("when", "callback", "args", "cancelled")
+
+    def __init__(self, when, callback, args):
+        self.when = when
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self):
+        """Don't run the call; cancelled timers are skipped when they come due"""
+        self.cancelled = True
+
+
+class Reactor:
+    """
+    Event loop on its own thread for a timer heap, thread-safe callbacks and
+    selectable file descriptors.
+    """
+
+    def __init__(self, name="BoardReactor"):
+        """
+        Initialize the reactor.
+
+        Args:
+            name: Name of the reactor thread
+        """
+        self.name = name
+        self._selector = selectors.DefaultSelector()
+        self._wakeup_reader, self._wakeup_writer = socket.socketpair()
+        self._wakeup_reader.setblocking(False)
+        self._wakeup_writer.setblocking(False)
+        self._selector.register(self._wakeup_reader, selectors.EVENT_READ, None)
+
+        self._lock = threading.Lock()
+        self._ready = deque()
+        self._timers = []
+        self._sequence = itertools.count()
+        self._thread = None
+        self._running = False
+
+        self.wakeups = 0
+
+    def start(self):
+        """Start the reactor thread if it isn't running yet"""
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=2.0):
+        """Stop the reactor thread after the callbacks already queued"""
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+        self._wake()
+        if self._thread and not self.in_reactor_thread():
+            self._thread.join(timeout)
+
+    @property
+    def running(self):
+        return self._running
+
+    def in_reactor_thread(self):
+        return threading.current_thread() is self._thread
+
+    # -- Scheduling ---------------------------------------------------------
+
+    def call_soon_threadsafe(self, callback, *args):
+        """Run a callback on the reactor thread as soon as possible"""
+        with self._lock:
+            self._ready.append((callback, args))
+        self._wake()
+
+    def call_later(self, delay, callback, *args):
+        """
+        Run a callback on the reactor thread after a delay. Safe to call from any thread.
+
+        Returns:
+            A TimerHandle for cancelling the call
+        """
+        handle = TimerHandle(time.monotonic() + delay, callback, args)
+        with self._lock:
+            heapq.heappush(self._timers, (handle.when, next(self._sequence), handle))
+        if not self.in_reactor_thread():
+            self._wake()
+        return handle
+
+    def run_sync(self, callback, *args, timeout=None):
+        """
+        Run a callback on the reactor thread and wait for its result.
+
+        Args:
+            callback: Function to run
+            timeout: Maximum seconds to wait, or None to wait as long as needed
+
+        Returns:
+            The callback's return value; its exceptions are raised here
+        """
+        if self.in_reactor_thread():
+            return callback(*args)
+
+        future = Future()
+
+        def run():
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(callback(*args))
+                except BaseException as e:
+                    future.set_exception(e)
+
+        self.call_soon_threadsafe(run)
+        return future.result(timeout)
+
+    # -- File descriptors ---------------------------------------------------
+
+    def add_reader(self, fileobj, callback):
+        """
+        Call callback() on the reactor thread whenever fileobj is readable.
+        Safe to call from any thread; the selector is only changed on the
+        reactor thread, which is woken to watch the new file.
+        """
+        if self._running and not self.in_reactor_thread():
+            self.call_soon_threadsafe(self.add_reader, fileobj, callback)
+            return
+        self._selector.register(fileobj, selectors.EVENT_READ, callback)
+
+    def remove_reader(self, fileobj):
+        """Stop watching fileobj. Safe to call from any thread."""
+        if self._running and not self.in_reactor_thread():
+            self.call_soon_threadsafe(self.remove_reader, fileobj)
+            return
+        try:
+            self._selector.unregister(fileobj)
+        except (KeyError, ValueError):
+            pass
+
+    # -- Loop ---------------------------------------------------------------
+
+    def _wake(self):
+        try:
+            self._wakeup_writer.send(b"\0")
+        except (BlockingIOError, InterruptedError, OSError):
+            # Already awake (or shutting down)
+            pass
+
+    def _next_timeout(self):
+        with self._lock:
+            if self._ready:
+                return 0
+            while self._timers and self._timers[0][2].cancelled:
+                heapq.heappop(self._timers)
+            if not self._timers:
+                return None
+            return max(0.0, self._timers[0][0] - time.monotonic())
+
+    def _run(self):
+        while self._running:
+            ready = self._selector.select(self._next_timeout())
+            self.wakeups += 1
+
+            for key, _ in ready:
+                if key.data is None:
+                    try:
+                        while self._wakeup_reader.recv(4096):
+                            pass
+                    except (BlockingIOError, InterruptedError):
+                        pass
+                else:
+                    self._invoke(key.data)
+
+            with self._lock:
+                callbacks = list(self._ready)
+                self._ready.clear()
+                now = time.monotonic()
+                while self._timers and self._timers[0][0] <= now:
+                    handle = heapq.heappop(self._timers)[2]
+                    if not handle.cancelled:
+                        callbacks.append((handle.callback, handle.args))
+
+            for callback, args in callbacks:
+                self._invoke(callback, *args)
+
+        self._selector.close()
+        self._wakeup_reader.close()
+        self._wakeup_writer.close()
+
+    def _invoke(self, callback, *args):
+        try:
+            callback(*args)
+        except Exception as e:
+            logger.error(f"Error in reactor callback {getattr(callback, '__name__', callback)}: {e}")
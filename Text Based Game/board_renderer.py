@@ -0,0 +1,221 @@
+"""
+Board Renderer Module for Grand Chess Realms
+Draws the chess board in the terminal without clearing the screen for every
+move. The last drawn frame is kept, and on a terminal only the squares that
+changed are redrawn with ANSI cursor movements, so a move costs a few hundred
+bytes instead of a full screen. Pieces can be drawn as letters or Unicode
+symbols, and the last move and a king in check are highlighted.
+"""
+
+import sys
+
+import chess
+
+from screen import supports_ansi
+
+# Screen lines of the board frame (1-based): file letters, top border, ranks
+# 8 to 1, bottom border, file letters, a blank line and the status line
+FIRST_RANK_LINE = 3
+STATUS_LINE = 14
+
+# Screen column (1-based) of the a-file; files are two columns apart
+FIRST_FILE_COLUMN = 4
+
+FILES_LINE = "  a b c d e f g h"
+BORDER_LINE = " +-----------------+"
+
+# ANSI sequences
+RESET = "\033[0m"
+CLEAR_SCREEN = "\033[H\033[2J"
+CLEAR_LINE = "\033[K"
+CLEAR_BELOW = "\033[J"
+
+# Square highlights (ANSI background colors)
+HIGHLIGHTS = {
+    "last_move": "\033[43;30m",
+    "check": "\033[41;97m",
+}
+
+EMPTY_SQUARE = {False: ".", True: "·"}
+
+
+def _cursor(line, column):
+    return f"\033[{line};{column}H"
+
+
+class BoardRenderer:
+    """
+    Draws chess boards, redrawing only what changed since the last frame.
+    """
+
+    def __init__(self, stream=None, unicode_pieces=False, highlight=True, ansi=None):
+        """
+        Initialize the renderer.
+
+        Args:
+            stream: Output stream, defaults to sys.stdout
+            unicode_pieces: Draw pieces as Unicode chess symbols instead of letters
+            highlight: Highlight the last move and a king in check
+            ansi: Use ANSI cursor movements; None detects whether the stream is a terminal
+        """
+        self.stream = stream
+        self.unicode_pieces = unicode_pieces
+        self.highlight = highlight
+        self._ansi = ansi
+
+        # Glyph per piece symbol (None for an empty square), and the drawn
+        # string per (glyph, highlight) and per full row
+        self._glyphs = {None: EMPTY_SQUARE[unicode_pieces]}
+        for symbol in "PNBRQKpnbrqk":
+            piece = chess.Piece.from_symbol(symbol)
+            self._glyphs[symbol] = piece.unicode_symbol() if unicode_pieces else symbol
+        self._cells = {}
+        self._rows = {}
+
+        self._frame = None
+        self._status = None
+        self.bytes_written = 0
+        self.last_draw_bytes = 0
+
+    @property
+    def ansi(self):
+        if self._ansi is None:
+            self._ansi = supports_ansi(self._out())
+        return self._ansi
+
+    def _out(self):
+        return self.stream or sys.stdout
+
+    def invalidate(self):
+        """Forget the last frame, e.g. after something else cleared the screen"""
+        self._frame = None
+        self._status = None
+
+    def frame(self, board):
+        """
+        Get the contents of every square.
+
+        Returns:
+            Tuple of 64 (glyph, highlight) pairs, a8 first
+        """
+        highlights = {}
+        if self.highlight:
+            if board.move_stack:
+                last_move = board.peek()
+                highlights[last_move.from_square] = highlights[last_move.to_square] = "last_move"
+            if board.is_check():
+                highlights[board.king(board.turn)] = "check"
+
+        pieces = board.piece_map()
+        cells = []
+        for rank in range(7, -1, -1):
+            for file in range(8):
+                square = chess.square(file, rank)
+                piece = pieces.get(square)
+                cells.append((self._glyphs[piece.symbol() if piece else None], highlights.get(square)))
+        return tuple(cells)
+
+    def status(self, board):
+        """Status line under the board"""
+        parts = []
+        if board.is_check():
+            parts.append("CHECK!")
+        if board.move_stack:
+            parts.append(f"Last move: {board.peek().uci()}")
+        return "   ".join(parts)
+
+    def render(self, board):
+        """
+        Render the board as plain text, without ANSI sequences.
+
+        Args:
+            board: chess.Board to render
+
+        Returns:
+            The board as a multi-line string
+        """
+        frame = self.frame(board)
+        lines = [FILES_LINE, BORDER_LINE]
+        for i in range(8):
+            glyphs = " ".join(glyph for glyph, _ in frame[i * 8:(i + 1) * 8])
+            lines.append(f"{8 - i}| {glyphs} |{8 - i}")
+        lines += [BORDER_LINE, FILES_LINE]
+        return "\n".join(lines)
+
+    def draw(self, board):
+        """
+        Draw the board, redrawing only the squares that changed on a terminal.
+
+        The board sits at the top of the screen, and everything below it is
+        cleared, leaving the cursor under the status line.
+
+        Args:
+            board: chess.Board to draw
+
+        Returns:
+            Number of characters written
+        """
+        frame = self.frame(board)
+        status = self.status(board)
+
+        if not self.ansi:
+            text = self.render(board) + ("\n\n" + status if status else "") + "\n"
+        elif self._frame is None:
+            text = self._full_frame(frame, status)
+        else:
+            text = self._delta(frame, status)
+
+        self._frame = frame
+        self._status = status
+
+        out = self._out()
+        out.write(text)
+        out.flush()
+        self.last_draw_bytes = len(text.encode("utf-8"))
+        self.bytes_written += self.last_draw_bytes
+        return len(text)
+
+    def _cell(self, glyph, highlight):
+        """Drawn string of one square, cached"""
+        key = (glyph, highlight)
+        cell = self._cells.get(key)
+        if cell is None:
+            cell = f"{HIGHLIGHTS[highlight]}{glyph}{RESET}" if highlight else glyph
+            self._cells[key] = cell
+        return cell
+
+    def _row(self, rank_index, cells):
+        """Drawn line of one rank, cached"""
+        key = (rank_index, cells)
+        row = self._rows.get(key)
+        if row is None:
+            label = 8 - rank_index
+            row = f"{label}| {' '.join(self._cell(*cell) for cell in cells)} |{label}"
+            # Rows repeat a lot early in a game; keep the cache from growing forever
+            if len(self._rows) > 512:
+                self._rows.clear()
+            self._rows[key] = row
+        return row
+
+    def _full_frame(self, frame, status):
+        """Clear the screen and draw everything"""
+        lines = [FILES_LINE, BORDER_LINE]
+        lines += [self._row(i, frame[i * 8:(i + 1) * 8]) for i in range(8)]
+        lines += [BORDER_LINE, FILES_LINE, "", status]
+        return CLEAR_SCREEN + "\n".join(lines) + "\n"
+
+    def _delta(self, frame, status):
+        """Move the cursor to each changed square and redraw only those"""
+        parts = []
+        for index, (old, new) in enumerate(zip(self._frame, frame)):
+            if old != new:
+                line = FIRST_RANK_LINE + index // 8
+                column = FIRST_FILE_COLUMN + 2 * (index % 8)
+                parts.append(_cursor(line, column) + self._cell(*new))
+
+        if status != self._status:
+            parts.append(_cursor(STATUS_LINE, 1) + CLEAR_LINE + status)
+
+        # Leave the cursor under the board with the rest of the screen cleared
+        parts.append(_cursor(STATUS_LINE + 1, 1) + CLEAR_BELOW)
+        return "".join(parts)
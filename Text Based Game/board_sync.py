@@ -0,0 +1,175 @@
+"""
+Board Sync Module for Grand Chess Realms
+Keeps the Chessnut Pro in step with the game without sending the whole
+position after every move. When the game is one move ahead of what the
+physical board shows, only that move's squares are lit for the player to
+follow; a full position is sent only when the boards have drifted further
+apart. Requests arriving close together are merged into one, and a sync
+counts as done when the board's own snapshots settle on the new position,
+so nobody has to press Enter to confirm it.
+"""
+
+import time
+import logging
+
+import chess
+
+from move_inference import move_changes
+
+logger = logging.getLogger("BoardSync")
+
+# Seconds to wait for further sync requests before sending
+SYNC_WINDOW = 0.05
+
+
+class BoardSync:
+    """
+    Sends positions to the physical board as move hints where possible.
+    """
+
+    def __init__(self, reactor, inference, coalescer, set_position, show_squares, window=SYNC_WINDOW):
+        """
+        Initialize the sync.
+
+        Args:
+            reactor: Reactor whose thread calls this object and runs its timers
+            inference: MoveInference holding the position the board is known to show
+            coalescer: MoveCoalescer settling the board's events
+            set_position: Function that sends a full FEN to the board
+            show_squares: Function that lights a list of square names (an empty
+                list turns them off); returns False if the board can't light squares
+            window: Seconds to merge sync requests over
+        """
+        self.reactor = reactor
+        self.inference = inference
+        self.coalescer = coalescer
+        self.set_position = set_position
+        self.show_squares = show_squares
+        self.window = window
+
+        self.target = None
+        self._pending = None
+        self._timer = None
+        self._sent_time = None
+        self._lit = False
+
+        self.requests = 0
+        self.merged = 0
+        self.hint_syncs = 0
+        self.full_syncs = 0
+        self.skipped = 0
+        self.confirmed = 0
+        self.payload_bytes = 0
+        self.total_confirm_time = 0.0
+
+    def request(self, board):
+        """
+        Ask for the board to be brought to a position; returns at once.
+
+        Args:
+            board: The game's position, with its move stack
+        """
+        self.reactor.call_soon_threadsafe(self._queue, board.copy())
+
+    def _queue(self, board):
+        self.requests += 1
+        if self._pending is not None:
+            self.merged += 1
+        self._pending = board
+        if self._timer is None:
+            self._timer = self.reactor.call_later(self.window, self._flush)
+
+    def _flush(self):
+        self._timer = None
+        board, self._pending = self._pending, None
+        if board is None:
+            return
+
+        known = self.inference.board
+        if board.board_fen() == known.board_fen():
+            self.skipped += 1
+            return
+
+        move = board.peek() if board.move_stack else None
+        previous = board.copy()
+        if move:
+            previous.pop()
+        if move and previous.board_fen() == known.board_fen():
+            # One move behind: light the squares that move changes
+            squares = [chess.square_name(square) for square in sorted(move_changes(previous, move))]
+            if self.show_squares(squares):
+                self._lit = True
+                self.hint_syncs += 1
+                self.payload_bytes += len(",".join(squares))
+                self._sent(board)
+                return
+        self.sync_now(board)
+
+    def sync_now(self, board):
+        """
+        Send the full position right away (reactor thread).
+
+        Args:
+            board: The position
+
+        Raises:
+            Whatever the board's set_position raises
+        """
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        self._pending = None
+
+        fen = board.fen()
+        self._sent(board)
+        self.set_position(fen)
+        self.full_syncs += 1
+        self.payload_bytes += len(fen)
+
+    def _sent(self, board):
+        """The board should now be brought to this position"""
+        self.target = board
+        self._sent_time = time.monotonic()
+        self.inference.reset(board)
+        self.coalescer.reset()
+
+    def board_synced(self):
+        """
+        The board settled on the confirmed position (reactor thread).
+
+        Returns:
+            True if that completed a sync
+        """
+        if self.target is None:
+            return False
+        self.confirmed += 1
+        self.total_confirm_time += time.monotonic() - self._sent_time
+        logger.debug(f"Board reached {self.target.board_fen()}")
+        self.target = None
+        if self._lit:
+            self._lit = False
+            try:
+                self.show_squares([])
+            except Exception as e:
+                logger.warning(f"Could not turn off the move hint: {e}")
+        return True
+
+    def stats(self):
+        """
+        Get sync statistics.
+
+        Returns:
+            Dictionary with request, hint and full sync counts, the bytes sent
+            and the average seconds until the board showed the new position
+        """
+        return {
+            "requests": self.requests,
+            "merged_requests": self.merged,
+            "hint_syncs": self.hint_syncs,
+            "full_syncs": self.full_syncs,
+            "skipped_syncs": self.skipped,
+            "confirmed_syncs": self.confirmed,
+            "payload_bytes": self.payload_bytes,
+            "avg_confirm_time": self.total_confirm_time / self.confirmed if self.confirmed else 0.0,
+            "awaiting_board": self.target is not None,
+        }
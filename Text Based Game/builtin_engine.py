@@ -0,0 +1,570 @@
+"""
+Built-in Engine Module for Grand Chess Realms
+A small chess engine written in Python, for hosts without Stockfish and for
+weak opponents that don't need a Stockfish process at all. It searches with
+alpha-beta and iterative deepening under a strict time and node budget, and
+plays roughly between 800 and 1600 Elo depending on its strength setting.
+
+It offers the parts of chess.engine.SimpleEngine the game uses (play,
+analyse, configure, quit), so it can stand in wherever an engine is leased.
+"""
+
+import time
+import random
+import threading
+from typing import Optional
+
+import chess
+import chess.engine
+import chess.polyglot
+
+from engine_strength import skill_level_to_elo
+
+# Strength levels: the highest level whose Elo doesn't exceed the target is used.
+# Weak levels search shallowly and pick among the root moves with noisy scores.
+STRENGTH_LEVELS = [
+    {"elo": 0, "depth": 1, "nodes": 2000, "noise": 250},
+    {"elo": 900, "depth": 2, "nodes": 6000, "noise": 150},
+    {"elo": 1100, "depth": 2, "nodes": 15000, "noise": 80},
+    {"elo": 1300, "depth": 3, "nodes": 40000, "noise": 40},
+    {"elo": 1500, "depth": 4, "nodes": 120000, "noise": 15},
+    {"elo": 1700, "depth": 64, "nodes": None, "noise": 0},
+]
+
+# Opponents up to this Elo play against the built-in engine even when Stockfish
+# is installed
+BUILTIN_ENGINE_MAX_ELO = 1000
+
+# Seconds per move when the limit gives neither a time nor clocks
+DEFAULT_MOVE_TIME = 1.0
+
+# Hard cap on the seconds spent on any move
+MAX_MOVE_TIME = 5.0
+
+# Transposition table entries (a power of two)
+TT_SIZE = 1 << 16
+
+MATE_SCORE = 100000
+MATE_BOUND = MATE_SCORE - 1000
+
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# Material values (middlegame, endgame) in centipawns
+PIECE_VALUES = {
+    chess.PAWN: (82, 94),
+    chess.KNIGHT: (337, 281),
+    chess.BISHOP: (365, 297),
+    chess.ROOK: (477, 512),
+    chess.QUEEN: (1025, 936),
+    chess.KING: (0, 0),
+}
+
+# Game phase contributed by each piece; 24 is the full opening material
+PHASE_WEIGHTS = {chess.KNIGHT: 1, chess.BISHOP: 1, chess.ROOK: 2, chess.QUEEN: 4}
+MAX_PHASE = 24
+
+# Piece-square tables from White's point of view, rank 8 first
+PAWN_TABLE = [
+    0, 0, 0, 0, 0, 0, 0, 0,
+    50, 50, 50, 50, 50, 50, 50, 50,
+    10, 10, 20, 30, 30, 20, 10, 10,
+    5, 5, 10, 25, 25, 10, 5, 5,
+    0, 0, 0, 20, 20, 0, 0, 0,
+    5, -5, -10, 0, 0, -10, -5, 5,
+    5, 10, 10, -20, -20, 10, 10, 5,
+    0, 0, 0, 0, 0, 0, 0, 0,
+]
+PAWN_ENDGAME_TABLE = [
+    0, 0, 0, 0, 0, 0, 0, 0,
+    80, 80, 80, 80, 80, 80, 80, 80,
+    50, 50, 50, 50, 50, 50, 50, 50,
+    30, 30, 30, 30, 30, 30, 30, 30,
+    20, 20, 20, 20, 20, 20, 20, 20,
+    10, 10, 10, 10, 10, 10, 10, 10,
+    10, 10, 10, 10, 10, 10, 10, 10,
+    0, 0, 0, 0, 0, 0, 0, 0,
+]
+KNIGHT_TABLE = [
+    -50, -40, -30, -30, -30, -30, -40, -50,
+    -40, -20, 0, 0, 0, 0, -20, -40,
+    -30, 0, 10, 15, 15, 10, 0, -30,
+    -30, 5, 15, 20, 20, 15, 5, -30,
+    -30, 0, 15, 20, 20, 15, 0, -30,
+    -30, 5, 10, 15, 15, 10, 5, -30,
+    -40, -20, 0, 5, 5, 0, -20, -40,
+    -50, -40, -30, -30, -30, -30, -40, -50,
+]
+BISHOP_TABLE = [
+    -20, -10, -10, -10, -10, -10, -10, -20,
+    -10, 0, 0, 0, 0, 0, 0, -10,
+    -10, 0, 5, 10, 10, 5, 0, -10,
+    -10, 5, 5, 10, 10, 5, 5, -10,
+    -10, 0, 10, 10, 10, 10, 0, -10,
+    -10, 10, 10, 10, 10, 10, 10, -10,
+    -10, 5, 0, 0, 0, 0, 5, -10,
+    -20, -10, -10, -10, -10, -10, -10, -20,
+]
+ROOK_TABLE = [
+    0, 0, 0, 0, 0, 0, 0, 0,
+    5, 10, 10, 10, 10, 10, 10, 5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    0, 0, 0, 5, 5, 0, 0, 0,
+]
+QUEEN_TABLE = [
+    -20, -10, -10, -5, -5, -10, -10, -20,
+    -10, 0, 0, 0, 0, 0, 0, -10,
+    -10, 0, 5, 5, 5, 5, 0, -10,
+    -5, 0, 5, 5, 5, 5, 0, -5,
+    0, 0, 5, 5, 5, 5, 0, -5,
+    -10, 5, 5, 5, 5, 5, 0, -10,
+    -10, 0, 5, 0, 0, 0, 0, -10,
+    -20, -10, -10, -5, -5, -10, -10, -20,
+]
+KING_TABLE = [
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -20, -30, -30, -40, -40, -30, -30, -20,
+    -10, -20, -20, -20, -20, -20, -20, -10,
+    20, 20, 0, 0, 0, 0, 20, 20,
+    20, 30, 10, 0, 0, 10, 30, 20,
+]
+KING_ENDGAME_TABLE = [
+    -50, -40, -30, -20, -20, -30, -40, -50,
+    -30, -20, -10, 0, 0, -10, -20, -30,
+    -30, -10, 20, 30, 30, 20, -10, -30,
+    -30, -10, 30, 40, 40, 30, -10, -30,
+    -30, -10, 30, 40, 40, 30, -10, -30,
+    -30, -10, 20, 30, 30, 20, -10, -30,
+    -30, -30, 0, 0, 0, 0, -30, -30,
+    -50, -30, -30, -30, -30, -30, -30, -50,
+]
+
+# (middlegame, endgame) tables per piece type
+PIECE_SQUARE_TABLES = {
+    chess.PAWN: (PAWN_TABLE, PAWN_ENDGAME_TABLE),
+    chess.KNIGHT: (KNIGHT_TABLE, KNIGHT_TABLE),
+    chess.BISHOP: (BISHOP_TABLE, BISHOP_TABLE),
+    chess.ROOK: (ROOK_TABLE, ROOK_TABLE),
+    chess.QUEEN: (QUEEN_TABLE, QUEEN_TABLE),
+    chess.KING: (KING_TABLE, KING_ENDGAME_TABLE),
+}
+
+
+def _build_square_values():
+    """Material plus piece-square bonus per (piece type, color), indexed by square"""
+    values = {}
+    for piece_type, (mg_table, eg_table) in PIECE_SQUARE_TABLES.items():
+        mg_value, eg_value = PIECE_VALUES[piece_type]
+        for color in chess.COLORS:
+            # The tables are written rank 8 first from White's point of view
+            index = [square ^ 56 if color == chess.WHITE else square for square in chess.SQUARES]
+            values[piece_type, color] = (
+                [mg_value + mg_table[i] for i in index],
+                [eg_value + eg_table[i] for i in index],
+            )
+    return values
+
+
+SQUARE_VALUES = _build_square_values()
+
+
+def strength_level(elo):
+    """
+    Get the strength level for a target rating.
+
+    Args:
+        elo: Target Elo rating, or None for full strength
+
+    Returns:
+        Dictionary with depth, nodes and noise (centipawns)
+    """
+    if elo is None:
+        return STRENGTH_LEVELS[-1]
+    level = STRENGTH_LEVELS[0]
+    for candidate in STRENGTH_LEVELS:
+        if candidate["elo"] <= elo:
+            level = candidate
+    return level
+
+
+def evaluate(board):
+    """
+    Tapered piece-square evaluation.
+
+    Args:
+        board: Position to evaluate
+
+    Returns:
+        Centipawns from the side to move's point of view
+    """
+    mg = eg = phase = 0
+    for piece_type in chess.PIECE_TYPES:
+        for color in chess.COLORS:
+            mg_values, eg_values = SQUARE_VALUES[piece_type, color]
+            sign = 1 if color == chess.WHITE else -1
+            for square in chess.scan_forward(board.pieces_mask(piece_type, color)):
+                mg += sign * mg_values[square]
+                eg += sign * eg_values[square]
+                phase += PHASE_WEIGHTS.get(piece_type, 0)
+
+    phase = min(phase, MAX_PHASE)
+    score = (mg * phase + eg * (MAX_PHASE - phase)) // MAX_PHASE
+    return score if board.turn == chess.WHITE else -score
+
+
+class _SearchAborted(Exception):
+    """Raised inside the search when the budget is used up"""
+
+
+class BuiltinEngine:
+    """
+    Pure-Python engine with the SimpleEngine interface the game relies on.
+    """
+
+    def __init__(self, elo: Optional[int] = None, seed: Optional[int] = None):
+        """
+        Initialize the engine.
+
+        Args:
+            elo: Target Elo rating (roughly 800-1600), or None for full strength
+            seed: Optional seed for the weak levels' move choice
+        """
+        self.level = strength_level(elo)
+        self.rng = random.Random(seed)
+
+        self._tt = [None] * TT_SIZE
+        self._killers = {}
+        self._stop = threading.Event()
+        self._nodes = 0
+        self._node_limit = None
+        self._deadline = None
+        self._can_abort = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.quit()
+
+    def configure(self, options):
+        """
+        Set the strength like a UCI engine.
+
+        Args:
+            options: Dictionary with "UCI_Elo" or "Skill Level"
+        """
+        if "UCI_Elo" in options:
+            self.level = strength_level(options["UCI_Elo"])
+        elif "Skill Level" in options:
+            self.level = strength_level(skill_level_to_elo(options["Skill Level"]))
+
+    def play(self, board: chess.Board, limit: chess.engine.Limit, **kwargs) -> chess.engine.PlayResult:
+        """
+        Choose a move.
+
+        Args:
+            board: Position to play from
+            limit: Search limit (time, clocks, depth and nodes are honoured)
+
+        Returns:
+            A chess.engine.PlayResult
+        """
+        move, info = self._search(board, limit, choose=True)
+        return chess.engine.PlayResult(move, None, info)
+
+    def analyse(self, board: chess.Board, limit: chess.engine.Limit, **kwargs) -> chess.engine.InfoDict:
+        """
+        Evaluate a position at full strength.
+
+        Args:
+            board: Position to analyse
+            limit: Search limit (time, clocks, depth and nodes are honoured)
+
+        Returns:
+            InfoDict with score, pv, depth, nodes and time
+        """
+        level, self.level = self.level, STRENGTH_LEVELS[-1]
+        try:
+            _, info = self._search(board, limit, choose=False)
+        finally:
+            self.level = level
+        return info
+
+    def stop(self):
+        """Stop a running search; it returns the best move found so far"""
+        self._stop.set()
+
+    def quit(self):
+        """Release the transposition table"""
+        self._tt = [None] * TT_SIZE
+
+    def close(self):
+        self.quit()
+
+    # -- Search -------------------------------------------------------------
+
+    def _budget(self, board, limit):
+        """Seconds to spend on the move under a limit"""
+        if limit.time is not None:
+            budget = limit.time
+        elif limit.white_clock is not None or limit.black_clock is not None:
+            clock = limit.white_clock if board.turn == chess.WHITE else limit.black_clock
+            increment = (limit.white_inc if board.turn == chess.WHITE else limit.black_inc) or 0
+            budget = (clock or 0) / 30 + increment / 2
+        else:
+            budget = DEFAULT_MOVE_TIME
+        return max(0.01, min(budget, MAX_MOVE_TIME))
+
+    def _search(self, board, limit, choose):
+        """Iterative deepening; returns (best move, InfoDict)"""
+        board = board.copy()
+        started = time.monotonic()
+        budget = self._budget(board, limit)
+
+        max_depth = min(limit.depth or self.level["depth"], self.level["depth"])
+        node_limits = [n for n in (limit.nodes, self.level["nodes"]) if n]
+        self._node_limit = min(node_limits) if node_limits else None
+        self._deadline = started + budget
+        self._nodes = 0
+        self._killers = {}
+        self._stop.clear()
+
+        noise = self.level["noise"] if choose else 0
+        best_move, best_score, depth_reached = None, 0, 0
+        root_moves = list(board.legal_moves)
+
+        if root_moves:
+            for depth in range(1, max_depth + 1):
+                # Depth 1 always completes, so there is always a move
+                self._can_abort = depth > 1
+                try:
+                    scores = self._search_root(board, depth, root_moves, exact=noise > 0)
+                except _SearchAborted:
+                    break
+
+                depth_reached = depth
+                best_move, best_score = max(scores, key=lambda pair: pair[1])
+                # Search the best move first next time
+                root_moves.sort(key=lambda move: -dict(scores).get(move, -MATE_SCORE))
+
+                if abs(best_score) >= MATE_BOUND or len(root_moves) == 1:
+                    break
+                if time.monotonic() - started > budget / 2:
+                    # The next iteration would not finish in time
+                    break
+
+            if noise and depth_reached:
+                # Weak levels misjudge moves by up to `noise` centipawns
+                noisy = [(move, score + self.rng.uniform(-noise, noise)) for move, score in scores]
+                best_move = max(noisy, key=lambda pair: pair[1])[0]
+                best_score = dict(scores)[best_move]
+
+        info = {
+            "depth": depth_reached,
+            "nodes": self._nodes,
+            "time": time.monotonic() - started,
+            "score": chess.engine.PovScore(self._to_engine_score(best_score), board.turn),
+            "pv": self._principal_variation(board, best_move, depth_reached) if best_move else [],
+        }
+        return best_move, info
+
+    def _search_root(self, board, depth, moves, exact):
+        """
+        Search every root move.
+
+        Returns:
+            List of (move, score) pairs. Scores are exact when exact is set;
+            otherwise only the best score is.
+        """
+        alpha, beta = -MATE_SCORE, MATE_SCORE
+        scores = []
+        for move in moves:
+            board.push(move)
+            try:
+                score = -self._negamax(board, depth - 1, -beta, -(-MATE_SCORE if exact else alpha), 1)
+            finally:
+                board.pop()
+            scores.append((move, score))
+            alpha = max(alpha, score)
+
+        best_move, best_score = max(scores, key=lambda pair: pair[1])
+        self._store(board, depth, best_score, EXACT, best_move, 0)
+        return scores
+
+    def _negamax(self, board, depth, alpha, beta, ply):
+        """Alpha-beta search with a transposition table"""
+        self._count_node()
+
+        if board.halfmove_clock >= 100 or board.is_insufficient_material():
+            return 0
+        if board.halfmove_clock >= 4 and board.is_repetition(2):
+            return 0
+
+        in_check = board.is_check()
+        if in_check:
+            depth += 1
+        if depth <= 0:
+            return self._quiesce(board, alpha, beta, ply)
+
+        key = chess.polyglot.zobrist_hash(board)
+        entry = self._tt[key & (TT_SIZE - 1)]
+        tt_move = None
+        if entry is not None and entry[0] == key:
+            _, entry_depth, entry_score, flag, tt_move = entry
+            if entry_depth >= depth:
+                entry_score = self._score_from_tt(entry_score, ply)
+                if flag == EXACT:
+                    return entry_score
+                if flag == LOWER and entry_score >= beta:
+                    return entry_score
+                if flag == UPPER and entry_score <= alpha:
+                    return entry_score
+
+        original_alpha = alpha
+        best_score, best_move = -MATE_SCORE, None
+        any_move = False
+
+        for move in self._ordered_moves(board, tt_move, ply):
+            any_move = True
+            capture = board.is_capture(move)
+            board.push(move)
+            try:
+                score = -self._negamax(board, depth - 1, -beta, -alpha, ply + 1)
+            finally:
+                board.pop()
+
+            if score > best_score:
+                best_score, best_move = score, move
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                if not capture:
+                    self._add_killer(ply, move)
+                break
+
+        if not any_move:
+            return -MATE_SCORE + ply if in_check else 0
+
+        if best_score <= original_alpha:
+            flag = UPPER
+        elif best_score >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self._store(board, depth, best_score, flag, best_move, ply, key)
+        return best_score
+
+    def _quiesce(self, board, alpha, beta, ply):
+        """Search captures until the position is quiet"""
+        self._count_node()
+
+        stand_pat = evaluate(board)
+        if stand_pat >= beta:
+            return stand_pat
+        alpha = max(alpha, stand_pat)
+
+        captures = sorted(board.generate_legal_captures(), key=lambda move: -self._mvv_lva(board, move))
+        for move in captures:
+            board.push(move)
+            try:
+                score = -self._quiesce(board, -beta, -alpha, ply + 1)
+            finally:
+                board.pop()
+            if score >= beta:
+                return score
+            alpha = max(alpha, score)
+        return alpha
+
+    def _count_node(self):
+        """Count a node and abort the search once the budget is used up"""
+        self._nodes += 1
+        if not self._can_abort:
+            return
+        if self._node_limit is not None and self._nodes >= self._node_limit:
+            raise _SearchAborted()
+        if self._nodes & 511 == 0 and (self._stop.is_set() or time.monotonic() >= self._deadline):
+            raise _SearchAborted()
+
+    # -- Move ordering ------------------------------------------------------
+
+    def _ordered_moves(self, board, tt_move, ply):
+        """Transposition table move, then captures by MVV-LVA, then killers, then the rest"""
+        killers = self._killers.get(ply, ())
+
+        def priority(move):
+            if move == tt_move:
+                return 1000000
+            if board.is_capture(move):
+                return 100000 + self._mvv_lva(board, move)
+            if move.promotion:
+                return 90000 + PIECE_VALUES[move.promotion][0]
+            if move in killers:
+                return 80000 - killers.index(move)
+            return 0
+
+        return sorted(board.legal_moves, key=priority, reverse=True)
+
+    def _mvv_lva(self, board, move):
+        """Most valuable victim, least valuable attacker"""
+        victim = chess.PAWN if board.is_en_passant(move) else board.piece_type_at(move.to_square)
+        attacker = board.piece_type_at(move.from_square)
+        return 10 * PIECE_VALUES[victim][0] - PIECE_VALUES[attacker][0] if victim else 0
+
+    def _add_killer(self, ply, move):
+        killers = self._killers.setdefault(ply, [])
+        if move not in killers:
+            killers.insert(0, move)
+            del killers[2:]
+
+    # -- Transposition table ------------------------------------------------
+
+    def _store(self, board, depth, score, flag, move, ply, key=None):
+        key = chess.polyglot.zobrist_hash(board) if key is None else key
+        index = key & (TT_SIZE - 1)
+        entry = self._tt[index]
+        # Keep deeper results for the same position
+        if entry is None or entry[0] != key or entry[1] <= depth:
+            self._tt[index] = (key, depth, self._score_to_tt(score, ply), flag, move)
+
+    def _score_to_tt(self, score, ply):
+        """Store mate scores relative to the position rather than the root"""
+        if score >= MATE_BOUND:
+            return score + ply
+        if score <= -MATE_BOUND:
+            return score - ply
+        return score
+
+    def _score_from_tt(self, score, ply):
+        if score >= MATE_BOUND:
+            return score - ply
+        if score <= -MATE_BOUND:
+            return score + ply
+        return score
+
+    def _principal_variation(self, board, first_move, depth):
+        """Follow the transposition table from the best move"""
+        pv = [first_move]
+        board = board.copy(stack=False)
+        board.push(first_move)
+        while len(pv) < depth:
+            key = chess.polyglot.zobrist_hash(board)
+            entry = self._tt[key & (TT_SIZE - 1)]
+            if entry is None or entry[0] != key or entry[4] is None or entry[4] not in board.legal_moves:
+                break
+            pv.append(entry[4])
+            board.push(entry[4])
+        return pv
+
+    def _to_engine_score(self, score):
+        """Convert an internal score to a chess.engine.Score"""
+        if score >= MATE_BOUND:
+            return chess.engine.Mate((MATE_SCORE - score + 1) // 2)
+        if score <= -MATE_BOUND:
+            return chess.engine.Mate(-((MATE_SCORE + score) // 2))
+        return chess.engine.Cp(score)
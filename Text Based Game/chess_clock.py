@@ -0,0 +1,142 @@
+"""
+Chess Clock Module for Grand Chess Realms
+A two-sided chess clock with Fischer increments, measured with time.monotonic.
+Only the time a side actually spends on its move is charged: screen redraws,
+readability pauses and prompts between moves happen while the clock is stopped.
+"""
+
+import time
+
+import chess
+import chess.engine
+
+
+def parse_time_control(time_control, default_minutes=90, default_increment=30):
+    """
+    Parse a time control string such as "90/30".
+
+    Args:
+        time_control: Minutes of main time and seconds of increment, separated by "/"
+        default_minutes: Main time used if the string doesn't give one
+        default_increment: Increment used if the string doesn't give one
+
+    Returns:
+        Tuple of (main time in minutes, increment in seconds)
+    """
+    main_time_minutes = default_minutes
+    increment_seconds = default_increment
+
+    if time_control:
+        parts = time_control.split('/')
+        if len(parts) >= 1:
+            try:
+                main_time_minutes = int(parts[0])
+            except ValueError:
+                pass
+        if len(parts) >= 2:
+            try:
+                increment_seconds = int(parts[1])
+            except ValueError:
+                pass
+
+    return main_time_minutes, increment_seconds
+
+
+class ChessClock:
+    """
+    Clock for both sides of a match. At most one side's clock runs at a time.
+    """
+
+    def __init__(self, main_time, increment=0):
+        """
+        Initialize the clock.
+
+        Args:
+            main_time: Starting time for each side, in seconds
+            increment: Seconds added to a side's clock after each of its moves
+        """
+        self.increment = increment
+        self.remaining_time = {chess.WHITE: float(main_time), chess.BLACK: float(main_time)}
+        self.running = None
+        self._started_at = None
+
+    @classmethod
+    def from_time_control(cls, time_control):
+        """
+        Create a clock from a time control string such as "90/30".
+
+        Args:
+            time_control: Minutes of main time and seconds of increment, separated by "/"
+
+        Returns:
+            A ChessClock
+        """
+        main_time_minutes, increment_seconds = parse_time_control(time_control)
+        return cls(main_time_minutes * 60, increment_seconds)
+
+    def start(self, color):
+        """
+        Start a side's clock.
+
+        Args:
+            color: chess.WHITE or chess.BLACK
+        """
+        if self.running is not None:
+            self.stop(add_increment=False)
+        self.running = color
+        self._started_at = time.monotonic()
+
+    def stop(self, add_increment=True):
+        """
+        Stop the running clock and charge the elapsed time.
+
+        Args:
+            add_increment: Whether the side completed a move and earns its increment
+
+        Returns:
+            Seconds charged to the side
+        """
+        if self.running is None:
+            return 0.0
+
+        elapsed = time.monotonic() - self._started_at
+        self.remaining_time[self.running] -= elapsed
+        if add_increment and self.remaining_time[self.running] > 0:
+            self.remaining_time[self.running] += self.increment
+
+        self.running = None
+        self._started_at = None
+        return elapsed
+
+    def remaining(self, color):
+        """
+        Get a side's remaining time, including the time spent on the current move.
+
+        Args:
+            color: chess.WHITE or chess.BLACK
+
+        Returns:
+            Remaining seconds (negative if the side has overstepped)
+        """
+        remaining = self.remaining_time[color]
+        if self.running == color:
+            remaining -= time.monotonic() - self._started_at
+        return remaining
+
+    def flagged(self, color):
+        """Check whether a side has run out of time"""
+        return self.remaining(color) <= 0
+
+    def engine_limit(self):
+        """
+        Get a search limit that hands both clocks to the engine's own time manager.
+
+        Returns:
+            A chess.engine.Limit with white_clock/black_clock/white_inc/black_inc
+        """
+        return chess.engine.Limit(
+            white_clock=max(0.0, self.remaining(chess.WHITE)),
+            black_clock=max(0.0, self.remaining(chess.BLACK)),
+            white_inc=self.increment,
+            black_inc=self.increment,
+        )
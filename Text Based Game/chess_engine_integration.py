@@ -1,8 +1,22 @@
-import os
+import asyncio
 import chess
 import chess.engine
-import time
 import random
+from contextlib import contextmanager, ExitStack
+
+from engine_registry import get_engine_registry
+from engine_strength import elo_to_skill_level
+from async_match import AsyncMatchDriver, run_on_engine
+from opening_book import BookLibrary, DEFAULT_MAX_BOOK_PLIES
+from tablebase import TablebaseProber
+from eval_cache import EvalCache
+from game_review import GameReview
+from match_simulator import simulate_match
+from builtin_engine import BuiltinEngine, BUILTIN_ENGINE_MAX_ELO
+from move_input import resolve_move
+from board_renderer import BoardRenderer
+from screen import get_screen
+from input_mux import read_input
 
 class ChessMatchManager:
     """
@@ -10,75 +24,119 @@ class ChessMatchManager:
     and provides utilities for chess gameplay.
     """
     
-    def __init__(self, stockfish_path=None):
+    def __init__(self, stockfish_path=None, ponder=False, max_book_plies=DEFAULT_MAX_BOOK_PLIES,
+                 tablebase_adjudication=False, unicode_pieces=False):
         """
         Initialize the chess match manager.
         
         Args:
             stockfish_path: Path to the Stockfish executable. If None, will try to find it in common locations.
+            ponder: Let the engine think on the player's time during matches
+            max_book_plies: Plies (half-moves) for which opponents play from their opening book
+            tablebase_adjudication: End matches as soon as the tablebases show them won or drawn
+            unicode_pieces: Draw the board with Unicode chess symbols instead of letters
         """
-        self.engine = None
-        self.stockfish_path = stockfish_path
-        
-        # Try to initialize the engine
-        self.initialize_engine()
+        # The engine process is shared with the rest of the game and only
+        # started once a match is likely
+        self.registry = get_engine_registry(stockfish_path)
+        self.ponder = ponder
+        
+        # Opening books are memory-mapped on first use
+        self.books = BookLibrary()
+        self.max_book_plies = max_book_plies
+        
+        # Endgames with few pieces are resolved from Syzygy tablebases
+        self.tablebase = TablebaseProber()
+        self.tablebase_adjudication = tablebase_adjudication
+        
+        # Evaluations are remembered between calls and sessions
+        self.eval_cache = EvalCache()
+        
+        # Only the squares that changed are redrawn between moves, and the
+        # live clock sits in its own screen region
+        self.board_renderer = BoardRenderer(unicode_pieces=unicode_pieces)
+        self.screen = get_screen()
+        self.screen.define_region("clock", 1, 30)
+        
+        # Reply latency and pondering statistics and the moves of the last match played
+        self.last_match_stats = None
+        self.last_match_moves = []
+    
+    @property
+    def stockfish_path(self):
+        """Path to the Stockfish executable, or None if it could not be found"""
+        return self.registry.find_engine_path()
+    
+    def has_engine(self):
+        """Check whether an engine is available without starting it"""
+        return self.registry.is_available()
     
     def initialize_engine(self):
-        """Initialize the Stockfish chess engine"""
-        try:
-            # If a path was provided, use it
-            if self.stockfish_path:
-                self.engine = chess.engine.SimpleEngine.popen_uci(self.stockfish_path)
-                return
-            
-            # Common paths to look for Stockfish
-            paths = [
-                "stockfish",  # If in PATH
-                "./stockfish",
-                "./engines/stockfish",
-                "/usr/games/stockfish",
-                "/usr/local/bin/stockfish",
-                "C:/Program Files/Stockfish/stockfish.exe",
-                "C:/Program Files (x86)/Stockfish/stockfish.exe"
-            ]
+        """Start a Stockfish chess engine now instead of on first use"""
+        with self.lease_engine() as engine:
+            if engine:
+                print(f"Successfully initialized Stockfish from: {self.stockfish_path}")
+            else:
+                print("Warning: Could not initialize Stockfish. Matches will use the built-in engine.")
+    
+    @contextmanager
+    def lease_engine(self, elo=None, timeout=None, builtin=False):
+        """
+        Lease an engine from the shared pool for the duration of a with-block.
+        
+        Args:
+            elo: Target Elo rating for the engine, or None for full strength
+            timeout: Maximum seconds to wait for a free engine, or None to wait as long as needed
+            builtin: Use the built-in engine for weak opponents and whenever
+                Stockfish is unavailable
             
-            # Try each path
-            for path in paths:
+        Yields:
+            A configured chess.engine.SimpleEngine (or BuiltinEngine), or None
+            if no engine is available
+        """
+        with ExitStack() as stack:
+            engine = None
+            if builtin and elo is not None and elo <= BUILTIN_ENGINE_MAX_ELO:
+                # Weak opponents don't need a Stockfish process at all
+                engine = BuiltinEngine(elo)
+            elif self.has_engine():
                 try:
-                    self.engine = chess.engine.SimpleEngine.popen_uci(path)
-                    self.stockfish_path = path
-                    print(f"Successfully initialized Stockfish from: {path}")
-                    return
-                except:
-                    continue
-            
-            print("Warning: Could not initialize Stockfish. Using simplified chess mode.")
-        except Exception as e:
-            print(f"Error initializing chess engine: {e}")
-            print("Using simplified chess mode.")
+                    engine = stack.enter_context(self.registry.lease(self.engine_options(elo), timeout))
+                except (RuntimeError, TimeoutError) as e:
+                    print(f"Chess engine unavailable: {e}")
+            if engine is None and builtin:
+                engine = BuiltinEngine(elo)
+            yield engine
+    
+    def prewarm_engine(self):
+        """Start the engine in the background because a match is likely soon"""
+        self.registry.prewarm()
     
     def close(self):
         """Close the chess engine properly"""
-        if self.engine:
-            self.engine.quit()
+        self.registry.shutdown()
+        self.books.close()
+        self.tablebase.close()
+        self.eval_cache.close()
     
-    def set_engine_strength(self, elo):
+    def engine_options(self, elo=None):
         """
-        Set the engine strength based on Elo rating.
+        Get the engine options for a target strength.
         
         Args:
-            elo: Target Elo rating for the engine (roughly 800-3000)
+            elo: Target Elo rating for the engine (roughly 800-3000), or None for full strength
+            
+        Returns:
+            Dictionary of UCI options
         """
-        if not self.engine:
-            return False
-        
         # Convert Elo to Stockfish skill level (0-20)
-        skill_level = self.elo_to_skill_level(elo)
+        skill_level = 20 if elo is None else self.elo_to_skill_level(elo)
         
-        # Configure the engine
-        self.engine.configure({"Skill Level": skill_level})
-        
-        return True
+        options = {"Skill Level": skill_level}
+        if self.tablebase.is_available():
+            # Let the engine use the tables in its own search as well
+            options["SyzygyPath"] = self.tablebase.directory
+        return options
     
     def elo_to_skill_level(self, elo):
         """
@@ -90,193 +148,73 @@ class ChessMatchManager:
         Returns:
             Stockfish skill level (0-20)
         """
-        # Simple mapping
-        if elo < 800:
-            return 0
-        elif elo < 900:
-            return 1
-        elif elo < 1000:
-            return 2
-        elif elo < 1100:
-            return 3
-        elif elo < 1200:
-            return 4
-        elif elo < 1300:
-            return 5
-        elif elo < 1400:
-            return 6
-        elif elo < 1500:
-            return 8
-        elif elo < 1600:
-            return 10
-        elif elo < 1700:
-            return 12
-        elif elo < 1800:
-            return 14
-        elif elo < 1900:
-            return 16
-        elif elo < 2000:
-            return 18
-        else:
-            return 20
+        # Calibrated by elo_calibration.py when a skill table has been generated
+        return elo_to_skill_level(elo)
     
-    def play_match(self, opponent_name, opponent_elo, time_control="90/30"):
+    def play_match(self, opponent_name, opponent_elo, time_control="90/30", chessnut=None, repertoire=None):
         """
         Play a full chess match against the engine.
         
+        This is a blocking wrapper around play_match_async() and must not be
+        called from a running event loop.
+        
         Args:
             opponent_name: Name of the opponent for display
             opponent_elo: Elo rating of the opponent
             time_control: Time control format (60/30, 90/30, 120/30, or None)
+            chessnut: Optional ChessnutInterface for moves on the physical board
+            repertoire: Optional file name of the opponent's own opening book
             
         Returns:
             Result of the match: "win", "loss", "draw"
         """
-        # Initialize the board
-        board = chess.Board()
-        
-        # Set up engine strength
-        if self.engine:
-            self.set_engine_strength(opponent_elo)
-        
-        # Parse time control
-        main_time_minutes = 90
-        increment_seconds = 30
-        
-        if time_control:
-            parts = time_control.split('/')
-            if len(parts) >= 1:
-                try:
-                    main_time_minutes = int(parts[0])
-                except:
-                    pass
-            if len(parts) >= 2:
-                try:
-                    increment_seconds = int(parts[1])
-                except:
-                    pass
-        
-        # Convert to seconds
-        player_time = main_time_minutes * 60
-        engine_time = main_time_minutes * 60
-        
-        # Introduction to the match
-        self.display_match_intro(opponent_name, opponent_elo, time_control)
+        return asyncio.run(self.play_match_async(opponent_name, opponent_elo, time_control, chessnut, repertoire))
+    
+    async def play_match_async(self, opponent_name, opponent_elo, time_control="90/30", chessnut=None,
+                               repertoire=None):
+        """
+        Play a full chess match against the engine on the running event loop.
         
-        # Main game loop
-        while not board.is_game_over():
-            # Display the board
-            self.display_board(board)
-            
-            # Display remaining time if using a clock
-            if time_control:
-                self.display_clock(player_time, engine_time)
-            
-            # Player's turn (white)
-            if board.turn == chess.WHITE:
-                start_time = time.time()
-                
-                move = self.get_player_move(board)
-                
-                # Update player's clock
-                if time_control:
-                    elapsed = time.time() - start_time
-                    player_time -= elapsed
-                    player_time += increment_seconds
-                    
-                    # Check for time forfeit
-                    if player_time <= 0:
-                        print("You've run out of time!")
-                        return "loss"
-                
-                # Make the move
-                board.push(move)
+        Args:
+            opponent_name: Name of the opponent for display
+            opponent_elo: Elo rating of the opponent
+            time_control: Time control format (60/30, 90/30, 120/30, or None)
+            chessnut: Optional ChessnutInterface for moves on the physical board
+            repertoire: Optional file name of the opponent's own opening book
             
-            # Engine's turn (black)
-            else:
-                print(f"\n{opponent_name} is thinking...")
-                
-                start_time = time.time()
-                
-                if self.engine:
-                    # Limit engine thinking time based on its remaining clock
-                    time_limit = min(30, engine_time / 10) if time_control else 1.0
-                    result = self.engine.play(board, chess.engine.Limit(time=time_limit))
-                    move = result.move
-                else:
-                    # Fallback if no engine: make a random legal move
-                    import random
-                    legal_moves = list(board.legal_moves)
-                    move = random.choice(legal_moves)
-                
-                # Update engine's clock
-                if time_control:
-                    elapsed = time.time() - start_time
-                    engine_time -= elapsed
-                    engine_time += increment_seconds
-                    
-                    # Check for time forfeit
-                    if engine_time <= 0:
-                        print(f"{opponent_name} has run out of time!")
-                        return "win"
-                
-                # Make the move and display it
-                board.push(move)
-                print(f"{opponent_name} played: {move.uci()}")
-                time.sleep(1)  # Small pause for readability
-        
-        # Display final position
-        self.display_board(board)
-        
-        # Determine and return the result
-        return self.get_match_result(board)
+        Returns:
+            Result of the match: "win", "loss", "draw"
+        """
+        driver = AsyncMatchDriver(self, opponent_name, opponent_elo, time_control, chessnut,
+                                  ponder=self.ponder, repertoire=repertoire)
+        try:
+            return await driver.run()
+        finally:
+            self.last_match_stats = driver.stats()
+            self.last_match_moves = list(driver.board.move_stack)
     
-    def get_player_move(self, board):
+    def parse_move(self, board, move_text):
         """
-        Get a valid move from the player.
+        Convert player input to a legal move.
         
         Args:
             board: Current chess.Board position
+            move_text: Move in algebraic (e.g., Nf3, exd8=Q+), UCI (e.g., e2e4) or
+                long algebraic notation (e.g., Ng1-f3)
             
         Returns:
-            A valid chess.Move
+            A legal chess.Move
+            
+        Raises:
+            ValueError: If the input is not a legal move, with a message for the player
+                (an AmbiguousMoveError listing the candidates if it is ambiguous or incomplete)
         """
-        while True:
-            try:
-                move_uci = input("\nYour move (e.g., e2e4, g1f3): ").strip()
-                
-                # Handle special commands
-                if move_uci.lower() in ['quit', 'exit', 'resign']:
-                    confirm = input("Are you sure you want to resign? (y/n): ").lower()
-                    if confirm.startswith('y'):
-                        raise KeyboardInterrupt("Player resigned")
-                    continue
-                
-                # Check for algebraic notation (like Nf3) and convert if needed
-                if len(move_uci) <= 4 and not move_uci[0].isdigit():
-                    # Try to find a matching move
-                    for legal_move in board.legal_moves:
-                        if board.san(legal_move) == move_uci:
-                            return legal_move
-                
-                # Try UCI format
-                move = chess.Move.from_uci(move_uci)
-                
-                # Validate move
-                if move in board.legal_moves:
-                    return move
-                else:
-                    print("Illegal move. Try again.")
-            except ValueError:
-                print("Invalid format. Please use UCI notation (e.g., e2e4) or algebraic notation (e.g., Nf3).")
-            except KeyboardInterrupt:
-                raise
-            except:
-                print("Error processing move. Try again.")
+        # One index of every notation per position; see move_input.py
+        return resolve_move(board, move_text)
     
     def display_match_intro(self, opponent_name, opponent_elo, time_control):
         """Display an introduction to the chess match"""
-        os.system('cls' if os.name == 'nt' else 'clear')
+        get_screen().clear()
         print("=" * 60)
         print(f" CHESS MATCH: YOU vs. {opponent_name.upper()}")
         print("=" * 60)
@@ -284,10 +222,13 @@ class ChessMatchManager:
         if time_control:
             print(f"Time Control: {time_control}")
         print("\nYou play as White, your opponent plays as Black.")
-        print("\nEnter moves in UCI format (e.g., e2e4) or algebraic notation (e.g., Nf3)")
+        print("\nEnter moves in algebraic notation (e.g., Nf3) or UCI format (e.g., e2e4)")
         print("Type 'resign' to forfeit the match.")
         print("=" * 60)
-        input("\nPress Enter to begin the match...")
+        read_input("\nPress Enter to begin the match...")
+        
+        # The intro replaced the screen, so the next board is drawn in full
+        self.board_renderer.invalidate()
     
     def display_board(self, board):
         """
@@ -296,46 +237,28 @@ class ChessMatchManager:
         Args:
             board: chess.Board to display
         """
-        os.system('cls' if os.name == 'nt' else 'clear')
-        
-        # Convert board to string
-        board_str = str(board)
-        
-        # Create a better representation with row/column labels
-        output = []
-        output.append("  a b c d e f g h")
-        output.append(" +-----------------+")
-        
-        rows = board_str.split('\n')
-        for i, row in enumerate(rows):
-            output.append(f"{8-i}| {' '.join(row)} |{8-i}")
-        
-        output.append(" +-----------------+")
-        output.append("  a b c d e f g h")
-        
-        # Print the board
-        print('\n'.join(output))
-        
-        # Show additional information
-        if board.is_check():
-            print("\nCHECK!")
-        
-        # Show last move if available
-        if board.move_stack:
-            last_move = board.peek()
-            print(f"\nLast move: {last_move.uci()}")
+        # Redraws only the squares that changed since the last move
+        self.board_renderer.draw(board)
+    
+    def format_clock(self, seconds):
+        """Format a clock reading as MM:SS"""
+        seconds = max(0, seconds)
+        return f"{int(seconds // 60):02d}:{int(seconds % 60):02d}"
     
     def display_clock(self, player_time, engine_time):
         """Display the remaining time for both players"""
-        player_minutes = int(player_time // 60)
-        player_seconds = int(player_time % 60)
-        
-        engine_minutes = int(engine_time // 60)
-        engine_seconds = int(engine_time % 60)
-        
         print(f"\nTime remaining:")
-        print(f"You: {player_minutes:02d}:{player_seconds:02d}")
-        print(f"Opponent: {engine_minutes:02d}:{engine_seconds:02d}")
+        print(f"You: {self.format_clock(player_time)}")
+        print(f"Opponent: {self.format_clock(engine_time)}")
+    
+    def draw_live_clock(self, player_time, engine_time):
+        """
+        Redraw the clock in the top right corner of the terminal while a side
+        is thinking, leaving the cursor (and any half-typed move) where it is.
+        """
+        clock = f"You {self.format_clock(player_time)} | Opponent {self.format_clock(engine_time)}"
+        self.screen.update_region("clock", clock)
+        self.screen.refresh()
     
     def get_match_result(self, board):
         """
@@ -369,6 +292,31 @@ class ChessMatchManager:
         else:
             return "draw"  # Default case
     
+    def adjudicate(self, board):
+        """
+        End a match early if the tablebases show it is already decided.
+        
+        Args:
+            board: Current chess.Board position
+            
+        Returns:
+            "win", "loss", or "draw", or None if the match should go on
+        """
+        if not self.tablebase_adjudication:
+            return None
+        
+        verdict = self.tablebase.adjudicate(board)
+        if verdict == "1-0":
+            print("The tablebases show a forced win for you. Your opponent resigns.")
+            return "win"
+        elif verdict == "0-1":
+            print("The tablebases show a forced win for your opponent. The match is adjudicated.")
+            return "loss"
+        elif verdict:
+            print("The tablebases show a dead draw. The match is adjudicated as a draw.")
+            return "draw"
+        return None
+    
     def simulate_match(self, opponent_elo, player_skill):
         """
         Simulate a chess match without actually playing it.
@@ -381,21 +329,8 @@ class ChessMatchManager:
         Returns:
             "win", "loss", or "draw" and a narrative description
         """
-        # Calculate win probability based on Elo difference
-        # Using a simplified version of the Elo formula
-        expected_score = 1 / (1 + 10**((opponent_elo - player_skill) / 400))
-        
-        # Add some randomness
-        import random
-        roll = random.random()
-        
-        # Determine outcome
-        if roll < expected_score:
-            result = "win"
-        elif roll < expected_score + 0.2:  # 20% chance of draw
-            result = "draw"
-        else:
-            result = "loss"
+        # Elo expected score with a draw rate that depends on the players' level
+        result = simulate_match(player_skill, opponent_elo)
         
         # Generate narrative based on the result
         narrative = self.generate_match_narrative(result, opponent_elo, player_skill)
@@ -528,26 +463,168 @@ class ChessMatchManager:
         
         return random.choice(tips)
     
-    def analyze_position(self, board, depth=15):
+    def review_game(self, moves, depth=None):
+        """
+        Review a finished game move by move, printing each move's verdict as
+        soon as it is ready.
+        
+        Args:
+            moves: The game's moves, e.g. board.move_stack
+            depth: Search depth per position, or None for the default
+            
+        Returns:
+            The GameReview summary, or None if no engine is available
+        """
+        if not self.has_engine():
+            print("A game review needs the chess engine.")
+            return None
+        
+        review = GameReview(self, depth=depth) if depth else GameReview(self)
+        
+        print("\n" + "=" * 60)
+        print(" GAME REVIEW")
+        print("=" * 60)
+        for result in review.review(moves):
+            number = (result["ply"] + 1) // 2
+            dots = "." if result["color"] == chess.WHITE else "..."
+            line = f"{number}{dots} {result['move']}".ljust(14)
+            if result["eval_after"] is not None:
+                line += f" eval {result['eval_after'] / 100:+6.2f}"
+            if result["cp_loss"] is not None:
+                line += f"  loss {result['cp_loss']:4d}"
+            if result["classification"] in ("inaccuracy", "mistake", "blunder"):
+                line += f"  {result['classification'].upper()} (best was {result['best_move']})"
+            print(line)
+        
+        summary = review.summary()
+        print("=" * 60)
+        for color, name in ((chess.WHITE, "You"), (chess.BLACK, "Opponent")):
+            side = summary[color]
+            print(f"{name}: accuracy {side['accuracy']:.1f}%, average loss {side['avg_cp_loss']:.0f} cp, "
+                  f"{side['blunders']} blunders, {side['mistakes']} mistakes, {side['inaccuracies']} inaccuracies")
+        return summary
+    
+    def analyze_position(self, board, depth=15, timeout=5):
         """
         Analyze the current position using the engine.
         
         Args:
             board: chess.Board to analyze
             depth: Search depth
+            timeout: Maximum seconds to wait for a free engine, or None to wait as long as needed
             
         Returns:
             Evaluation and best move
         """
-        if not self.engine:
-            return None, None
+        # Endgames in the tablebases need no search at all
+        score, best_move = self.tablebase.evaluate(board)
+        if score is not None:
+            return score, best_move
+        
+        # Positions already searched deep enough are answered from the cache
+        cached = self.eval_cache.get(board, depth)
+        if cached:
+            return cached
+        
+        # Don't keep the player waiting if every engine is busy
+        with self.lease_engine(timeout=timeout) as engine:
+            if not engine:
+                return None, None
+            
+            # Run the analysis
+            try:
+                info = engine.analyse(board, chess.engine.Limit(depth=depth))
+                score = info["score"].white()
+                best_move = info.get("pv", [None])[0]
+                
+                self.eval_cache.put(board, info.get("depth", depth), score, best_move)
+                return score, best_move
+            except:
+                return None, None
+    
+    def stream_analysis(self, board, multipv=1, depth=15, limit=None):
+        """
+        Analyze a position, yielding the engine's results as the search deepens.
+        
+        Breaking out of the loop (or closing the generator) stops the search
+        and returns the engine to the pool.
+        
+        Args:
+            board: chess.Board to analyze
+            multipv: Number of candidate lines to report
+            depth: Search depth, if no limit is given
+            limit: Optional chess.engine.Limit, e.g. Limit(time=2), or None to use depth
+            
+        Yields:
+            chess.engine.InfoDict updates with depth, multipv, score, pv, nps, etc.
+        """
+        limit = limit or chess.engine.Limit(depth=depth)
         
-        # Run the analysis
         try:
-            info = self.engine.analyse(board, chess.engine.Limit(depth=depth))
-            score = info["score"].white()
-            best_move = info.get("pv", [None])[0]
+            with self.lease_engine(timeout=5) as engine:
+                if not engine:
+                    return
+                
+                principal = None
+                try:
+                    with engine.analysis(board, limit, multipv=multipv) as analysis:
+                        for info in analysis:
+                            if self._is_principal_line(info):
+                                principal = info
+                            yield info
+                finally:
+                    self._remember_analysis(board, principal)
+        except (chess.engine.EngineError, chess.engine.EngineTerminatedError) as e:
+            print(f"Analysis failed: {e}")
+    
+    async def stream_analysis_async(self, board, multipv=1, depth=15, limit=None):
+        """
+        Analyze a position on the running event loop, yielding the engine's
+        results as the search deepens.
+        
+        Leaving the async for loop or cancelling the consuming task stops the
+        search and returns the engine to the pool.
+        
+        Args:
+            board: chess.Board to analyze
+            multipv: Number of candidate lines to report
+            depth: Search depth, if no limit is given
+            limit: Optional chess.engine.Limit, e.g. Limit(time=2), or None to use depth
             
-            return score, best_move
-        except:
-            return None, None
+        Yields:
+            chess.engine.InfoDict updates with depth, multipv, score, pv, nps, etc.
+        """
+        limit = limit or chess.engine.Limit(depth=depth)
+        board = board.copy()
+        
+        with ExitStack() as stack:
+            # Leasing may have to wait for a free engine, so don't block the loop
+            engine = await asyncio.to_thread(stack.enter_context, self.lease_engine(timeout=5))
+            if not engine:
+                return
+            
+            analysis = await run_on_engine(engine, lambda protocol: protocol.analysis(board, limit, multipv=multipv))
+            principal = None
+            try:
+                while True:
+                    try:
+                        info = await run_on_engine(engine, lambda protocol: analysis.get())
+                    except chess.engine.AnalysisComplete:
+                        break
+                    if self._is_principal_line(info):
+                        principal = info
+                    yield info
+            finally:
+                engine.protocol.loop.call_soon_threadsafe(analysis.stop)
+                await run_on_engine(engine, lambda protocol: analysis.wait())
+                self._remember_analysis(board, principal)
+    
+    def _is_principal_line(self, info):
+        """Check whether an analysis update is an exact score for the best line"""
+        return (info.get("multipv", 1) == 1 and "score" in info and bool(info.get("pv"))
+                and not info.get("lowerbound") and not info.get("upperbound"))
+    
+    def _remember_analysis(self, board, info):
+        """Store the deepest completed best line of a streamed analysis in the cache"""
+        if info is not None:
+            self.eval_cache.put(board, info.get("depth", 0), info["score"].white(), info["pv"][0])
@@ -7,11 +7,20 @@ using the EasyLinkSDK with enhanced reliability and error handling.
 import os
 import sys
 import time
-import threading
+import random
 import queue
 from typing import Optional, Callable, Dict, List, Any
 import logging
 
+import chess
+import chess.engine
+
+from input_mux import SelectableQueue
+from board_reactor import Reactor
+from move_inference import MoveInference
+from move_coalescer import MoveCoalescer, SETTLE_WINDOW
+from board_sync import BoardSync
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -20,6 +29,34 @@ logging.basicConfig(
 )
 logger = logging.getLogger("ChessnutIntegration")
 
+# Environment variable that replaces the board with a simulated one
+SIMULATOR_ENV = "GCR_CHESSNUT_SIM"
+
+# Connection states
+DISCONNECTED = "disconnected"
+SCANNING = "scanning"      # Looking for devices
+CONNECTING = "connecting"  # Opening the connection to a device
+CONNECTED = "connected"
+DEGRADED = "degraded"      # Still connected, but a heartbeat failed
+
+# Reactor timers (seconds)
+HEARTBEAT_INTERVAL = 5.0    # Connection check after this long without board activity
+DEGRADED_CHECK_DELAY = 1.0  # Quicker checks while degraded
+DEGRADED_CHECKS = 2         # Failed checks while degraded before reconnecting
+SDK_CALL_TIMEOUT = 5.0      # Longest wait for an SDK call made on the reactor thread
+
+# Reconnect backoff: each delay doubles up to the maximum, and a random part
+# of it is taken off so that retries don't fall into step with a flaky link
+BACKOFF_INITIAL = 1.0
+BACKOFF_FACTOR = 2.0
+BACKOFF_MAX = 30.0
+BACKOFF_JITTER = 0.5
+
+# Bounded queues between the SDK, the reactor and the game
+EVENT_QUEUE_SIZE = 64     # Board events not yet handled by the reactor
+MOVE_QUEUE_SIZE = 8       # Moves not yet taken by the game
+EVENT_PUT_TIMEOUT = 0.5   # How long the SDK's thread waits for room before an event is dropped
+
 # Import EasyLinkSDK - adjust path as needed based on your installation
 try:
     # Try to import from installed package
@@ -63,28 +100,74 @@ except ImportError:
 class ChessnutInterface:
     """Interface for the Chessnut Pro electronic chess board with enhanced reliability"""
     
-    def __init__(self):
-        """Initialize the Chessnut interface"""
+    def __init__(self, settle_window: float = SETTLE_WINDOW,
+                 easylink_factory: Optional[Callable[[], Any]] = None):
+        """
+        Initialize the Chessnut interface
+        
+        Args:
+            settle_window: Seconds the board has to stay still before a move is taken from it
+            easylink_factory: Function returning the EasyLink object to connect
+                with, e.g. a SimulatedEasyLink; defaults to the SDK's EasyLink
+        """
+        self.easylink_factory = easylink_factory or EasyLink
         self.easylink = None
-        self.connected = False
-        self.move_queue = queue.Queue()
+        self.state = DISCONNECTED
+        self.state_since = time.time()
+        self.state_listeners = []
+        self.device_name = None
+        # Board events wait here until the reactor handles them; bounded, so a
+        # stalled game pushes back on the SDK instead of piling up events
+        self.events = SelectableQueue(maxsize=EVENT_QUEUE_SIZE)
+        # Selectable, so moves can be awaited together with the keyboard
+        self.move_queue = SelectableQueue(maxsize=MOVE_QUEUE_SIZE, on_get=self._move_taken)
         self.board_state = None
+        # Last confirmed position, for working out moves from board snapshots
+        self.inference = MoveInference()
         self.move_callback = None
         self.error_callback = None
-        self.connection_thread = None
-        self.listener_thread = None
         self.running = False
         self.last_sync_time = 0
-        self.connection_lock = threading.Lock()
         self.last_error = None
         self.auto_reconnect = True
         
+        # The connection, board events, heartbeats and reconnects are all
+        # owned by this thread; callers only hand it requests
+        self.reactor = Reactor("ChessnutReactor")
+        self._heartbeat_timer = None
+        self._heartbeat_failures = 0
+        self._retry_timer = None
+        self._retry_time = None
+        self._backoff = BACKOFF_INITIAL
+        self._reading_events = False
+        
+        # Turns bursts of sensor events into single moves
+        self.coalescer = MoveCoalescer(self.reactor, self.inference, self._release_move, settle_window)
+        
+        # Brings the physical board to the game's position, lighting single moves
+        self.board_sync = BoardSync(self.reactor, self.inference, self.coalescer,
+                                    lambda fen: self.easylink.set_position(fen), self._show_squares)
+        self.coalescer.on_synced = self.board_sync.board_synced
+        
         # Track connection attempts to avoid infinite retries
         self.connection_attempts = 0
-        self.max_connection_attempts = 3
+        self.max_connection_attempts = 8
+        
+        self.counters = {
+            "state_changes": 0,
+            "connect_attempts": 0,
+            "connect_failures": 0,
+            "connections": 0,
+            "connections_lost": 0,
+            "degraded": 0,
+        }
+        
+        # Backpressure statistics
+        self.events_dropped = 0
+        self.backpressure_pauses = 0
         
         # Track if SDK is available
-        self.sdk_available = EASYLINK_AVAILABLE
+        self.sdk_available = EASYLINK_AVAILABLE or easylink_factory is not None
     
     def set_callbacks(self, move_callback: Callable[[str], None], 
                       error_callback: Callable[[str], None]):
@@ -98,9 +181,39 @@ class ChessnutInterface:
         self.move_callback = move_callback
         self.error_callback = error_callback
     
+    @property
+    def connected(self) -> bool:
+        """Whether moves can be taken from the board"""
+        return self.state in (CONNECTED, DEGRADED)
+    
+    def add_state_listener(self, listener: Callable[[str, str, str], None]):
+        """
+        Register a function to be told about connection state changes
+        
+        Args:
+            listener: Called with the old state, the new state and the reason,
+                on the reactor thread, so it must not block
+        """
+        self.state_listeners.append(listener)
+    
+    def _set_state(self, state: str, reason: str = ""):
+        """Move to a new connection state and notify the listeners (reactor thread)"""
+        if state == self.state:
+            return
+        old_state = self.state
+        self.state = state
+        self.state_since = time.time()
+        self.counters["state_changes"] += 1
+        logger.info(f"Chessnut Pro {old_state} -> {state}" + (f" ({reason})" if reason else ""))
+        for listener in self.state_listeners:
+            try:
+                listener(old_state, state, reason)
+            except Exception as e:
+                logger.error(f"Error in connection state listener: {e}")
+    
     def connect(self, device_name: Optional[str] = None, auto_retry: bool = True):
         """
-        Connect to the Chessnut Pro board
+        Connect to the Chessnut Pro board without waiting for the connection
         
         Args:
             device_name: Optional device name to connect to
@@ -116,104 +229,100 @@ class ChessnutInterface:
                 self.error_callback("Chessnut SDK not available. Please install EasyLinkSDK.")
             return False
         
-        # Reset connection attempts
-        self.connection_attempts = 0
         self.auto_reconnect = auto_retry
+        self.device_name = device_name
         
-        # Start connection in a separate thread to avoid blocking the game
+        # Connect on the reactor thread to avoid blocking the game
         self.running = True
-        
-        with self.connection_lock:
-            # Clean up any existing thread
-            if self.connection_thread and self.connection_thread.is_alive():
-                logger.debug("Connection thread already running, not starting a new one")
-                return self.connected
-                
-            self.connection_thread = threading.Thread(
-                target=self._connect_thread, 
-                args=(device_name, auto_retry)
-            )
-            self.connection_thread.daemon = True
-            self.connection_thread.start()
-        
-        # Give it a moment to try to connect
-        time.sleep(1)
+        self.reactor.start()
+        self.reactor.call_soon_threadsafe(self._start_connecting)
         return True  # Returns if connection attempt was initiated, not necessarily successful
     
-    def _connect_thread(self, device_name: Optional[str], auto_retry: bool):
-        """Thread function for connecting to the board"""
-        try:
-            with self.connection_lock:
-                self.connection_attempts += 1
-                
-                # Clean up any existing connection
-                if self.easylink:
-                    try:
-                        self.easylink.disconnect()
-                    except:
-                        pass
-                    self.easylink = None
-                
-                logger.info(f"Attempting to connect to Chessnut Pro (attempt {self.connection_attempts})")
-                self.easylink = EasyLink()
-                
-                if device_name:
-                    # Connect to a specific device
-                    logger.info(f"Connecting to device: {device_name}")
-                    self.connected = self.easylink.connect(device_name)
-                else:
-                    # Scan for devices and connect to the first one found
-                    logger.info("Scanning for Chessnut devices...")
-                    devices = self.easylink.scan_devices()
-                    if devices:
-                        logger.info(f"Found devices: {devices}")
-                        self.connected = self.easylink.connect(devices[0])
-                    else:
-                        logger.warning("No Chessnut devices found")
-                        self.connected = False
-                
-                if self.connected:
-                    logger.info("Successfully connected to Chessnut Pro board")
-                    try:
-                        self.board_state = self.easylink.get_board_state()
-                        
-                        # Start the event listener thread
-                        if self.listener_thread and self.listener_thread.is_alive():
-                            logger.debug("Listener thread already running")
-                        else:
-                            self.listener_thread = threading.Thread(target=self._event_listener)
-                            self.listener_thread.daemon = True
-                            self.listener_thread.start()
-                    except Exception as e:
-                        logger.error(f"Error initializing board state: {e}")
-                        self.connected = False
-                        self.last_error = str(e)
-                        if self.error_callback:
-                            self.error_callback(f"Error initializing board: {e}")
-                else:
-                    logger.warning("Failed to connect to Chessnut Pro board")
-                    if self.error_callback:
-                        self.error_callback("Failed to connect to Chessnut Pro")
-                    
-                    if auto_retry and self.connection_attempts < self.max_connection_attempts:
-                        logger.info(f"Will retry connection in 5 seconds (attempt {self.connection_attempts}/{self.max_connection_attempts})...")
-                        time.sleep(5)
-                        # Try to reconnect (outside of lock to avoid deadlock)
+    def _start_connecting(self):
+        """Begin a fresh round of connection attempts (reactor thread)"""
+        if self.state != DISCONNECTED:
+            logger.debug("Already connected or connecting, not starting again")
+            return
+        if self._retry_timer:
+            # Asked again while waiting to retry: retry now
+            self._retry_timer.cancel()
+        else:
+            self.connection_attempts = 0
+            self._backoff = BACKOFF_INITIAL
+        self._attempt_connect()
+    
+    def _attempt_connect(self):
+        """Make one connection attempt, scheduling the next one if it fails (reactor thread)"""
+        self._retry_timer = None
+        self._retry_time = None
+        if not self.running:
+            return
         
+        self.connection_attempts += 1
+        self.counters["connect_attempts"] += 1
+        logger.info(f"Attempting to connect to Chessnut Pro (attempt {self.connection_attempts})")
+        try:
+            self._release_easylink()
+            self.easylink = self.easylink_factory()
+            
+            device_name = self.device_name
+            if not device_name:
+                # Scan for devices and connect to the first one found
+                self._set_state(SCANNING)
+                devices = self.easylink.scan_devices()
+                if not devices:
+                    raise ConnectionError("No Chessnut devices found")
+                logger.info(f"Found devices: {devices}")
+                device_name = devices[0]
+            
+            self._set_state(CONNECTING, device_name)
+            if not self.easylink.connect(device_name):
+                raise ConnectionError("Failed to connect to Chessnut Pro")
+            self.board_state = self.easylink.get_board_state()
         except Exception as e:
-            logger.error(f"Error connecting to Chessnut Pro: {e}")
-            self.last_error = str(e)
-            if self.error_callback:
-                self.error_callback(f"Connection error: {e}")
-            self.connected = False
+            self._connect_failed(e)
+            return
         
-        # If we should retry and reached here (likely due to error), try again outside the lock
-        if auto_retry and not self.connected and self.connection_attempts < self.max_connection_attempts:
-            self._connect_thread(device_name, auto_retry)
+        self.last_sync_time = time.time()
+        self._backoff = BACKOFF_INITIAL
+        self._heartbeat_failures = 0
+        self.counters["connections"] += 1
+        self._set_state(CONNECTED, device_name)
+        self._start_listening()
+        if self.board_state is not None:
+            # Picks up a move made while the connection was down
+            self.coalescer.snapshot(self.board_state)
+    
+    def _connect_failed(self, error: Exception):
+        """Record a failed attempt and schedule the next one with backoff (reactor thread)"""
+        message = str(error) if isinstance(error, ConnectionError) else f"Connection error: {error}"
+        logger.warning(message)
+        self.last_error = str(error)
+        self.counters["connect_failures"] += 1
+        self._set_state(DISCONNECTED, message)
+        if self.error_callback:
+            self.error_callback(message)
+        
+        if self.auto_reconnect and self.running and self.connection_attempts < self.max_connection_attempts:
+            delay = self._backoff * random.uniform(1 - BACKOFF_JITTER, 1)
+            self._backoff = min(self._backoff * BACKOFF_FACTOR, BACKOFF_MAX)
+            logger.info(f"Will retry connection in {delay:.1f} seconds "
+                        f"(attempt {self.connection_attempts}/{self.max_connection_attempts})...")
+            self._retry_time = time.monotonic() + delay
+            self._retry_timer = self.reactor.call_later(delay, self._attempt_connect)
+    
+    def _release_easylink(self):
+        """Close the SDK connection, if any (reactor thread)"""
+        if self.easylink:
+            try:
+                self.easylink.disconnect()
+            except Exception:
+                pass
+            self.easylink = None
     
     def ensure_connection(self):
         """
-        Check connection and attempt to reconnect if disconnected
+        Check connection and start reconnecting if disconnected, without waiting
         
         Returns:
             True if connected, False otherwise
@@ -221,58 +330,159 @@ class ChessnutInterface:
         if not self.sdk_available:
             return False
             
-        if not self.connected and self.auto_reconnect:
-            logger.info("Connection lost. Attempting to reconnect...")
-            # Reset connection attempts for a fresh reconnection cycle
-            self.connection_attempts = 0
-            return self.connect(auto_retry=True)
+        if not self.connected and self.auto_reconnect and self.state == DISCONNECTED:
+            self.connect(self.device_name, auto_retry=True)
         return self.connected
     
-    def _event_listener(self):
-        """Thread function for listening to board events"""
+    def _start_listening(self):
+        """Start taking board events and schedule the heartbeat (reactor thread)"""
+        logger.info("Starting board event listener")
+        self.easylink.register_event_callback(self._queue_board_event)
+        self._resume_events()
+        self._schedule_heartbeat(HEARTBEAT_INTERVAL)
+    
+    def _stop_listening(self):
+        """Stop taking board events and cancel the heartbeat (reactor thread)"""
+        self._pause_events()
+        self.coalescer.reset()
+        if self._heartbeat_timer:
+            self._heartbeat_timer.cancel()
+            self._heartbeat_timer = None
+    
+    def _queue_board_event(self, event: BoardEvent):
+        """
+        Callback registered with the SDK; hands the event to the reactor.
+        
+        If the reactor is behind, the SDK's thread waits briefly for room
+        before the event is dropped.
+        """
         try:
-            logger.info("Starting board event listener")
-            
-            # Register callback for board events
-            if self.easylink:
-                self.easylink.register_event_callback(self._board_event_callback)
-                
-                # Keep thread alive with a small enough interval to detect disconnections
-                while self.running and self.connected:
-                    time.sleep(0.1)
-                    
-                    # Periodically check if still connected (every 5 seconds)
-                    if time.time() - self.last_sync_time > 5:
-                        try:
-                            if self.easylink:
-                                # A lightweight operation to check connection
-                                self.board_state = self.easylink.get_board_state()
-                                self.last_sync_time = time.time()
-                        except Exception as e:
-                            logger.warning(f"Connection check failed: {e}")
-                            self.connected = False
-                            if self.error_callback:
-                                self.error_callback("Lost connection to Chessnut Pro")
-                            
-                            # Try to reconnect if auto-reconnect is enabled
-                            if self.auto_reconnect:
-                                self.ensure_connection()
+            if self.reactor.in_reactor_thread():
+                self.events.put_nowait(event)
+            else:
+                self.events.put(event, timeout=EVENT_PUT_TIMEOUT)
+        except queue.Full:
+            self.events_dropped += 1
+            logger.warning(f"Board event queue full, dropped an event ({self.events_dropped} so far)")
+    
+    def _drain_events(self):
+        """Handle queued board events while the game has room for moves (reactor thread)"""
+        self.events.clear_wakeups()
+        self.coalescer.release_held()
+        # A move waiting for room would be lost under the next one, so stop
+        # taking events until the game has taken it
+        while not self.move_queue.full() and not self.coalescer.holding:
+            try:
+                event = self.events.get_nowait()
+            except queue.Empty:
+                return
+            self._board_activity()
+            self._board_event_callback(event, self.events.last_put_time)
+        
+        # The game isn't taking moves; leave the rest queued until it does
+        self._pause_events()
+        self.backpressure_pauses += 1
+        logger.warning("Move queue full, holding board events until the game catches up")
+        if not self.move_queue.full() and not self.coalescer.holding:
+            # A move was taken while pausing
+            self._resume_events()
+    
+    def _pause_events(self):
+        if self._reading_events:
+            self.reactor.remove_reader(self.events)
+            self._reading_events = False
+    
+    def _resume_events(self):
+        if not self._reading_events and self.running and self.connected:
+            self.reactor.add_reader(self.events, self._drain_events)
+            self._reading_events = True
+            self._drain_events()
+    
+    def _move_taken(self):
+        """Called when the game takes a move from the queue (game thread)"""
+        if not self._reading_events and self.running and self.connected:
+            self.reactor.call_soon_threadsafe(self._resume_events)
+    
+    def _schedule_heartbeat(self, delay: float):
+        self._heartbeat_timer = self.reactor.call_later(delay, self._heartbeat)
+    
+    def _board_activity(self):
+        """Board events prove the connection works (reactor thread)"""
+        self.last_sync_time = time.time()
+        if self.state == DEGRADED:
+            self._heartbeat_failures = 0
+            self._set_state(CONNECTED, "board activity")
+    
+    def _heartbeat(self):
+        """Check the connection if the board has been quiet for a while (reactor thread)"""
+        self._heartbeat_timer = None
+        if not (self.running and self.connected):
+            return
+        
+        # Board activity proves the connection, so only a quiet board is checked
+        quiet = time.time() - self.last_sync_time
+        if self.state == CONNECTED and quiet < HEARTBEAT_INTERVAL:
+            self._schedule_heartbeat(HEARTBEAT_INTERVAL - quiet)
+            return
         
+        try:
+            # A lightweight operation to check connection
+            self.board_state = self.easylink.get_board_state()
+            self.last_sync_time = time.time()
         except Exception as e:
-            logger.error(f"Error in board event listener: {e}")
+            logger.warning(f"Connection check failed: {e}")
             self.last_error = str(e)
-            if self.error_callback:
-                self.error_callback(f"Board listener error: {e}")
-            self.connected = False
+            self._heartbeat_failures += 1
+            if self._heartbeat_failures > DEGRADED_CHECKS:
+                self._connection_lost("Lost connection to Chessnut Pro")
+                return
+            if self.state != DEGRADED:
+                self.counters["degraded"] += 1
+                self._set_state(DEGRADED, str(e))
+            self._schedule_heartbeat(DEGRADED_CHECK_DELAY)
+            return
+        
+        self._heartbeat_failures = 0
+        if self.state == DEGRADED:
+            self._set_state(CONNECTED, "heartbeat answered")
+        self._schedule_heartbeat(HEARTBEAT_INTERVAL)
+    
+    def _connection_lost(self, message: str):
+        """Mark the board disconnected and start reconnecting (reactor thread)"""
+        self.counters["connections_lost"] += 1
+        self._stop_listening()
+        self._set_state(DISCONNECTED, message)
+        if self.error_callback:
+            self.error_callback(message)
+        
+        # Try to reconnect if auto-reconnect is enabled
+        if self.auto_reconnect and self.running:
+            logger.info("Connection lost. Attempting to reconnect...")
+            self._start_connecting()
     
-    def _board_event_callback(self, event: BoardEvent):
-        """Callback for board events from the Chessnut Pro"""
+    def _board_event_callback(self, event: BoardEvent, event_time: Optional[float] = None):
+        """
+        Handle a board event from the Chessnut Pro (reactor thread)
+        
+        Args:
+            event: The event
+            event_time: time.monotonic() at which the board reported it
+        """
         try:
             if not event:
                 return
+            
+            event_type = getattr(event, 'event_type', None)
+            snapshot = getattr(event, 'board_state', None)
                 
-            if hasattr(event, 'event_type') and event.event_type == "move":
-                # A move was made on the physical board
+            if event_type in ("move", "board_changed") and snapshot is not None:
+                # The board reported what it looks like now; the move is worked
+                # out from that once the board has settled
+                self.board_state = snapshot
+                self.coalescer.snapshot(snapshot, event_time)
+            
+            elif event_type == "move":
+                # A move was made on the physical board, without a snapshot
                 if not hasattr(event, 'move') or not event.move:
                     logger.warning("Received move event without move data")
                     return
@@ -284,50 +494,17 @@ class ChessnutInterface:
                     logger.warning("Received incomplete move data")
                     return
                 
-                # Convert to UCI format (e.g., e2e4)
-                uci_move = f"{move.from_square}{move.to_square}"
-                
-                # Special handling for castling
-                if hasattr(move, 'piece') and move.piece and hasattr(move.piece, 'type') and move.piece.type == "king":
-                    # Detect kingside castling (king moves two squares to the right)
-                    if move.from_square[0] == 'e' and move.to_square[0] == 'g':
-                        logger.info("Detected kingside castling")
-                    # Detect queenside castling (king moves two squares to the left)
-                    elif move.from_square[0] == 'e' and move.to_square[0] == 'c':
-                        logger.info("Detected queenside castling")
-                
-                # Special handling for pawn promotion
-                if hasattr(move, 'piece') and move.piece and hasattr(move.piece, 'type') and move.piece.type == "pawn":
-                    if move.to_square[1] in ["1", "8"]:
-                        # This is a pawn promotion
-                        logger.info("Detected pawn promotion")
-                        # The game will prompt for promotion piece later - no need to add it here
-                
-                logger.info(f"Move detected on board: {uci_move}")
-                
-                # Put the move in the queue
-                self.move_queue.put(uci_move)
-                
-                # Call the move callback if set
-                if self.move_callback:
-                    self.move_callback(uci_move)
+                # Released in UCI format (e.g., e2e4) once the board settles; castling,
+                # en passant and missing promotion pieces are sorted out when the game resolves it
+                self.coalescer.move(move.from_square, move.to_square, event_time)
             
-            elif hasattr(event, 'event_type') and event.event_type == "board_changed":
-                # The board state changed (piece added/removed manually)
-                if hasattr(event, 'board_state'):
-                    self.board_state = event.board_state
-                    logger.debug("Board state updated")
+            elif event_type == "board_changed":
+                logger.debug("Board changed without a snapshot")
             
-            elif hasattr(event, 'event_type') and event.event_type == "connection_lost":
+            elif event_type == "connection_lost":
                 # Connection to the board was lost
                 logger.warning("Connection to Chessnut Pro was lost")
-                self.connected = False
-                if self.error_callback:
-                    self.error_callback("Connection to Chessnut Pro was lost")
-                
-                # Try to reconnect if auto-reconnect is enabled
-                if self.auto_reconnect:
-                    self.ensure_connection()
+                self._connection_lost("Connection to Chessnut Pro was lost")
         
         except Exception as e:
             logger.error(f"Error processing board event: {e}")
@@ -335,6 +512,23 @@ class ChessnutInterface:
             if self.error_callback:
                 self.error_callback(f"Board event error: {e}")
     
+    def _release_move(self, uci_move: str) -> bool:
+        """
+        Hand a settled move to the game (reactor thread)
+        
+        Returns:
+            False if the game's move queue is full
+        """
+        if self.move_queue.full():
+            return False
+        logger.info(f"Move detected on board: {uci_move}")
+        self.move_queue.put_nowait(uci_move)
+        
+        # Call the move callback if set
+        if self.move_callback:
+            self.move_callback(uci_move)
+        return True
+    
     def get_move(self, timeout: Optional[float] = None) -> Optional[str]:
         """
         Get the next move from the physical board
@@ -373,7 +567,8 @@ class ChessnutInterface:
                 
             fen = board.fen()
             logger.info(f"Synchronizing board to position: {fen}")
-            self.easylink.set_position(fen)
+            # The SDK and the inference are only used from the reactor thread
+            self.reactor.run_sync(self.board_sync.sync_now, board.copy(), timeout=SDK_CALL_TIMEOUT)
             self.last_sync_time = time.time()
             return True
         except Exception as e:
@@ -383,6 +578,33 @@ class ChessnutInterface:
                 self.error_callback(f"Failed to sync board: {e}")
             return False
     
+    def sync_board(self, board) -> bool:
+        """
+        Bring the physical board to the game's position without waiting
+        
+        If the board is one move behind, only that move's squares are lit;
+        otherwise the full position is sent. Requests close together are
+        merged, and the sync is confirmed once the board shows the position.
+        
+        Args:
+            board: Chess board object with current game state
+            
+        Returns:
+            True if the sync was requested, False if the board isn't connected
+        """
+        if not self.ensure_connection():
+            return False
+        self.board_sync.request(board)
+        return True
+    
+    def _show_squares(self, squares: List[str]) -> bool:
+        """Light squares on the board, if its SDK can (reactor thread)"""
+        set_leds = getattr(self.easylink, "set_leds", None)
+        if set_leds is None:
+            return False
+        set_leds(squares)
+        return True
+    
     def get_connection_status(self) -> Dict[str, Any]:
         """
         Get detailed connection status
@@ -390,12 +612,24 @@ class ChessnutInterface:
         Returns:
             Dictionary with connection status details
         """
+        retry_time = self._retry_time
         return {
+            "state": self.state,
+            "state_seconds": time.time() - self.state_since,
             "connected": self.connected,
             "sdk_available": self.sdk_available,
             "last_error": self.last_error,
             "connection_attempts": self.connection_attempts,
-            "auto_reconnect": self.auto_reconnect
+            "auto_reconnect": self.auto_reconnect,
+            "next_retry_in": max(0.0, retry_time - time.monotonic()) if retry_time is not None else None,
+            **self.counters,
+            "queued_events": self.events.qsize(),
+            "queued_moves": self.move_queue.qsize(),
+            "events_dropped": self.events_dropped,
+            "backpressure_pauses": self.backpressure_pauses,
+            "reactor_wakeups": self.reactor.wakeups,
+            "coalescing": self.coalescer.stats(),
+            "sync": self.board_sync.stats()
         }
     
     def disconnect(self):
@@ -403,38 +637,58 @@ class ChessnutInterface:
         logger.info("Disconnecting from Chessnut Pro")
         self.running = False
         
-        with self.connection_lock:
-            if self.connected and self.easylink:
-                try:
-                    self.easylink.disconnect()
-                    logger.info("Successfully disconnected from Chessnut Pro")
-                except Exception as e:
-                    logger.error(f"Error disconnecting from Chessnut Pro: {e}")
-                finally:
-                    self.connected = False
-                    self.easylink = None
+        if self.reactor.running:
+            try:
+                self.reactor.run_sync(self._disconnect, timeout=SDK_CALL_TIMEOUT)
+            except Exception as e:
+                logger.error(f"Error disconnecting from Chessnut Pro: {e}")
+        else:
+            self._disconnect()
+    
+    def _disconnect(self):
+        self._stop_listening()
+        if self._retry_timer:
+            self._retry_timer.cancel()
+            self._retry_timer = None
+            self._retry_time = None
+        
+        if self.connected and self.easylink:
+            try:
+                self.easylink.disconnect()
+                logger.info("Successfully disconnected from Chessnut Pro")
+            except Exception as e:
+                logger.error(f"Error disconnecting from Chessnut Pro: {e}")
+        self.easylink = None
+        self._set_state(DISCONNECTED, "disconnected by the game")
 
 
 # Integration with chess module
-def integrate_with_chess_manager(chess_match_manager):
+def integrate_with_chess_manager(chess_match_manager, easylink_factory=None):
     """
     Integrates the Chessnut Pro with the game's chess match manager
     
     Args:
         chess_match_manager: The chess match manager from the game
+        easylink_factory: Optional function returning the EasyLink object to
+            use; setting GCR_CHESSNUT_SIM picks a simulated board
     
     Returns:
         The modified chess_match_manager
     """
-    if not EASYLINK_AVAILABLE:
+    if easylink_factory is None and os.environ.get(SIMULATOR_ENV):
+        # A simulated board that plays White's moves, for demos without hardware
+        from easylink_sim import SimulatedEasyLink
+        simulated_board = SimulatedEasyLink(side=chess.WHITE, move_interval=3.0)
+        easylink_factory = lambda: simulated_board
+    
+    if not EASYLINK_AVAILABLE and easylink_factory is None:
         logger.warning("EasyLinkSDK not available. Chessnut integration disabled.")
         # Store a dummy interface so the rest of the code can still reference it
         chess_match_manager.chessnut = ChessnutInterface()
         return chess_match_manager
     
-    original_get_player_move = chess_match_manager.get_player_move
     original_play_match = chess_match_manager.play_match
-    chessnut = ChessnutInterface()
+    chessnut = ChessnutInterface(easylink_factory=easylink_factory)
     
     def move_callback(move):
         logger.info(f"Move detected on Chessnut board: {move}")
@@ -450,175 +704,10 @@ def integrate_with_chess_manager(chess_match_manager):
     # Store the interface in the manager for access elsewhere
     chess_match_manager.chessnut = chessnut
     
-    # Replace the get_player_move method to check for physical moves
-    def enhanced_get_player_move(board):
-        """Enhanced get_player_move that checks for physical moves"""
-        if chessnut.connected:
-            print("Waiting for move on Chessnut Pro board or enter move manually...")
-            
-            # Try to get a move from the board (with a small timeout)
-            physical_move = chessnut.get_move(timeout=0.1)
-            if physical_move:
-                print(f"Move detected on physical board: {physical_move}")
-                try:
-                    # For pawn promotion, we need to handle it specially
-                    if len(physical_move) == 4:  # Standard move
-                        from_square = physical_move[:2]
-                        to_square = physical_move[2:4]
-                        
-                        # Check if this is a potential promotion
-                        piece = board.piece_at(chess.parse_square(from_square))
-                        if piece and piece.piece_type == chess.PAWN:
-                            # Check if moving to the last rank
-                            if (piece.color == chess.WHITE and to_square[1] == '8') or \
-                               (piece.color == chess.BLACK and to_square[1] == '1'):
-                                # Ask user what piece to promote to
-                                promotion_piece = None
-                                while promotion_piece not in ['q', 'r', 'b', 'n']:
-                                    promotion_piece = input("Promote to (q)ueen, (r)ook, (b)ishop, or k(n)ight? ").lower()
-                                    if promotion_piece not in ['q', 'r', 'b', 'n']:
-                                        print("Invalid choice. Please enter q, r, b, or n.")
-                                
-                                # Add promotion piece to the move
-                                physical_move += promotion_piece
-                    
-                    move = chess.Move.from_uci(physical_move)
-                    if move in board.legal_moves:
-                        return move
-                    else:
-                        print("Illegal move detected on physical board. Please make a valid move.")
-                except ValueError as ve:
-                    print(f"Invalid move format from physical board: {ve}. Please try again.")
-                except Exception as e:
-                    print(f"Error processing move: {e}. Please try again.")
-        
-        # Fall back to the original method if no valid move from the board
-        return original_get_player_move(board)
-    
-    # Override the original get_player_move method
-    chess_match_manager.get_player_move = enhanced_get_player_move
-    
-    # Enhance play_match to better sync the physical board
-    def enhanced_play_match(opponent_name, opponent_elo, time_control="90/30"):
+    # Enhance play_match to take moves from and sync the physical board
+    def enhanced_play_match(opponent_name, opponent_elo, time_control="90/30", **options):
         """Enhanced play_match that syncs the physical board"""
-        # Initialize the board
-        board = chess.Board()
-        
-        # Set up engine strength
-        if chess_match_manager.engine:
-            chess_match_manager.set_engine_strength(opponent_elo)
-        
-        # Set initial board position on Chessnut if connected
-        if chessnut.connected:
-            print("Synchronizing your Chessnut Pro board...")
-            if chessnut.set_board_to_match_position(board):
-                print("Board synchronized. Make sure pieces are in the starting position.")
-            else:
-                print("Failed to synchronize board. Please set up the starting position manually.")
-        
-        # Parse time control
-        main_time_minutes = 90
-        increment_seconds = 30
-        
-        if time_control:
-            parts = time_control.split('/')
-            if len(parts) >= 1:
-                try:
-                    main_time_minutes = int(parts[0])
-                except:
-                    pass
-            if len(parts) >= 2:
-                try:
-                    increment_seconds = int(parts[1])
-                except:
-                    pass
-        
-        # Convert to seconds
-        player_time = main_time_minutes * 60
-        engine_time = main_time_minutes * 60
-        
-        # Introduction to the match
-        chess_match_manager.display_match_intro(opponent_name, opponent_elo, time_control)
-        
-        # Main game loop
-        while not board.is_game_over():
-            # Display the board
-            chess_match_manager.display_board(board)
-            
-            # Display remaining time if using a clock
-            if time_control:
-                chess_match_manager.display_clock(player_time, engine_time)
-            
-            # Player's turn (white)
-            if board.turn == chess.WHITE:
-                start_time = time.time()
-                
-                move = chess_match_manager.get_player_move(board)
-                
-                # Update player's clock
-                if time_control:
-                    elapsed = time.time() - start_time
-                    player_time -= elapsed
-                    player_time += increment_seconds
-                    
-                    # Check for time forfeit
-                    if player_time <= 0:
-                        print("You've run out of time!")
-                        return "loss"
-                
-                # Make the move
-                board.push(move)
-            
-            # Engine's turn (black)
-            else:
-                print(f"\n{opponent_name} is thinking...")
-                
-                start_time = time.time()
-                
-                if chess_match_manager.engine:
-                    # Limit engine thinking time based on its remaining clock
-                    time_limit = min(30, engine_time / 10) if time_control else 1.0
-                    result = chess_match_manager.engine.play(board, chess.engine.Limit(time=time_limit))
-                    move = result.move
-                else:
-                    # Fallback if no engine: make a random legal move
-                    import random
-                    legal_moves = list(board.legal_moves)
-                    move = random.choice(legal_moves)
-                
-                # Update engine's clock
-                if time_control:
-                    elapsed = time.time() - start_time
-                    engine_time -= elapsed
-                    engine_time += increment_seconds
-                    
-                    # Check for time forfeit
-                    if engine_time <= 0:
-                        print(f"{opponent_name} has run out of time!")
-                        return "win"
-                
-                # Make the move and display it
-                board.push(move)
-                
-                # Display the move and prompt the user to update their physical board
-                move_uci = move.uci()
-                print(f"\n{opponent_name} played: {move_uci}")
-                
-                # If physical board is connected, prompt user to update it
-                if chessnut.connected:
-                    print("Please make this move on your physical Chessnut board.")
-                    input("Press Enter after updating your board...")
-                    
-                    # Try to verify board state is correct
-                    chessnut.set_board_to_match_position(board)
-                else:
-                    time.sleep(1)  # Small pause for readability
-        
-        # Display final position
-        chess_match_manager.display_board(board)
-        
-        # Determine and return the result
-        return chess_match_manager.get_match_result(board)
+        return original_play_match(opponent_name, opponent_elo, time_control, chessnut=chessnut, **options)
     
     # Override the original play_match method
     chess_match_manager.play_match = enhanced_play_match
@@ -1,6 +1,7 @@
 import random
-import os
-import time
+
+from screen import get_screen
+from input_mux import read_input
 
 class GameMechanics:
     """
@@ -18,18 +19,18 @@ class GameMechanics:
     
     def display_roll(self, roll_type, target, result, success_threshold=None):
         """Display the result of a dice roll with animation"""
-        os.system('cls' if os.name == 'nt' else 'clear')
+        get_screen().clear()
         print(f"=== {roll_type.upper()} CHECK ===\n")
         print(f"Rolling for: {target}")
         
         # Animation for rolling dice
         for _ in range(3):
             print("Rolling...", end="\r")
-            time.sleep(0.3)
+            get_screen().pause(0.3)
             print("Rolling.  ", end="\r")
-            time.sleep(0.3)
+            get_screen().pause(0.3)
             print("Rolling.. ", end="\r")
-            time.sleep(0.3)
+            get_screen().pause(0.3)
         
         print(f"\nResult: {result}")
         
@@ -39,7 +40,7 @@ class GameMechanics:
             else:
                 print("FAILURE.")
         
-        input("\nPress Enter to continue...")
+        read_input("\nPress Enter to continue...")
         return result >= success_threshold if success_threshold is not None else result
     
     def exploration_check(self, target, difficulty):
@@ -92,7 +93,7 @@ class GameMechanics:
     
     def handle_random_encounter(self, encounter_type):
         """Process a random encounter based on type"""
-        os.system('cls' if os.name == 'nt' else 'clear')
+        get_screen().clear()
         print("=== UNEXPECTED ENCOUNTER ===\n")
         
         if encounter_type == "traveler":
@@ -116,7 +117,7 @@ class GameMechanics:
             choice = 0
             while choice < 1 or choice > 4:
                 try:
-                    choice = int(input("\nSelect a number: "))
+                    choice = int(read_input("\nSelect a number: "))
                 except:
                     pass
             
@@ -151,7 +152,7 @@ class GameMechanics:
             choice = 0
             while choice < 1 or choice > 4:
                 try:
-                    choice = int(input("\nSelect a number: "))
+                    choice = int(read_input("\nSelect a number: "))
                 except:
                     pass
             
@@ -173,7 +174,7 @@ class GameMechanics:
             choice = 0
             while choice < 1 or choice > 2:
                 try:
-                    choice = int(input("\nSelect a number: "))
+                    choice = int(read_input("\nSelect a number: "))
                 except:
                     pass
             
@@ -204,7 +205,7 @@ class GameMechanics:
             choice = 0
             while choice < 1 or choice > 2:
                 try:
-                    choice = int(input("\nSelect a number: "))
+                    choice = int(read_input("\nSelect a number: "))
                 except:
                     pass
             
@@ -263,7 +264,7 @@ class GameMechanics:
             
             # Potentially add a unique benefit or quest hook here
         
-        input("\nPress Enter to continue...")
+        read_input("\nPress Enter to continue...")
     
     def loot_roll(self, quality="common"):
         """Roll for random loot based on quality level"""
@@ -300,12 +301,12 @@ class GameMechanics:
         Handle critical narrative moments with dice rolls
         that can affect the story
         """
-        os.system('cls' if os.name == 'nt' else 'clear')
+        get_screen().clear()
         print("=== CRITICAL MOMENT ===\n")
         print(description)
         
         print("\nThis is a pivotal moment. Your actions here may have lasting consequences.")
-        input("\nPress Enter to roll the dice of fate...")
+        read_input("\nPress Enter to roll the dice of fate...")
         
         roll = self.roll_dice(1, 20)
         
@@ -323,7 +324,7 @@ class GameMechanics:
             result = "failure"
             print(f"\nRoll: {roll} - Failure.")
         
-        input("\nPress Enter to continue...")
+        read_input("\nPress Enter to continue...")
         return result
 
 # The mechanics class would be instantiated in the main game
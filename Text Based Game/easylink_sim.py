@@ -0,0 +1,297 @@
+"""
+Simulated EasyLink Module for Grand Chess Realms
+A stand-in for the Chessnut Pro's EasyLinkSDK that needs no hardware. It
+offers the same calls the game uses (scan_devices, connect, get_board_state,
+register_event_callback, set_position) and plays moves on a board of its
+own, reporting them from its own thread the way the SDK does: scripted or
+random moves, each as a burst of lift and place snapshots, with adjustable
+latency, jitter, dropped connections and failed connects. Moves the game
+lights up with set_leds are carried out as a player would. Run this module
+directly for a load run that measures the Chessnut pipeline's latency.
+"""
+
+import time
+import random
+import logging
+import threading
+from collections import deque, namedtuple
+
+import chess
+
+from move_inference import move_changes
+
+logger = logging.getLogger("SimulatedEasyLink")
+
+SIMULATED_DEVICE = "Chessnut Pro (simulated)"
+
+# Board event and reported move, shaped like the SDK's BoardEvent and ChessMove
+SimulatedEvent = namedtuple("SimulatedEvent", ["event_type", "move", "board_state"])
+SimulatedMove = namedtuple("SimulatedMove", ["from_square", "to_square", "piece"])
+
+
+class SimulatedEasyLink:
+    """
+    Simulated Chessnut Pro board behind the EasyLink interface.
+    """
+
+    def __init__(self, moves=None, side=None, seed=None, move_interval=1.0, latency=0.02, jitter=0.01,
+                 snapshots=True, disconnect_rate=0.0, disconnect_after=None, fail_connects=0,
+                 max_moves=None, devices=(SIMULATED_DEVICE,)):
+        """
+        Initialize the simulated board.
+
+        Args:
+            moves: Moves to play in order (UCI or SAN); None plays random legal moves
+            side: chess.WHITE or chess.BLACK to only move for that side (the
+                other side's moves come from the game); None moves for both
+            seed: Random seed for moves, jitter and disconnects
+            move_interval: Seconds between moves
+            latency: Seconds between the events of one move
+            jitter: Largest random change to each latency and interval, in seconds
+            snapshots: Report board snapshots; False reports only from/to pairs,
+                like boards whose SDK can't send snapshots
+            disconnect_rate: Chance of losing the connection after each move
+            disconnect_after: Lose the connection after this many moves
+            fail_connects: Number of connect() calls that fail before one succeeds
+            max_moves: Stop after this many moves
+            devices: Device names scan_devices() reports
+        """
+        self.script = deque(moves or [])
+        self.scripted = moves is not None
+        self.side = side
+        self.random = random.Random(seed)
+        self.move_interval = move_interval
+        self.latency = latency
+        self.jitter = jitter
+        self.snapshots = snapshots
+        self.disconnect_rate = disconnect_rate
+        self.disconnect_after = disconnect_after
+        self.fail_connects = fail_connects
+        self.max_moves = max_moves
+        self.devices = list(devices)
+
+        self.board = chess.Board()
+        self.connected = False
+        self.callback = None
+        self.leds = []
+
+        self._hints = deque()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._stopped = True
+
+        self.moves_played = 0
+        self.events_sent = 0
+        self.disconnects = 0
+
+    # -- EasyLink interface -------------------------------------------------
+
+    def scan_devices(self):
+        return list(self.devices)
+
+    def connect(self, device_name=None):
+        """Connect, unless a failure was asked for; starts playing moves"""
+        if self.fail_connects > 0:
+            self.fail_connects -= 1
+            return False
+        if device_name is not None and device_name not in self.devices:
+            return False
+        with self._cond:
+            self.connected = True
+            if self._stopped:
+                self._stopped = False
+                self._thread = threading.Thread(target=self._run, name="SimulatedEasyLink", daemon=True)
+                self._thread.start()
+        return True
+
+    def disconnect(self):
+        with self._cond:
+            self.connected = False
+            self._stopped = True
+            self._cond.notify_all()
+
+    def get_board_state(self):
+        if not self.connected:
+            raise ConnectionError("Simulated board is disconnected")
+        with self._cond:
+            return self.board.board_fen()
+
+    def register_event_callback(self, callback):
+        self.callback = callback
+
+    def set_position(self, fen):
+        """The game's position; the simulated player sets up the pieces at once"""
+        if not self.connected:
+            raise ConnectionError("Simulated board is disconnected")
+        with self._cond:
+            self.board = chess.Board(fen)
+            self._hints.clear()
+            self._cond.notify_all()
+
+    def set_leds(self, squares):
+        """Light squares; a lit move is carried out by the simulated player"""
+        if not self.connected:
+            raise ConnectionError("Simulated board is disconnected")
+        with self._cond:
+            self.leds = list(squares)
+            if squares:
+                lit = sorted(squares)
+                for move in self.board.legal_moves:
+                    if sorted(chess.square_name(s) for s in move_changes(self.board, move)) == lit:
+                        self._hints.append(move)
+                        self._cond.notify_all()
+                        break
+
+    # -- Simulation ---------------------------------------------------------
+
+    def _delay(self, seconds):
+        return max(0.0, seconds + self.random.uniform(-self.jitter, self.jitter))
+
+    def _may_move(self):
+        """Whether the simulated player has a move of its own to make (lock held)"""
+        if self.max_moves is not None and self.moves_played >= self.max_moves:
+            return False
+        if self.side is not None and self.board.turn != self.side:
+            return False
+        if self.scripted and not self.script:
+            return False
+        return not self.board.is_game_over()
+
+    def _choose_move(self):
+        """Next scripted or random move (lock held)"""
+        if not self.scripted:
+            return self.random.choice(list(self.board.legal_moves))
+        text = self.script.popleft()
+        try:
+            return self.board.parse_uci(text)
+        except ValueError:
+            try:
+                return self.board.parse_san(text)
+            except ValueError:
+                logger.warning(f"Scripted move {text} is not legal here; script stopped")
+                self.script.clear()
+                return None
+
+    def _run(self):
+        next_move = time.monotonic() + self._delay(self.move_interval)
+        while True:
+            with self._cond:
+                if self._stopped:
+                    return
+                move = None
+                if self._hints:
+                    move = self._hints.popleft()
+                elif self._may_move():
+                    wait = next_move - time.monotonic()
+                    if wait <= 0:
+                        move = self._choose_move()
+                    else:
+                        self._cond.wait(wait)
+                        continue
+                else:
+                    self._cond.wait()
+                    continue
+            if move is not None:
+                self.play(move)
+            next_move = time.monotonic() + self._delay(self.move_interval)
+
+    def play(self, move):
+        """
+        Make a move on the simulated board, reporting it like the real board.
+
+        Args:
+            move: Legal chess.Move in the simulated board's position
+        """
+        with self._cond:
+            before = self.board.copy(stack=False)
+            changes = move_changes(before, move)
+
+        if self.snapshots:
+            # Lift and place the pieces one at a time: emptied squares first
+            state = before.copy(stack=False)
+            steps = sorted(changes.items(), key=lambda change: change[1] is not None)
+            for square, symbol in steps[:-1]:
+                state.set_piece_at(square, chess.Piece.from_symbol(symbol) if symbol else None)
+                self._emit(SimulatedEvent("board_changed", None, state.board_fen()))
+                time.sleep(self._delay(self.latency))
+
+        with self._cond:
+            if self.board.board_fen() != before.board_fen():
+                # The game set up another position meanwhile
+                return
+            piece = self.board.piece_at(move.from_square)
+            self.board.push(move)
+            self.moves_played += 1
+            final_state = self.board.board_fen() if self.snapshots else None
+        reported = SimulatedMove(chess.square_name(move.from_square), chess.square_name(move.to_square),
+                                 chess.piece_name(piece.piece_type))
+        self._emit(SimulatedEvent("move", reported, final_state))
+
+        if ((self.disconnect_after is not None and self.moves_played >= self.disconnect_after) or
+                self.random.random() < self.disconnect_rate):
+            self.drop_connection()
+
+    def drop_connection(self):
+        """Lose the connection, as an unplugged or out-of-range board would"""
+        with self._cond:
+            self.connected = False
+            self._stopped = True
+            self.disconnects += 1
+            self.disconnect_after = None
+            self._cond.notify_all()
+        self._emit(SimulatedEvent("connection_lost", None, None))
+
+    def _emit(self, event):
+        self.events_sent += 1
+        if self.callback:
+            self.callback(event)
+
+
+def load_run(moves=2000, settle_window=0.0):
+    """
+    Feed random moves through the Chessnut pipeline as fast as it takes them.
+
+    Args:
+        moves: Number of moves to play
+        settle_window: Settle window of the interface's coalescer
+
+    Returns:
+        Dictionary with the events per second and the average and maximum
+        seconds from a move's last event to the game receiving it
+    """
+    from chessnut_integration import ChessnutInterface
+
+    sim = SimulatedEasyLink(seed=1, move_interval=0, latency=0, jitter=0, max_moves=0)
+    chessnut = ChessnutInterface(settle_window=settle_window, easylink_factory=lambda: sim)
+    chessnut.connect()
+    while not chessnut.connected:
+        time.sleep(0.01)
+    chessnut.set_board_to_match_position(sim.board)
+
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(moves):
+        if sim.board.is_game_over():
+            sim.set_position(chess.STARTING_FEN)
+            chessnut.set_board_to_match_position(sim.board)
+        sim.play(sim.random.choice(list(sim.board.legal_moves)))
+        sent = time.perf_counter()
+        chessnut.move_queue.get(timeout=5)
+        latencies.append(time.perf_counter() - sent)
+    elapsed = time.perf_counter() - start
+    chessnut.disconnect()
+
+    return {
+        "moves": moves,
+        "events": sim.events_sent,
+        "events_per_second": sim.events_sent / elapsed,
+        "avg_latency": sum(latencies) / len(latencies),
+        "max_latency": max(latencies),
+        "events_dropped": chessnut.events_dropped,
+    }
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    for key, value in load_run().items():
+        print(f"{key}: {value:.4f}" if isinstance(value, float) else f"{key}: {value}")
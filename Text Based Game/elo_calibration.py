@@ -0,0 +1,306 @@
+"""
+Elo Calibration for Grand Chess Realms
+Measures how strong each Stockfish skill level really plays with the search
+budgets the game gives it. Skill levels play batches of games against each
+other and against UCI_Elo anchors in parallel worker processes, ratings are
+fitted by maximum likelihood, and the result is written to the skill table
+that the game loads.
+
+Usage:
+    python elo_calibration.py [--games 20] [--move-time 0.1] [--workers N]
+"""
+
+import os
+import sys
+import math
+import json
+import time
+import random
+import argparse
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import chess
+import chess.engine
+
+from engine_registry import get_engine_registry
+from engine_strength import SKILL_TABLE_PATH, search_limit
+
+# Skill levels that are calibrated
+SKILL_LEVELS = list(range(21))
+
+# Stockfish's own UCI_Elo levels that pin the fitted ratings to a known scale
+DEFAULT_ANCHORS = [1500, 2000]
+
+# Each player meets the players this many places above it in the strength order
+PAIRING_DISTANCE = 3
+
+# Random opening plies that keep repeated games of a pairing apart
+RANDOM_OPENING_PLIES = 4
+
+# Games longer than this are scored as draws
+MAX_GAME_PLIES = 300
+
+# Virtual draws added to every pairing, so that players who win (or lose)
+# all their games still get a finite rating
+PRIOR_DRAWS = 1.0
+
+# Games handed to a worker process at a time
+BATCH_SIZE = 8
+
+
+def skill_player(skill):
+    """A player that plays at a Stockfish skill level with the game's search budget"""
+    return {"name": f"skill {skill}", "skill": skill,
+            "options": {"UCI_LimitStrength": False, "Skill Level": skill}}
+
+
+def anchor_player(elo):
+    """A player with a fixed rating, played by Stockfish's UCI_Elo strength limit"""
+    return {"name": f"anchor {elo}", "anchor": elo,
+            "options": {"UCI_LimitStrength": True, "UCI_Elo": elo, "Skill Level": 20}}
+
+
+def schedule_games(players, games_per_pairing):
+    """
+    Pair each player with its nearest stronger neighbours, alternating colors.
+
+    Args:
+        players: Players in (roughly) increasing order of strength
+        games_per_pairing: Games played by each pairing
+
+    Returns:
+        List of (white index, black index) tuples
+    """
+    games = []
+    for i in range(len(players)):
+        for j in range(i + 1, min(len(players), i + 1 + PAIRING_DISTANCE)):
+            for game in range(games_per_pairing):
+                games.append((i, j) if game % 2 == 0 else (j, i))
+    return games
+
+
+def _limit_for(player, move_time):
+    """Search limit a player uses for every move"""
+    if "skill" in player:
+        return search_limit(player["skill"], move_time=move_time)
+    return chess.engine.Limit(time=move_time)
+
+
+def play_games(engine_path, games, move_time):
+    """
+    Play a batch of engine-vs-engine games in a worker process, with one
+    engine per side that is shut down again when the batch is done.
+
+    Args:
+        engine_path: Path to the Stockfish executable
+        games: List of (White player, Black player, seed)
+        move_time: Seconds per move for players without a capped budget
+
+    Returns:
+        List of scores for White: 1, 0.5 or 0
+    """
+    with chess.engine.SimpleEngine.popen_uci(engine_path) as white_engine, \
+            chess.engine.SimpleEngine.popen_uci(engine_path) as black_engine:
+        return [play_game((white_engine, black_engine), white, black, move_time, seed)
+                for white, black, seed in games]
+
+
+def play_game(engines, white, black, move_time, seed):
+    """
+    Play one engine-vs-engine game.
+
+    Args:
+        engines: Tuple of (White engine, Black engine)
+        white: Player with White
+        black: Player with Black
+        move_time: Seconds per move for players without a capped budget
+        seed: Seed for the random opening
+
+    Returns:
+        Score for White: 1, 0.5 or 0
+    """
+    rng = random.Random(seed)
+    board = chess.Board()
+    for _ in range(RANDOM_OPENING_PLIES):
+        board.push(rng.choice(list(board.legal_moves)))
+
+    sides = {chess.WHITE: (engines[0], white), chess.BLACK: (engines[1], black)}
+    for engine, player in sides.values():
+        engine.configure(player["options"])
+
+    while not board.is_game_over(claim_draw=True) and board.ply() < MAX_GAME_PLIES:
+        engine, player = sides[board.turn]
+        result = engine.play(board, _limit_for(player, move_time))
+        if result.move is None:
+            break
+        board.push(result.move)
+
+    outcome = board.outcome(claim_draw=True)
+    if outcome is None or outcome.winner is None:
+        return 0.5
+    return 1.0 if outcome.winner == chess.WHITE else 0.0
+
+
+def fit_ratings(players, results, iterations=1000, tolerance=1e-9):
+    """
+    Fit Elo ratings to game results by maximum likelihood.
+
+    Draws count as half a win for each side (as in Ordo). The Bradley-Terry
+    model is fitted with minorization-maximization and the ratings are then
+    shifted so that the anchors are as close to their fixed ratings as possible.
+
+    Args:
+        players: The players
+        results: List of (white index, black index, score for White)
+        iterations: Maximum number of iterations
+        tolerance: Stop once no strength changes by more than this factor
+
+    Returns:
+        List of ratings, one per player
+    """
+    n = len(players)
+    score = [0.0] * n
+    games = defaultdict(float)
+
+    for white, black, result in results:
+        score[white] += result
+        score[black] += 1.0 - result
+        games[(white, black)] += 1
+        games[(black, white)] += 1
+
+    for i, j in list(games):
+        if i < j:
+            score[i] += PRIOR_DRAWS / 2
+            score[j] += PRIOR_DRAWS / 2
+            games[(i, j)] += PRIOR_DRAWS
+            games[(j, i)] += PRIOR_DRAWS
+
+    opponents = defaultdict(list)
+    for (i, j), count in games.items():
+        opponents[i].append((j, count))
+
+    strength = [1.0] * n
+    for _ in range(iterations):
+        change = 0.0
+        for i in range(n):
+            denominator = sum(count / (strength[i] + strength[j]) for j, count in opponents[i])
+            if denominator > 0:
+                updated = score[i] / denominator
+                change = max(change, abs(math.log(updated / strength[i])))
+                strength[i] = updated
+        # Only differences matter; keep the numbers in range
+        mean = math.exp(sum(math.log(s) for s in strength) / n)
+        strength = [s / mean for s in strength]
+        if change < tolerance:
+            break
+
+    ratings = [400 * math.log10(s) for s in strength]
+    anchors = [(i, player["anchor"]) for i, player in enumerate(players) if "anchor" in player]
+    if anchors:
+        offset = sum(elo - ratings[i] for i, elo in anchors) / len(anchors)
+        ratings = [rating + offset for rating in ratings]
+    return ratings
+
+
+def build_skill_table(players, ratings):
+    """
+    Turn fitted ratings into the skill table, keeping it monotonic so that a
+    higher target Elo never picks a weaker skill level.
+
+    Returns:
+        List of {"skill": ..., "elo": ...} entries sorted by skill level
+    """
+    table = []
+    best = -math.inf
+    for player, rating in sorted(zip(players, ratings), key=lambda pair: pair[0].get("skill", -1)):
+        if "skill" not in player:
+            continue
+        best = max(best, rating)
+        table.append({"skill": player["skill"], "elo": round(best)})
+    return table
+
+
+def calibrate(engine_path, games_per_pairing=20, move_time=0.1, workers=None, anchors=None):
+    """
+    Play the calibration games and fit the ratings.
+
+    Args:
+        engine_path: Path to the Stockfish executable
+        games_per_pairing: Games played by each pairing of players
+        move_time: Seconds per move for players without a capped budget
+        workers: Number of worker processes. Defaults to the CPU count.
+        anchors: UCI_Elo ratings that anchor the scale
+
+    Returns:
+        Tuple of (players, ratings, number of games played)
+    """
+    anchors = DEFAULT_ANCHORS if anchors is None else anchors
+    players = [skill_player(skill) for skill in SKILL_LEVELS]
+
+    # Put each anchor between the skill levels it is expected to play like,
+    # so that it gets paired with them
+    for elo in anchors:
+        position = next((i for i, player in enumerate(players)
+                         if "skill" in player and player["skill"] >= (elo - 1000) / 50), len(players))
+        players.insert(position, anchor_player(elo))
+
+    schedule = schedule_games(players, games_per_pairing)
+    results = []
+    started = time.monotonic()
+
+    batches = [list(enumerate(schedule))[start:start + BATCH_SIZE] for start in range(0, len(schedule), BATCH_SIZE)]
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        futures = {
+            executor.submit(play_games, engine_path,
+                            [(players[white], players[black], seed) for seed, (white, black) in batch],
+                            move_time): batch
+            for batch in batches
+        }
+        for future in as_completed(futures):
+            for (_, (white, black)), score in zip(futures[future], future.result()):
+                results.append((white, black, score))
+            elapsed = time.monotonic() - started
+            print(f"\r{len(results)}/{len(schedule)} games played ({elapsed:.0f}s)", end="", flush=True)
+    print()
+
+    return players, fit_ratings(players, results), len(results)
+
+
+def main():
+    """Run the calibration from the command line"""
+    parser = argparse.ArgumentParser(description="Calibrate Stockfish skill levels to Elo ratings.")
+    parser.add_argument("--games", type=int, default=20, help="games per pairing of players")
+    parser.add_argument("--move-time", type=float, default=0.1, help="seconds per move for uncapped players")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--anchor", type=int, action="append", dest="anchors",
+                        help="UCI_Elo rating used as an anchor (repeatable)")
+    parser.add_argument("--output", default=SKILL_TABLE_PATH, help="skill table to write")
+    args = parser.parse_args()
+
+    engine_path = get_engine_registry().find_engine_path()
+    if not engine_path:
+        print("Stockfish is needed for calibration. See setup-instructions.txt.")
+        return 1
+
+    players, ratings, game_count = calibrate(engine_path, args.games, args.move_time, args.workers, args.anchors)
+
+    print("\nFitted ratings:")
+    for player, rating in sorted(zip(players, ratings), key=lambda pair: pair[1]):
+        print(f"  {player['name']:<12} {rating:7.0f}")
+
+    table = {
+        "generated": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "engine": engine_path,
+        "games": game_count,
+        "move_time": args.move_time,
+        "skill_levels": build_skill_table(players, ratings),
+    }
+    with open(args.output, "w") as f:
+        json.dump(table, f, indent=2)
+    print(f"\nSkill table written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
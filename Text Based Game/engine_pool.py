@@ -0,0 +1,385 @@
+"""
+Engine Pool Module for Grand Chess Realms
+A bounded pool of UCI engine workers. Callers lease a worker configured with
+the options they need (Skill Level, UCI_Elo, ...) and return it warm when they
+are done, so matches, hints and analysis can run side by side.
+"""
+
+import os
+import time
+import threading
+import logging
+from collections import deque
+from contextlib import contextmanager
+from typing import Optional, Dict, Any
+
+import chess.engine
+
+logger = logging.getLogger("EnginePool")
+
+
+def default_pool_size() -> int:
+    """Number of engine workers to allow, based on the CPU count"""
+    return max(1, os.cpu_count() or 1)
+
+
+class EngineWorker:
+    """A single engine process together with the options it is configured with"""
+
+    def __init__(self, worker_id: int, engine: chess.engine.SimpleEngine):
+        self.worker_id = worker_id
+        self.engine = engine
+        self.options = {}
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.busy_since = None
+        self.busy_seconds = 0.0
+        self.leases = 0
+
+    def configure(self, options: Dict[str, Any]):
+        """Send only the options that differ from the worker's current configuration"""
+        changed = {name: value for name, value in options.items() if self.options.get(name) != value}
+        if changed:
+            self.engine.configure(changed)
+            self.options.update(changed)
+
+    def mismatch(self, options: Dict[str, Any]) -> int:
+        """Count how many options would have to be changed to satisfy a request"""
+        return sum(1 for name, value in options.items() if self.options.get(name) != value)
+
+    def is_alive(self) -> bool:
+        """Check whether the engine process is still running"""
+        return not self.engine.returncode.done()
+
+    def quit(self):
+        """Shut down the engine process"""
+        try:
+            self.engine.quit()
+        except Exception as e:
+            logger.debug(f"Error quitting engine worker {self.worker_id}: {e}")
+            self.engine.close()
+
+
+class EnginePool:
+    """
+    Bounded pool of UCI engine workers.
+
+    Workers are spawned lazily up to max_workers. Requests beyond that wait in
+    FIFO order, optionally with a deadline. Idle workers are kept warm and
+    reused, and shut down once they have been idle for idle_timeout seconds.
+    """
+
+    def __init__(self, engine_path: str, max_workers: Optional[int] = None,
+                 idle_timeout: float = 300, base_options: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the pool without starting any engines.
+
+        Args:
+            engine_path: Path to the UCI engine executable
+            max_workers: Maximum number of engine processes. Defaults to the CPU count.
+            idle_timeout: Seconds an idle worker is kept before it is shut down
+            base_options: UCI options applied to every worker when it is spawned
+        """
+        self.engine_path = engine_path
+        self.max_workers = max_workers or default_pool_size()
+        self.idle_timeout = idle_timeout
+        self.base_options = base_options or {}
+
+        self._cond = threading.Condition()
+        self._idle = []
+        self._busy = set()
+        self._spawning = 0
+        self._queue = deque()
+        self._next_worker_id = 1
+        self._idle_timer = None
+        self._closed = False
+
+        # Statistics
+        self._created_at = time.monotonic()
+        self._spawned = 0
+        self._retired = 0
+        self._leases = 0
+        self._timeouts = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._retired_busy_seconds = 0.0
+        self._retired_worker_seconds = 0.0
+
+    @contextmanager
+    def lease(self, options: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None):
+        """
+        Lease an engine for the duration of a with-block.
+
+        Args:
+            options: UCI options the engine must be configured with
+            timeout: Maximum seconds to wait for a free worker, or None to wait indefinitely
+
+        Yields:
+            A configured chess.engine.SimpleEngine
+
+        Raises:
+            TimeoutError: If no worker became free before the deadline
+        """
+        worker = self.acquire(options, timeout)
+        failed = False
+        try:
+            yield worker.engine
+        except (chess.engine.EngineError, chess.engine.EngineTerminatedError):
+            failed = True
+            raise
+        finally:
+            self.release(worker, discard=failed)
+
+    def acquire(self, options: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None) -> EngineWorker:
+        """
+        Take a worker out of the pool. Prefer lease(), which always returns it.
+
+        Args:
+            options: UCI options the engine must be configured with
+            timeout: Maximum seconds to wait for a free worker, or None to wait indefinitely
+
+        Returns:
+            The leased EngineWorker
+
+        Raises:
+            TimeoutError: If no worker became free before the deadline
+        """
+        options = options or {}
+        requested_at = time.monotonic()
+        deadline = None if timeout is None else requested_at + timeout
+        ticket = object()
+
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Engine pool has been shut down")
+
+            self._queue.append(ticket)
+            try:
+                while True:
+                    if self._queue[0] is ticket:
+                        worker = self._take_idle(options)
+                        if worker:
+                            break
+                        if self._capacity_left() > 0:
+                            self._spawning += 1
+                            self._queue.popleft()
+                            self._cond.notify_all()
+                            worker = None
+                            break
+
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        self._timeouts += 1
+                        raise TimeoutError(f"No engine worker became free within {timeout}s")
+                    self._cond.wait(remaining)
+            finally:
+                if ticket in self._queue:
+                    self._queue.remove(ticket)
+                    self._cond.notify_all()
+
+        if worker is None:
+            worker = self._spawn_worker()
+
+        try:
+            worker.configure(options)
+        except Exception:
+            self.release(worker, discard=True)
+            raise
+
+        waited = time.monotonic() - requested_at
+        with self._cond:
+            self._leases += 1
+            self._total_wait += waited
+            self._max_wait = max(self._max_wait, waited)
+            worker.leases += 1
+            worker.busy_since = time.monotonic()
+        return worker
+
+    def release(self, worker: EngineWorker, discard: bool = False):
+        """
+        Return a worker to the pool.
+
+        Args:
+            worker: The worker returned by acquire()
+            discard: Shut the worker down instead of keeping it warm
+        """
+        now = time.monotonic()
+        with self._cond:
+            self._busy.discard(worker)
+            if worker.busy_since is not None:
+                worker.busy_seconds += now - worker.busy_since
+                worker.busy_since = None
+            worker.last_used = now
+
+            if discard or self._closed or not worker.is_alive():
+                self._retire(worker)
+                retire = True
+            else:
+                self._idle.append(worker)
+                self._schedule_idle_check(self.idle_timeout)
+                retire = False
+            self._cond.notify_all()
+
+        if retire:
+            worker.quit()
+
+    def prewarm(self, count: int = 1):
+        """
+        Spawn workers in the background until at least count are running.
+
+        Args:
+            count: Number of workers that should be ready
+        """
+        with self._cond:
+            missing = min(count, self.max_workers) - self._worker_count()
+            for _ in range(max(0, missing)):
+                self._spawning += 1
+                thread = threading.Thread(target=self._prewarm_worker, name="EnginePool prewarm")
+                thread.daemon = True
+                thread.start()
+
+    def worker_count(self) -> int:
+        """Number of running (or starting) workers"""
+        with self._cond:
+            return self._worker_count()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get pool statistics.
+
+        Returns:
+            Dictionary with worker counts, queue depth, wait times and busy ratio
+        """
+        now = time.monotonic()
+        with self._cond:
+            live = self._idle + list(self._busy)
+            busy_seconds = self._retired_busy_seconds + sum(
+                w.busy_seconds + (now - w.busy_since if w.busy_since is not None else 0) for w in live)
+            worker_seconds = self._retired_worker_seconds + sum(now - w.created_at for w in live)
+
+            return {
+                "max_workers": self.max_workers,
+                "workers": len(live),
+                "busy": len(self._busy),
+                "idle": len(self._idle),
+                "queue_depth": len(self._queue),
+                "spawned": self._spawned,
+                "retired": self._retired,
+                "leases": self._leases,
+                "timeouts": self._timeouts,
+                "avg_wait": self._total_wait / self._leases if self._leases else 0.0,
+                "max_wait": self._max_wait,
+                "busy_ratio": busy_seconds / worker_seconds if worker_seconds > 0 else 0.0,
+            }
+
+    def shutdown(self):
+        """Shut down all idle workers. Busy workers are shut down when they are released."""
+        with self._cond:
+            self._cancel_idle_timer()
+            idle, self._idle = self._idle, []
+            for worker in idle:
+                self._retire(worker)
+            self._cond.notify_all()
+
+        for worker in idle:
+            worker.quit()
+
+    def close(self):
+        """Shut down the pool for good; further acquire() calls fail"""
+        with self._cond:
+            self._closed = True
+        self.shutdown()
+
+    def _worker_count(self) -> int:
+        """Running plus starting workers (caller must hold the lock)"""
+        return len(self._idle) + len(self._busy) + self._spawning
+
+    def _capacity_left(self) -> int:
+        """How many more workers may be spawned (caller must hold the lock)"""
+        return self.max_workers - self._worker_count()
+
+    def _take_idle(self, options: Dict[str, Any]) -> Optional[EngineWorker]:
+        """Take the idle worker needing the fewest option changes (caller must hold the lock)"""
+        alive = [w for w in self._idle if w.is_alive()]
+        for worker in self._idle:
+            if worker not in alive:
+                self._retire(worker)
+        self._idle = alive
+
+        if not self._idle:
+            return None
+
+        # Reconfiguring a warm worker is far cheaper than spawning a new one
+        worker = min(self._idle, key=lambda w: w.mismatch(options))
+        self._idle.remove(worker)
+        self._busy.add(worker)
+        self._queue.popleft()
+        self._cond.notify_all()
+        return worker
+
+    def _spawn_worker(self) -> EngineWorker:
+        """Start a new engine process for a slot reserved by the caller"""
+        try:
+            engine = chess.engine.SimpleEngine.popen_uci(self.engine_path)
+            if self.base_options:
+                engine.configure(self.base_options)
+        except Exception:
+            with self._cond:
+                self._spawning -= 1
+                self._cond.notify_all()
+            raise
+
+        with self._cond:
+            self._spawning -= 1
+            worker = EngineWorker(self._next_worker_id, engine)
+            self._next_worker_id += 1
+            self._spawned += 1
+            self._busy.add(worker)
+        logger.info(f"Started engine worker {worker.worker_id} ({self.engine_path})")
+        return worker
+
+    def _prewarm_worker(self):
+        """Background thread target that spawns a worker and parks it as idle"""
+        try:
+            worker = self._spawn_worker()
+        except Exception as e:
+            logger.error(f"Error starting engine worker: {e}")
+            return
+        self.release(worker)
+
+    def _retire(self, worker: EngineWorker):
+        """Fold a worker's statistics into the pool totals (caller must hold the lock)"""
+        self._retired += 1
+        self._retired_busy_seconds += worker.busy_seconds
+        self._retired_worker_seconds += time.monotonic() - worker.created_at
+
+    def _schedule_idle_check(self, delay):
+        """Arm the idle timer (caller must hold the lock)"""
+        self._cancel_idle_timer()
+        self._idle_timer = threading.Timer(delay, self._idle_check)
+        self._idle_timer.daemon = True
+        self._idle_timer.start()
+
+    def _cancel_idle_timer(self):
+        """Disarm the idle timer (caller must hold the lock)"""
+        if self._idle_timer:
+            self._idle_timer.cancel()
+            self._idle_timer = None
+
+    def _idle_check(self):
+        """Timer callback that shuts down workers that have been idle too long"""
+        now = time.monotonic()
+        with self._cond:
+            expired = [w for w in self._idle if now - w.last_used >= self.idle_timeout]
+            self._idle = [w for w in self._idle if w not in expired]
+            for worker in expired:
+                self._retire(worker)
+            if self._idle:
+                oldest = min(w.last_used for w in self._idle)
+                self._schedule_idle_check(max(0.1, self.idle_timeout - (now - oldest)))
+            else:
+                self._idle_timer = None
+
+        for worker in expired:
+            logger.info(f"Engine worker {worker.worker_id} idle, shutting down")
+            worker.quit()
@@ -0,0 +1,206 @@
+"""
+Engine Registry Module for Grand Chess Realms
+Owns the Stockfish engines shared by every part of the game. Engines are only
+started when a chess match is likely, and they are shut down again after they
+have been idle for a while.
+"""
+
+import shutil
+import atexit
+import threading
+import logging
+from contextlib import contextmanager
+from typing import Optional, Dict, Any
+
+import chess.engine
+
+from engine_pool import EnginePool
+
+logger = logging.getLogger("EngineRegistry")
+
+# Common paths to look for Stockfish
+STOCKFISH_PATHS = [
+    "stockfish",  # If in PATH
+    "./stockfish",
+    "./engines/stockfish",
+    "/usr/games/stockfish",
+    "/usr/local/bin/stockfish",
+    "C:/Program Files/Stockfish/stockfish.exe",
+    "C:/Program Files (x86)/Stockfish/stockfish.exe"
+]
+
+# Seconds without any use before an engine process is shut down
+DEFAULT_IDLE_TIMEOUT = 300
+
+
+class EngineRegistry:
+    """
+    Process-wide owner of the Stockfish engines.
+
+    Components ask the registry for an engine instead of spawning their own.
+    Engines come from one shared EnginePool, so the game never runs more
+    processes than it needs and none at all in sessions where no match is played.
+    """
+
+    def __init__(self, stockfish_path: Optional[str] = None, idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+                 max_workers: Optional[int] = None):
+        """
+        Initialize the registry without starting any engine.
+
+        Args:
+            stockfish_path: Path to the Stockfish executable. If None, common locations are searched.
+            idle_timeout: Seconds of inactivity after which an engine is shut down
+            max_workers: Maximum number of engine processes. Defaults to the CPU count.
+        """
+        self.stockfish_path = stockfish_path
+        self.idle_timeout = idle_timeout
+        self.max_workers = max_workers
+
+        self._lock = threading.RLock()
+        self._pool = None
+        self._path_resolved = False
+        self._start_failed = False
+
+    def find_engine_path(self) -> Optional[str]:
+        """
+        Locate the Stockfish executable without starting it.
+
+        Returns:
+            The path to the executable, or None if it could not be found
+        """
+        with self._lock:
+            if self._path_resolved:
+                return self.stockfish_path
+
+            candidates = [self.stockfish_path] if self.stockfish_path else STOCKFISH_PATHS
+            self.stockfish_path = None
+            for path in candidates:
+                resolved = shutil.which(path)
+                if resolved:
+                    self.stockfish_path = resolved
+                    break
+
+            self._path_resolved = True
+            if not self.stockfish_path:
+                logger.warning("Could not find Stockfish. Using simplified chess mode.")
+            return self.stockfish_path
+
+    def set_engine_path(self, stockfish_path: str):
+        """
+        Use a different Stockfish executable from now on.
+
+        Args:
+            stockfish_path: Path to the Stockfish executable
+        """
+        with self._lock:
+            pool, self._pool = self._pool, None
+            self.stockfish_path = stockfish_path
+            self._path_resolved = False
+            self._start_failed = False
+        if pool is not None:
+            pool.close()
+
+    def is_available(self) -> bool:
+        """Check whether an engine can be provided, without starting it"""
+        return not self._start_failed and self.find_engine_path() is not None
+
+    def is_running(self) -> bool:
+        """Check whether any engine process is currently running"""
+        return self._pool is not None and self._pool.worker_count() > 0
+
+    @property
+    def pool(self) -> Optional[EnginePool]:
+        """The shared engine pool, created on first use (None if no engine is available)"""
+        with self._lock:
+            if self._pool is None and self.is_available():
+                self._pool = EnginePool(self.stockfish_path, max_workers=self.max_workers,
+                                        idle_timeout=self.idle_timeout)
+            return self._pool
+
+    @contextmanager
+    def lease(self, options: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None):
+        """
+        Lease an engine from the shared pool for the duration of a with-block.
+
+        Args:
+            options: UCI options the engine must be configured with, e.g. {"Skill Level": 5}
+            timeout: Maximum seconds to wait for a free engine, or None to wait indefinitely
+
+        Yields:
+            A configured chess.engine.SimpleEngine
+
+        Raises:
+            RuntimeError: If no engine is available
+            TimeoutError: If no engine became free before the deadline
+        """
+        pool = self.pool
+        if pool is None:
+            raise RuntimeError("No chess engine available")
+
+        try:
+            worker = pool.acquire(options, timeout)
+        except TimeoutError:
+            # The pool is busy, not broken; TimeoutError is also an OSError
+            raise
+        except (OSError, chess.engine.EngineError, chess.engine.EngineTerminatedError) as e:
+            logger.error(f"Error initializing chess engine: {e}")
+            self._start_failed = True
+            raise RuntimeError(f"Could not start chess engine: {e}") from e
+
+        failed = False
+        try:
+            yield worker.engine
+        except (chess.engine.EngineError, chess.engine.EngineTerminatedError):
+            failed = True
+            raise
+        finally:
+            pool.release(worker, discard=failed)
+
+    def prewarm(self):
+        """
+        Start an engine in the background so it is ready by the time it is needed.
+        Does nothing if an engine is already running or starting.
+        """
+        pool = self.pool
+        if pool is not None:
+            pool.prewarm(1)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get engine pool statistics (empty if no pool has been created)"""
+        return self._pool.stats() if self._pool is not None else {}
+
+    def shutdown(self):
+        """Quit all idle engine processes"""
+        with self._lock:
+            pool = self._pool
+        if pool is not None:
+            pool.shutdown()
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_engine_registry(stockfish_path: Optional[str] = None) -> EngineRegistry:
+    """
+    Get the process-wide engine registry, creating it on first use.
+
+    Args:
+        stockfish_path: Optional path to the Stockfish executable. Only used if
+            the registry has not located an engine yet.
+
+    Returns:
+        The shared EngineRegistry
+    """
+    global _registry
+
+    with _registry_lock:
+        if _registry is None:
+            _registry = EngineRegistry(stockfish_path)
+            atexit.register(_registry.shutdown)
+        elif stockfish_path:
+            # Only switch to a path that resolves, and only if it's a different engine
+            resolved = shutil.which(stockfish_path)
+            if resolved is not None and resolved != _registry.find_engine_path():
+                _registry.set_engine_path(stockfish_path)
+        return _registry
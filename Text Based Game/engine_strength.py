@@ -0,0 +1,166 @@
+"""
+Engine Strength Module for Grand Chess Realms
+Maps Stockfish skill levels to search budgets. A weak opponent plays weak moves
+whether it searches for a second or a millisecond, so low skill levels get
+small node/depth budgets and only strong opponents search deeply.
+"""
+
+import os
+import json
+import logging
+import threading
+
+import chess
+import chess.engine
+
+logger = logging.getLogger("EngineStrength")
+
+# Skill table written by elo_calibration.py
+SKILL_TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "skill_table.json")
+
+# Hand-written (skill level, Elo) table used until a calibrated one is generated.
+# An opponent plays at the highest skill level whose Elo doesn't exceed theirs.
+DEFAULT_SKILL_TABLE = [
+    (0, 0), (1, 800), (2, 900), (3, 1000), (4, 1100), (5, 1200), (6, 1300),
+    (8, 1400), (10, 1500), (12, 1600), (14, 1700), (16, 1800), (18, 1900), (20, 2000),
+]
+
+# Search budgets by skill level (0-20). Each entry applies up to and including
+# max_skill. Stockfish stops at whichever of depth, nodes or time comes first.
+# A None budget means the search is only limited by the clock.
+STRENGTH_PROFILES = [
+    {"max_skill": 2, "depth": 4, "nodes": 5000, "time": 0.05, "ponder": False},
+    {"max_skill": 5, "depth": 6, "nodes": 20000, "time": 0.1, "ponder": False},
+    {"max_skill": 8, "depth": 8, "nodes": 60000, "time": 0.25, "ponder": False},
+    {"max_skill": 11, "depth": 10, "nodes": 150000, "time": 0.5, "ponder": False},
+    {"max_skill": 14, "depth": 14, "nodes": 500000, "time": 1.0, "ponder": True},
+    {"max_skill": 17, "depth": 18, "nodes": 2000000, "time": 3.0, "ponder": True},
+    {"max_skill": 20, "depth": None, "nodes": None, "time": None, "ponder": True},
+]
+
+# Never spend more than this fraction of the remaining clock on a capped search
+CLOCK_FRACTION = 1 / 20
+
+
+def strength_profile(skill_level):
+    """
+    Get the search budget for a skill level.
+
+    Args:
+        skill_level: Stockfish skill level (0-20)
+
+    Returns:
+        Dictionary with depth, nodes, time (seconds) and whether pondering is worthwhile
+    """
+    for profile in STRENGTH_PROFILES:
+        if skill_level <= profile["max_skill"]:
+            return profile
+    return STRENGTH_PROFILES[-1]
+
+
+def search_limit(skill_level, clock=None, color=chess.BLACK, move_time=1.0):
+    """
+    Get the search limit for an engine move.
+
+    Args:
+        skill_level: Stockfish skill level (0-20)
+        clock: Optional ChessClock of the match
+        color: Side the engine plays
+        move_time: Seconds per move when there is no clock
+
+    Returns:
+        A chess.engine.Limit
+    """
+    profile = strength_profile(skill_level)
+
+    if profile["depth"] is None and profile["nodes"] is None:
+        # Full strength: let the engine's time manager budget the clock
+        return clock.engine_limit() if clock else chess.engine.Limit(time=move_time)
+
+    # Depth and node limits switch off Stockfish's time management, so cap
+    # the time explicitly as well
+    if clock:
+        time_cap = min(profile["time"], max(0.01, clock.remaining(color) * CLOCK_FRACTION))
+    else:
+        time_cap = min(profile["time"], move_time)
+
+    return chess.engine.Limit(depth=profile["depth"], nodes=profile["nodes"], time=time_cap)
+
+
+_skill_table = None
+_skill_table_lock = threading.Lock()
+
+
+def load_skill_table(path=SKILL_TABLE_PATH):
+    """
+    Load the calibrated skill table, falling back to the hand-written one.
+
+    Args:
+        path: JSON file written by elo_calibration.py
+
+    Returns:
+        List of (skill level, Elo) tuples sorted by skill level
+    """
+    try:
+        with open(path) as f:
+            data = json.load(f)
+        table = sorted((int(entry["skill"]), float(entry["elo"])) for entry in data["skill_levels"])
+        if table:
+            return table
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        logger.warning(f"Could not load skill table {path}: {e}")
+    return list(DEFAULT_SKILL_TABLE)
+
+
+def elo_to_skill_level(elo):
+    """
+    Convert an Elo rating to the Stockfish skill level that plays at that
+    strength with the search budgets of search_limit().
+
+    Args:
+        elo: Elo rating
+
+    Returns:
+        Stockfish skill level (0-20)
+    """
+    table = _get_skill_table()
+
+    skill_level = table[0][0]
+    for skill, rating in table:
+        if rating <= elo:
+            skill_level = skill
+    return skill_level
+
+
+def skill_level_to_elo(skill_level):
+    """
+    Convert a Stockfish skill level to the Elo rating it plays at, the
+    inverse of elo_to_skill_level(). Levels between the entries of the skill
+    table are interpolated.
+
+    Args:
+        skill_level: Stockfish skill level (0-20)
+
+    Returns:
+        Elo rating
+    """
+    table = _get_skill_table()
+
+    if skill_level <= table[0][0]:
+        return table[0][1]
+    for (low_skill, low_elo), (high_skill, high_elo) in zip(table, table[1:]):
+        if skill_level <= high_skill:
+            return low_elo + (high_elo - low_elo) * (skill_level - low_skill) / (high_skill - low_skill)
+    return table[-1][1]
+
+
+def _get_skill_table():
+    """The skill table, loaded on first use"""
+    global _skill_table
+
+    with _skill_table_lock:
+        if _skill_table is None:
+            _skill_table = load_skill_table()
+        return _skill_table
@@ -0,0 +1,234 @@
+"""
+Evaluation Cache Module for Grand Chess Realms
+Remembers engine evaluations by position so that hints, post-game reviews and
+tips don't search the same position twice. Recent evaluations are kept in
+memory; all of them are also stored in a small SQLite database so they
+survive between sessions.
+"""
+
+import os
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import chess
+import chess.engine
+import chess.polyglot
+
+logger = logging.getLogger("EvalCache")
+
+# Database file for evaluations kept between sessions
+EVAL_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "eval_cache.db")
+
+# Number of evaluations kept in memory
+DEFAULT_MEMORY_SIZE = 10000
+
+# Number of evaluations kept on disk; the least recently used are evicted
+DEFAULT_DISK_SIZE = 200000
+
+# Inserts between checks of the database size
+EVICTION_INTERVAL = 256
+
+# Disk hits whose recency is kept before it is written without waiting for an insert
+RECENCY_BATCH = 256
+
+
+def position_key(board: chess.Board) -> int:
+    """Zobrist hash of a position as a signed 64-bit integer (SQLite's INTEGER)"""
+    key = chess.polyglot.zobrist_hash(board)
+    return key - (1 << 64) if key >= (1 << 63) else key
+
+
+class EvalCache:
+    """
+    Two-level cache of evaluations keyed by position and search depth.
+
+    An entry answers a request if it was searched at least as deep as asked.
+    """
+
+    def __init__(self, path: Optional[str] = EVAL_CACHE_PATH, memory_size: int = DEFAULT_MEMORY_SIZE,
+                 disk_size: int = DEFAULT_DISK_SIZE):
+        """
+        Initialize the cache. The database is opened on first use.
+
+        Args:
+            path: SQLite database file, or None to keep evaluations in memory only
+            memory_size: Maximum number of evaluations kept in memory
+            disk_size: Maximum number of evaluations kept on disk
+        """
+        self.path = path
+        self.memory_size = memory_size
+        self.disk_size = disk_size
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._db_failed = path is None
+        self._inserts = 0
+        self._clock = 0
+        # Recency of disk hits not written yet, by key
+        self._used = {}
+
+    def _connect(self):
+        """Open the database on first use (None if it can't be used)"""
+        if self._db is None and not self._db_failed:
+            try:
+                self._db = sqlite3.connect(self.path, check_same_thread=False)
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS evals ("
+                    "key INTEGER PRIMARY KEY, depth INTEGER, cp INTEGER, mate INTEGER, "
+                    "move TEXT, used INTEGER)")
+                self._db.execute("CREATE INDEX IF NOT EXISTS evals_used ON evals (used)")
+                self._clock = self._db.execute("SELECT COALESCE(MAX(used), 0) FROM evals").fetchone()[0]
+                self._db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Evaluation cache unavailable, keeping evaluations in memory only: {e}")
+                self._db = None
+                self._db_failed = True
+        return self._db
+
+    def get(self, board: chess.Board, depth: int) -> Optional[Tuple[chess.engine.Score, Optional[chess.Move]]]:
+        """
+        Look up an evaluation.
+
+        Args:
+            board: Position to look up
+            depth: Minimum search depth the evaluation must have
+
+        Returns:
+            Tuple of (score from White's point of view, best move), or None
+            if the position hasn't been searched deep enough
+        """
+        key = position_key(board)
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and entry[0] >= depth:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return entry[1], entry[2]
+
+            entry = self._load(key)
+            if entry is not None and entry[0] >= depth:
+                self._remember(key, entry)
+                self.disk_hits += 1
+                return entry[1], entry[2]
+
+            self.misses += 1
+            return None
+
+    def put(self, board: chess.Board, depth: int, score: chess.engine.Score, best_move: Optional[chess.Move]):
+        """
+        Store an evaluation, unless a deeper one is already cached.
+
+        Args:
+            board: Position that was searched
+            depth: Depth the search reached
+            score: Score from White's point of view
+            best_move: Best move found, or None
+        """
+        key = position_key(board)
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and entry[0] >= depth:
+                return
+
+            entry = (depth, score, best_move)
+            self._remember(key, entry)
+            self._store(key, entry)
+
+    def _remember(self, key, entry):
+        """Put an entry in the memory tier, evicting the least recently used"""
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def _load(self, key):
+        """Read an entry from disk and mark it as used; the mark is written with the next insert"""
+        db = self._connect()
+        if db is None:
+            return None
+
+        try:
+            row = db.execute("SELECT depth, cp, mate, move FROM evals WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._clock += 1
+            self._used[key] = self._clock
+            if len(self._used) >= RECENCY_BATCH:
+                self._flush_used(db)
+                db.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Could not read evaluation cache: {e}")
+            return None
+
+        depth, cp, mate, move = row
+        score = chess.engine.Mate(mate) if mate is not None else chess.engine.Cp(cp)
+        return depth, score, chess.Move.from_uci(move) if move else None
+
+    def _store(self, key, entry):
+        """Write an entry to disk, keeping a deeper one that is already there"""
+        db = self._connect()
+        if db is None:
+            return
+
+        depth, score, best_move = entry
+        self._clock += 1
+        try:
+            self._flush_used(db)
+            db.execute(
+                "INSERT INTO evals (key, depth, cp, mate, move, used) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET depth = excluded.depth, cp = excluded.cp, "
+                "mate = excluded.mate, move = excluded.move, used = excluded.used "
+                "WHERE excluded.depth >= evals.depth",
+                (key, depth, score.score(), score.mate(), best_move.uci() if best_move else None, self._clock))
+
+            self._inserts += 1
+            if self._inserts % EVICTION_INTERVAL == 0:
+                self._evict(db)
+            db.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Could not write evaluation cache: {e}")
+
+    def _flush_used(self, db):
+        """Write the recency of disk hits, in the caller's transaction"""
+        if self._used:
+            db.executemany("UPDATE evals SET used = ? WHERE key = ?",
+                           [(used, key) for key, used in self._used.items()])
+            self._used.clear()
+
+    def _evict(self, db):
+        """Delete the least recently used entries beyond the size cap"""
+        excess = db.execute("SELECT COUNT(*) FROM evals").fetchone()[0] - self.disk_size
+        if excess > 0:
+            db.execute("DELETE FROM evals WHERE key IN (SELECT key FROM evals ORDER BY used LIMIT ?)", (excess,))
+
+    def stats(self):
+        """Get hit/miss statistics"""
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "memory_entries": len(self._memory),
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+            }
+
+    def close(self):
+        """Close the database"""
+        with self._lock:
+            if self._db is not None:
+                try:
+                    self._flush_used(self._db)
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    logger.warning(f"Could not write evaluation cache: {e}")
+                self._db.close()
+                self._db = None
@@ -0,0 +1,203 @@
+"""
+Game Review Module for Grand Chess Realms
+Reviews a finished match move by move. The positions of the game are spread
+over all Stockfish processes of the shared engine pool and analysed side by
+side, and the verdict on each move is handed back as soon as the positions
+before and after it are evaluated.
+"""
+
+import math
+from concurrent.futures import ThreadPoolExecutor
+
+import chess
+import chess.engine
+
+from engine_pool import default_pool_size
+
+# Search depth for each reviewed position
+REVIEW_DEPTH = 12
+
+# Evaluations are capped here so that mates and huge advantages don't swamp
+# the centipawn loss
+MAX_EVAL = 1000
+
+# Score used for a position where the side to move has been checkmated
+MATE_EVAL = 100000
+
+# Drop in winning chances (percentage points) from which a move is classified
+CLASSIFICATIONS = [
+    (15, "blunder"),
+    (10, "mistake"),
+    (5, "inaccuracy"),
+]
+
+
+def winning_chances(cp):
+    """
+    Convert a centipawn evaluation to winning chances.
+
+    Args:
+        cp: Evaluation in centipawns from one side's point of view
+
+    Returns:
+        That side's winning chances in percent (0-100)
+    """
+    return 50 + 50 * (2 / (1 + math.exp(-0.00368208 * cp)) - 1)
+
+
+def move_accuracy(chances_before, chances_after):
+    """
+    Accuracy of a move from how much it dropped the mover's winning chances.
+
+    Args:
+        chances_before: Mover's winning chances before the move (percent)
+        chances_after: Mover's winning chances after the move (percent)
+
+    Returns:
+        Accuracy in percent (0-100)
+    """
+    drop = max(0.0, chances_before - chances_after)
+    return max(0.0, min(100.0, 103.1668 * math.exp(-0.04354 * drop) - 3.1669))
+
+
+class GameReview:
+    """
+    Reviews the moves of a finished game on the shared engine pool.
+    """
+
+    def __init__(self, manager, depth=REVIEW_DEPTH, workers=None):
+        """
+        Initialize the review.
+
+        Args:
+            manager: The ChessMatchManager providing analysis
+            depth: Search depth for each position
+            workers: Number of positions analysed at once. Defaults to the
+                engine pool size.
+        """
+        self.manager = manager
+        self.depth = depth
+        self.workers = workers or manager.registry.max_workers or default_pool_size()
+        self.moves = []
+
+    def review(self, moves, start=None):
+        """
+        Review a game move by move.
+
+        The results are yielded in move order while later positions are still
+        being analysed. Closing the generator cancels the remaining analysis.
+
+        Args:
+            moves: The game's moves, e.g. board.move_stack
+            start: Starting position, or None for the standard starting position
+
+        Yields:
+            Dictionary per move with ply, color, move and best_move (SAN),
+            eval_before/eval_after (centipawns, White's point of view),
+            cp_loss, accuracy and classification
+        """
+        board = start.copy() if start else chess.Board()
+        positions = [board.copy()]
+        for move in moves:
+            board.push(move)
+            positions.append(board.copy(stack=False))
+
+        self.moves = []
+        executor = ThreadPoolExecutor(max_workers=self.workers)
+        futures = [executor.submit(self._evaluate, position) for position in positions]
+        try:
+            before = futures[0].result()
+            for ply, move in enumerate(moves):
+                after = futures[ply + 1].result()
+                result = self._judge(positions[ply], move, before, after)
+                self.moves.append(result)
+                yield result
+                before = after
+        finally:
+            # Don't wait for analyses already running when the review is
+            # stopped early; they finish on their own and are discarded
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _evaluate(self, board):
+        """
+        Evaluate one position.
+
+        Returns:
+            Tuple of (centipawns from White's point of view, best move), with
+            None as the evaluation if the position couldn't be analysed
+        """
+        if board.is_checkmate():
+            return (-MATE_EVAL if board.turn == chess.WHITE else MATE_EVAL), None
+        if board.is_stalemate() or board.is_insufficient_material():
+            return 0, None
+
+        # Wait as long as it takes for an engine; the review uses all of them
+        score, best_move = self.manager.analyze_position(board, depth=self.depth, timeout=None)
+        if score is None:
+            return None, None
+        return score.score(mate_score=MATE_EVAL), best_move
+
+    def _judge(self, board, move, before, after):
+        """Compare the evaluations before and after a move"""
+        color = board.turn
+        eval_before, best_move = before
+        eval_after, _ = after
+
+        result = {
+            "ply": board.ply() + 1,
+            "color": color,
+            "move": board.san(move),
+            "best_move": board.san(best_move) if best_move else None,
+            "eval_before": eval_before,
+            "eval_after": eval_after,
+            "cp_loss": None,
+            "accuracy": None,
+            "classification": None,
+        }
+        if eval_before is None or eval_after is None:
+            return result
+
+        # Everything from the mover's point of view
+        sign = 1 if color == chess.WHITE else -1
+        mover_before = max(-MAX_EVAL, min(MAX_EVAL, sign * eval_before))
+        mover_after = max(-MAX_EVAL, min(MAX_EVAL, sign * eval_after))
+        chances_before = winning_chances(mover_before)
+        chances_after = winning_chances(mover_after)
+
+        result["cp_loss"] = max(0, mover_before - mover_after)
+        result["accuracy"] = move_accuracy(chances_before, chances_after)
+
+        drop = chances_before - chances_after
+        if move == best_move:
+            result["classification"] = "best"
+        else:
+            result["classification"] = "good"
+            for threshold, label in CLASSIFICATIONS:
+                if drop >= threshold:
+                    result["classification"] = label
+                    break
+        return result
+
+    def summary(self):
+        """
+        Summarize the reviewed moves by side.
+
+        Returns:
+            Dictionary mapping chess.WHITE/chess.BLACK to the average centipawn
+            loss, average accuracy and the number of moves in each classification
+        """
+        summary = {}
+        for color in (chess.WHITE, chess.BLACK):
+            judged = [m for m in self.moves if m["color"] == color and m["accuracy"] is not None]
+            side = {
+                "moves": len(judged),
+                "avg_cp_loss": sum(m["cp_loss"] for m in judged) / len(judged) if judged else 0.0,
+                "accuracy": sum(m["accuracy"] for m in judged) / len(judged) if judged else 0.0,
+            }
+            side["blunders"] = sum(1 for m in judged if m["classification"] == "blunder")
+            side["mistakes"] = sum(1 for m in judged if m["classification"] == "mistake")
+            side["inaccuracies"] = sum(1 for m in judged if m["classification"] == "inaccuracy")
+            summary[color] = side
+        return summary
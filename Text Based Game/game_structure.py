@@ -1,10 +1,16 @@
-import os
-import time
-import random
 import pickle
+from contextlib import ExitStack
 import chess
 import chess.engine
 
+from engine_registry import get_engine_registry
+from engine_strength import search_limit, elo_to_skill_level
+from builtin_engine import BuiltinEngine, BUILTIN_ENGINE_MAX_ELO, DEFAULT_MOVE_TIME
+from move_input import resolve_move
+from board_renderer import BoardRenderer
+from screen import get_screen
+from input_mux import read_input
+
 class ChessRPG:
     def __init__(self):
         # Game state
@@ -25,14 +31,14 @@ class ChessRPG:
         self.locations = {}
         self.npcs = {}
         
-        # Chess engine setup
-        try:
-            # Update the path to your stockfish executable
-            self.engine = chess.engine.SimpleEngine.popen_uci("stockfish")
-            print("Chess engine loaded successfully.")
-        except:
-            print("Warning: Stockfish chess engine not found. Please install it for chess battles.")
-            self.engine = None
+        # Chess engine setup - the engine process is shared and only started
+        # once a chess match is likely
+        self.engine_registry = get_engine_registry()
+        self.board_renderer = BoardRenderer()
+        if self.engine_registry.is_available():
+            print("Chess engine found.")
+        else:
+            print("Stockfish chess engine not found. Chess battles will use the built-in engine.")
         
         # Game flags
         self.game_running = True
@@ -173,12 +179,12 @@ class ChessRPG:
         # Main game loop
         while self.game_running:
             self.display_location()
-            command = input("\n> ").strip().lower()
+            command = read_input("\n> ").strip().lower()
             self.process_command(command)
     
     def display_welcome(self):
         """Show the game's welcome message and introduction"""
-        os.system('cls' if os.name == 'nt' else 'clear')
+        get_screen().clear()
         print("=" * 80)
         print(" " * 25 + "THE GRAND CHESS REALMS" + " " * 25)
         print("=" * 80)
@@ -188,15 +194,15 @@ class ChessRPG:
         print("\nIn this land divided between the honorable White Kingdom and the cunning Black Kingdom,")
         print("your strategic mind will be your greatest weapon.")
         print("\n" + "=" * 80)
-        input("\nPress Enter to begin your journey...")
+        read_input("\nPress Enter to begin your journey...")
     
     def create_character(self):
         """Handle character creation process"""
-        os.system('cls' if os.name == 'nt' else 'clear')
+        get_screen().clear()
         print("CHARACTER CREATION")
         print("=================\n")
         
-        self.player["name"] = input("What is your name, traveler? ").strip()
+        self.player["name"] = read_input("What is your name, traveler? ").strip()
         
         print("\nChoose your background:")
         backgrounds = [
@@ -213,7 +219,7 @@ class ChessRPG:
         choice = 0
         while choice < 1 or choice > len(backgrounds):
             try:
-                choice = int(input("\nSelect a number: "))
+                choice = int(read_input("\nSelect a number: "))
             except:
                 pass
         
@@ -223,11 +229,11 @@ class ChessRPG:
         print(f"\nWelcome, {self.player['name']} the {self.player['background']}!")
         print("Your journey in the Grand Chess Realms begins in a small village under")
         print("the protection of the White Kingdom.")
-        input("\nPress Enter to continue...")
+        read_input("\nPress Enter to continue...")
     
     def display_location(self):
         """Show the current location description and available options"""
-        os.system('cls' if os.name == 'nt' else 'clear')
+        get_screen().clear()
         location = self.current_location
         
         # Mark as visited
@@ -282,7 +288,7 @@ class ChessRPG:
                 self.move_player(words[1])
             else:
                 print("Move where? Please specify a direction.")
-                input("Press Enter to continue...")
+                read_input("Press Enter to continue...")
         
         # Handle talking to NPCs
         elif action == "talk" and len(words) > 1 and words[1] == "to":
@@ -290,7 +296,7 @@ class ChessRPG:
                 self.talk_to_npc(" ".join(words[2:]))
             else:
                 print("Talk to whom? Please specify a person.")
-                input("Press Enter to continue...")
+                read_input("Press Enter to continue...")
         
         # Handle examining
         elif action in ["examine", "look", "inspect"]:
@@ -298,7 +304,7 @@ class ChessRPG:
                 self.examine_target(" ".join(words[1:]))
             else:
                 print("Examine what? Please specify a target.")
-                input("Press Enter to continue...")
+                read_input("Press Enter to continue...")
         
         # Handle taking items
         elif action in ["take", "get", "pickup"]:
@@ -306,7 +312,7 @@ class ChessRPG:
                 self.take_item(" ".join(words[1:]))
             else:
                 print("Take what? Please specify an item.")
-                input("Press Enter to continue...")
+                read_input("Press Enter to continue...")
         
         # Handle inventory
         elif action == "inventory":
@@ -318,7 +324,7 @@ class ChessRPG:
                 self.challenge_to_chess(" ".join(words[1:]))
             else:
                 print("Challenge whom? Please specify a person.")
-                input("Press Enter to continue...")
+                read_input("Press Enter to continue...")
         
         # Handle help
         elif action == "help":
@@ -326,13 +332,13 @@ class ChessRPG:
         
         # Handle quitting
         elif action in ["quit", "exit"]:
-            confirm = input("Are you sure you want to quit? (y/n): ").lower()
+            confirm = read_input("Are you sure you want to quit? (y/n): ").lower()
             if confirm.startswith("y"):
                 self.game_running = False
         
         else:
             print("I don't understand that command.")
-            input("Press Enter to continue...")
+            read_input("Press Enter to continue...")
     
     def move_player(self, direction):
         """Move the player in the specified direction"""
@@ -343,7 +349,7 @@ class ChessRPG:
             self.current_location = self.locations[destination]
         else:
             print(f"You cannot go {direction} from here.")
-            input("Press Enter to continue...")
+            read_input("Press Enter to continue...")
     
     def talk_to_npc(self, npc_name):
         """Handle conversation with an NPC"""
@@ -356,12 +362,16 @@ class ChessRPG:
         
         if not npc_id:
             print(f"There's no one named {npc_name} here.")
-            input("Press Enter to continue...")
+            read_input("Press Enter to continue...")
             return
         
         npc = self.npcs[npc_id]
         
-        os.system('cls' if os.name == 'nt' else 'clear')
+        # A conversation may well end in a chess challenge
+        if not npc.get("hostile", False):
+            self.engine_registry.prewarm()
+        
+        get_screen().clear()
         print(f"=== Conversation with {npc['name']} ===\n")
         print(f"{npc['name']}: \"{npc['dialogue']['greeting']}\"")
         
@@ -383,7 +393,7 @@ class ChessRPG:
             choice = 0
             while choice < 1 or choice > len(topics) + 3:
                 try:
-                    choice = int(input("\nSelect a number: "))
+                    choice = int(read_input("\nSelect a number: "))
                 except:
                     pass
             
@@ -391,7 +401,7 @@ class ChessRPG:
                 topic = topics[choice - 1]
                 print(f"\n{self.player['name']}: Tell me about {topic.replace('_', ' ')}.")
                 print(f"{npc['name']}: \"{npc['dialogue'][topic]}\"")
-                input("\nPress Enter to continue...")
+                read_input("\nPress Enter to continue...")
             
             elif choice == len(topics) + 1:
                 talking = False
@@ -403,7 +413,7 @@ class ChessRPG:
                     print(f"Quest accepted: {npc['quest'].replace('_', ' ').title()}")
                 else:
                     print("You've already accepted this quest.")
-                input("\nPress Enter to continue...")
+                read_input("\nPress Enter to continue...")
             
             elif choice == len(topics) + 3 and not npc.get("hostile", False):
                 self.challenge_to_chess(npc["name"])
@@ -415,7 +425,7 @@ class ChessRPG:
         for npc_id in self.current_location["npcs"]:
             if target.lower() in self.npcs[npc_id]["name"].lower():
                 print(f"\n{self.npcs[npc_id]['description']}")
-                input("\nPress Enter to continue...")
+                read_input("\nPress Enter to continue...")
                 return
         
         # Check if target is an item
@@ -433,11 +443,11 @@ class ChessRPG:
                 else:
                     print(f"\nA {item.replace('_', ' ')}. Nothing particularly notable about it.")
                 
-                input("\nPress Enter to continue...")
+                read_input("\nPress Enter to continue...")
                 return
         
         print(f"You don't see {target} here.")
-        input("Press Enter to continue...")
+        read_input("Press Enter to continue...")
     
     def take_item(self, item_name):
         """Take an item from the current location"""
@@ -446,15 +456,15 @@ class ChessRPG:
                 self.player["inventory"].append(item)
                 self.current_location["items"].remove(item)
                 print(f"You took the {item.replace('_', ' ')}.")
-                input("Press Enter to continue...")
+                read_input("Press Enter to continue...")
                 return
         
         print(f"There's no {item_name} here to take.")
-        input("Press Enter to continue...")
+        read_input("Press Enter to continue...")
     
     def show_inventory(self):
         """Display the player's inventory"""
-        os.system('cls' if os.name == 'nt' else 'clear')
+        get_screen().clear()
         print("=== INVENTORY ===\n")
         
         if not self.player["inventory"]:
@@ -463,7 +473,7 @@ class ChessRPG:
             for item in self.player["inventory"]:
                 print(f"- {item.replace('_', ' ').title()}")
         
-        input("\nPress Enter to continue...")
+        read_input("\nPress Enter to continue...")
     
     def challenge_to_chess(self, npc_name):
         """Challenge an NPC to a chess match"""
@@ -476,13 +486,16 @@ class ChessRPG:
         
         if not npc_id:
             print(f"There's no one named {npc_name} here to challenge.")
-            input("Press Enter to continue...")
+            read_input("Press Enter to continue...")
             return
         
         npc = self.npcs[npc_id]
         
+        # Start the engine while the player reads the introduction
+        self.engine_registry.prewarm()
+        
         # Chess match setup
-        os.system('cls' if os.name == 'nt' else 'clear')
+        get_screen().clear()
         print(f"=== CHESS CHALLENGE: {self.player['name']} vs. {npc['name']} ===\n")
         
         # Narrative introduction to the match
@@ -495,71 +508,62 @@ class ChessRPG:
         else:
             print(f"\n{npc['name']}: \"May the best strategist win.\"")
         
-        input("\nPress Enter to begin the match...")
+        read_input("\nPress Enter to begin the match...")
         
-        # If we have a chess engine, play a real game
-        if self.engine:
-            result = self.play_chess_match(npc["chess_skill"])
-            
-            # Handle the result
-            self.handle_chess_result(result, npc)
-        else:
-            # No chess engine, simulate the match
-            print("\nNo chess engine found. The match will be simulated.")
-            time.sleep(2)
-            
-            # Simple probability-based outcome based on skill difference
-            player_skill = 1200  # Default player skill
-            skill_diff = player_skill - npc["chess_skill"]
-            win_chance = 0.5 + (skill_diff / 1000)  # Adjust probability based on skill
-            win_chance = max(0.1, min(0.9, win_chance))  # Cap between 10% and 90%
-            
-            result = random.random()
-            if result < win_chance:
-                self.handle_chess_result("win", npc)
-            elif result < win_chance + 0.2:  # 20% chance of draw
-                self.handle_chess_result("draw", npc)
-            else:
-                self.handle_chess_result("loss", npc)
+        # Play a real game, against the built-in engine if there is no Stockfish
+        result = self.play_chess_match(npc["chess_skill"])
+        
+        # Handle the result
+        self.handle_chess_result(result, npc)
     
     def play_chess_match(self, opponent_elo):
         """Play an actual chess match against the engine"""
+        if opponent_elo <= BUILTIN_ENGINE_MAX_ELO or not self.engine_registry.is_available():
+            # Weak opponents don't need a Stockfish process
+            with BuiltinEngine(opponent_elo) as engine:
+                return self._play_chess_match(engine, chess.engine.Limit(time=DEFAULT_MOVE_TIME))
+        
+        # Lease an engine set to the appropriate Elo level for the whole match
+        skill_level = self.elo_to_skill_level(opponent_elo)
+        with ExitStack() as stack:
+            try:
+                engine = stack.enter_context(self.engine_registry.lease({"Skill Level": skill_level}))
+            except (RuntimeError, TimeoutError) as e:
+                # Stockfish is installed but won't start; play the built-in engine instead
+                print(f"Chess engine unavailable: {e}")
+                engine = stack.enter_context(BuiltinEngine(opponent_elo))
+                return self._play_chess_match(engine, chess.engine.Limit(time=DEFAULT_MOVE_TIME))
+            return self._play_chess_match(engine, search_limit(skill_level))
+    
+    def _play_chess_match(self, engine, limit):
+        """Run the match loop for play_chess_match() against a leased or built-in engine"""
         board = chess.Board()
-        
-        # Set up the chess engine with appropriate Elo level
-        self.engine.configure({"Skill Level": self.elo_to_skill_level(opponent_elo)})
+        self.board_renderer.invalidate()
         
         # Main chess loop
         while not board.is_game_over():
-            # Display the board
-            os.system('cls' if os.name == 'nt' else 'clear')
-            print(self.render_board(board))
+            # Display the board, redrawing only what changed
+            self.board_renderer.draw(board)
             
             if board.turn == chess.WHITE:  # Player's turn
                 print("\nYour turn (White)")
-                move_uci = input("Enter move in UCI format (e.g., e2e4, g1f3): ").strip()
+                move_text = read_input("Enter your move (e.g., e4, Nf3, g1f3): ").strip()
                 
                 try:
-                    move = chess.Move.from_uci(move_uci)
-                    if move in board.legal_moves:
-                        board.push(move)
-                    else:
-                        print("Illegal move. Try again.")
-                        input("Press Enter to continue...")
-                except ValueError:
-                    print("Invalid format. Please use UCI notation (e.g., e2e4).")
-                    input("Press Enter to continue...")
+                    board.push(resolve_move(board, move_text))
+                except ValueError as e:
+                    print(e)
+                    read_input("Press Enter to continue...")
             
             else:  # Engine's turn
                 print("\nOpponent is thinking...")
-                result = self.engine.play(board, chess.engine.Limit(time=1.0))
+                result = engine.play(board, limit)
                 board.push(result.move)
                 print(f"Opponent played: {result.move.uci()}")
-                time.sleep(1)
+                get_screen().pause(1)
         
         # Display final board state
-        os.system('cls' if os.name == 'nt' else 'clear')
-        print(self.render_board(board))
+        self.board_renderer.draw(board)
         
         # Determine the result
         if board.is_checkmate():
@@ -574,44 +578,16 @@ class ChessRPG:
     
     def render_board(self, board):
         """Render the chess board in ASCII"""
-        board_str = str(board)
-        
-        # Convert to cleaner ASCII representation
-        rows = board_str.split('\n')
-        output = []
-        
-        output.append("  a b c d e f g h")
-        output.append(" +-----------------+")
-        
-        for i, row in enumerate(rows):
-            output.append(f"{8-i}| {' '.join(row)} |")
-        
-        output.append(" +-----------------+")
-        output.append("  a b c d e f g h")
-        
-        return '\n'.join(output)
+        return self.board_renderer.render(board)
     
     def elo_to_skill_level(self, elo):
         """Convert Elo rating to Stockfish skill level (0-20)"""
-        # Simple mapping of Elo ranges to skill levels
-        if elo < 800:
-            return 0
-        elif elo < 1000:
-            return 3
-        elif elo < 1200:
-            return 6
-        elif elo < 1400:
-            return 9
-        elif elo < 1600:
-            return 12
-        elif elo < 1800:
-            return 15
-        else:
-            return 18
+        # Same calibrated table as the chess match manager
+        return elo_to_skill_level(elo)
     
     def handle_chess_result(self, result, npc):
         """Handle the outcome of a chess match"""
-        os.system('cls' if os.name == 'nt' else 'clear')
+        get_screen().clear()
         print(f"=== MATCH RESULT: {self.player['name']} vs. {npc['name']} ===\n")
         
         # Update player stats
@@ -659,11 +635,11 @@ class ChessRPG:
             print("The match ends in a draw.")
             print(f"\n{npc['name']}: \"A fair outcome. We seem evenly matched.\"")
         
-        input("\nPress Enter to continue...")
+        read_input("\nPress Enter to continue...")
     
     def show_help(self):
         """Display help information"""
-        os.system('cls' if os.name == 'nt' else 'clear')
+        get_screen().clear()
         print("=== HELP: COMMANDS ===\n")
         print("MOVE [direction]        - Move in the specified direction (north, south, east, west)")
         print("TALK TO [person]        - Start a conversation with an NPC")
@@ -674,7 +650,7 @@ class ChessRPG:
         print("HELP                    - Show this help screen")
         print("QUIT                    - Exit the game")
         
-        input("\nPress Enter to continue...")
+        read_input("\nPress Enter to continue...")
     
     def save_game(self):
         """Save the current game state"""
@@ -711,5 +687,6 @@ class ChessRPG:
 
 # Main entry point
 if __name__ == "__main__":
+    get_screen().install()
     game = ChessRPG()
     game.start_game()
@@ -0,0 +1,169 @@
+"""
+Input Multiplexer Module for Grand Chess Realms
+Lets the keyboard and the Chessnut Pro board be waited on together. The
+board's move queue signals new moves through a socket pair, so it can be
+watched by select() and event loops like a file; stdin that select() can't
+watch (pipes, Windows consoles) is read one line per request on a shared
+thread that feeds such a queue.
+"""
+
+import sys
+import time
+import queue
+import socket
+import threading
+
+
+def _wakeup_pair():
+    """Non-blocking socket pair; sockets can be selected on every platform"""
+    reader, writer = socket.socketpair()
+    reader.setblocking(False)
+    writer.setblocking(False)
+    return reader, writer
+
+
+def _drain(sock):
+    try:
+        while sock.recv(4096):
+            pass
+    except (BlockingIOError, InterruptedError):
+        pass
+
+
+class SelectableQueue(queue.Queue):
+    """
+    Queue that can be waited on with select(): every put() makes fileno()
+    readable. Items remember when they were put.
+    """
+
+    def __init__(self, maxsize=0, on_get=None):
+        """
+        Initialize the queue.
+
+        Args:
+            maxsize: Maximum number of items, or 0 for no limit
+            on_get: Function called after each item is taken, e.g. to let a
+                producer that stopped at a full queue carry on
+        """
+        super().__init__(maxsize)
+        self._reader, self._writer = _wakeup_pair()
+        self.last_put_time = None
+        self.on_get = on_get
+
+    def _put(self, item):
+        self.queue.append((item, time.monotonic()))
+        try:
+            self._writer.send(b"\0")
+        except (BlockingIOError, InterruptedError):
+            # Already readable
+            pass
+
+    def _get(self):
+        item, self.last_put_time = self.queue.popleft()
+        if self.on_get:
+            self.on_get()
+        return item
+
+    def fileno(self):
+        return self._reader.fileno()
+
+    def clear_wakeups(self):
+        """Reset readiness; call before checking whether the queue is empty"""
+        _drain(self._reader)
+
+    def close(self):
+        self._reader.close()
+        self._writer.close()
+
+
+class _LineReader:
+    """
+    Reads stdin line by line on a thread, for streams that select() can't
+    watch. Only one line is read per request, so input() elsewhere in the
+    game isn't raced for lines nobody asked for.
+    """
+
+    def __init__(self, stdin):
+        self.stdin = stdin
+        self.lines = SelectableQueue()
+        self._wanted = threading.Event()
+        # Guards _reading and the queue check, so a request can't slip in
+        # between a line being read and it being queued
+        self._lock = threading.Lock()
+        self._reading = False
+        self.closed = False
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def request(self):
+        """Read the next line unless one is already read or being read"""
+        with self._lock:
+            if not self._reading and self.lines.empty():
+                self._reading = True
+                self._wanted.set()
+
+    def _run(self):
+        while True:
+            self._wanted.wait()
+            self._wanted.clear()
+            line = self.stdin.readline()
+            with self._lock:
+                if not line:
+                    self.closed = True
+                self.lines.put(line)
+                self._reading = False
+            if not line:
+                return
+
+
+_line_readers = {}
+_line_readers_lock = threading.Lock()
+
+
+def line_reader(stdin):
+    """
+    Get the process-wide line reader for a stream, for code that can't
+    select() on it directly.
+
+    Args:
+        stdin: Input stream
+
+    Returns:
+        The stream's reader; call request() and take the line from its
+        `lines` queue (an empty line means end of input)
+    """
+    with _line_readers_lock:
+        reader = _line_readers.get(id(stdin))
+        if reader is None:
+            reader = _line_readers[id(stdin)] = _LineReader(stdin)
+        return reader
+
+
+def read_input(prompt=""):
+    """
+    input() for the whole game. Once stdin has a shared line reader, a line
+    it is already reading or has read belongs to the next prompt, so every
+    prompt takes its line from the reader instead of reading stdin itself.
+
+    Args:
+        prompt: Text to show before reading
+
+    Returns:
+        The line without its trailing newline
+
+    Raises:
+        EOFError: If stdin was closed
+    """
+    with _line_readers_lock:
+        reader = _line_readers.get(id(sys.stdin))
+    if reader is None:
+        return input(prompt)
+
+    print(prompt, end="", flush=True)
+    if reader.closed and reader.lines.empty():
+        raise EOFError("stdin closed")
+    reader.request()
+    line = reader.lines.get()
+    if not line:
+        raise EOFError("stdin closed")
+    return line.rstrip("\n")
+
@@ -1,3 +1,6 @@
+from input_mux import read_input
+
+
 class LoreManager:
     """
     Manages the lore, story content, and narrative progression
@@ -871,14 +874,14 @@ class StoryManager:
         """Display story text with appropriate formatting"""
         # In a full implementation, this would be integrated with the game's
         # text display system. For now, it's a simple placeholder.
-        import os
+        from screen import get_screen
         
-        os.system('cls' if os.name == 'nt' else 'clear')
+        get_screen().clear()
         print("=" * 60)
         for line in text_lines:
             print(line)
         print("\n" + "=" * 60)
-        input("\nPress Enter to continue...")
+        read_input("\nPress Enter to continue...")
     
     def get_current_objective(self):
         """Get the current main objective based on story flags"""
@@ -1,6 +1,5 @@
 import os
 import sys
-import time
 import logging
 
 # Set up logging
@@ -19,6 +18,9 @@ from game_structure import ChessRPG
 from dice_mechanics import GameMechanics
 from lore_and_story import LoreManager, StoryManager
 from chess_engine_integration import ChessMatchManager
+from tournament import Tournament, Entrant, load_lorebook_entrants
+from screen import get_screen
+from input_mux import read_input
 
 try:
     from chessnut_integration import integrate_with_chess_manager
@@ -36,7 +38,7 @@ class GrandChessRealms:
     def __init__(self):
         """Initialize the complete game"""
         # Clear the screen
-        os.system('cls' if os.name == 'nt' else 'clear')
+        get_screen().clear()
         
         # Display loading message
         print("Loading Grand Chess Realms...")
@@ -45,17 +47,22 @@ class GrandChessRealms:
         # Initialize core game
         self.game = ChessRPG()
         
-        # Initialize chess engine
+        # Initialize chess engine (shares the game's engine, started on first match)
         print("Setting up chess engine...")
-        self.chess_manager = ChessMatchManager()
+        self.chess_manager = ChessMatchManager(ponder=True)
         
         # Initialize Chessnut Pro integration
         if CHESSNUT_AVAILABLE:
             print("Looking for Chessnut Pro board...")
             try:
                 self.chess_manager = integrate_with_chess_manager(self.chess_manager)
-                if hasattr(self.chess_manager, 'chessnut') and self.chess_manager.chessnut.connected:
+                status = self.chess_manager.chessnut.get_connection_status()
+                if status['connected']:
                     print("✅ Chessnut Pro connected and ready! You can use the physical board for moves.")
+                elif status['state'] != 'disconnected' or status.get('next_retry_in') is not None:
+                    # The board connects in the background; moves are taken from it once it's ready
+                    print("🔄 Still looking for the Chessnut Pro board in the background.")
+                    print("   Keyboard input works meanwhile; check with the 'chessnut' command.")
                 else:
                     print("❌ No Chessnut Pro board detected. Using keyboard input for chess moves.")
                     print("   You can check connection status with the 'chessnut' command during gameplay.")
@@ -94,7 +101,7 @@ class GrandChessRealms:
         self.game.challenge_to_chess = self.enhanced_challenge_to_chess
         
         print("All systems initialized successfully!")
-        time.sleep(1)
+        get_screen().pause(1)
     
     def extended_process_command(self, command):
         """Extended command processing with additional commands"""
@@ -128,6 +135,9 @@ class GrandChessRealms:
         elif action == "chessnut":
             self.check_chessnut_status()
         
+        elif action == "tournament":
+            self.run_tournament()
+        
         elif action == "save":
             self.save_game()
         
@@ -136,10 +146,10 @@ class GrandChessRealms:
                 self.load_game(words[1])
             else:
                 print("Please specify a save file to load.")
-                input("Press Enter to continue...")
+                read_input("Press Enter to continue...")
         
         elif action == "clear":
-            os.system('cls' if os.name == 'nt' else 'clear')
+            get_screen().clear()
         
         else:
             # Default to original command handling
@@ -147,7 +157,7 @@ class GrandChessRealms:
     
     def check_chessnut_status(self):
         """Check and display Chessnut Pro connection status"""
-        os.system('cls' if os.name == 'nt' else 'clear')
+        get_screen().clear()
         print("=" * 60)
         print(" CHESSNUT PRO STATUS ")
         print("=" * 60)
@@ -156,7 +166,7 @@ class GrandChessRealms:
             print("\n❌ Chessnut Pro integration module is not installed")
             print("\nTo enable Chessnut Pro integration, make sure chessnut_integration.py")
             print("is in your game directory and EasyLinkSDK is properly installed.")
-            input("\nPress Enter to continue...")
+            read_input("\nPress Enter to continue...")
             return
         
         if hasattr(self.chess_manager, 'chessnut'):
@@ -175,13 +185,16 @@ class GrandChessRealms:
                 
                 if status['sdk_available']:
                     print("\nSDK Status: Available")
+                    print(f"Connection State: {status['state']}")
                     print(f"Last Error: {status['last_error'] or 'None'}")
                     print(f"Connection Attempts: {status['connection_attempts']}")
+                    if status['next_retry_in'] is not None:
+                        print(f"Next Retry In: {status['next_retry_in']:.0f}s")
                     
                     print("\nAttempting to reconnect...")
                     if chessnut.connect(auto_retry=False):
                         # Check if actually connected after a short delay
-                        time.sleep(2)
+                        get_screen().pause(2)
                         if chessnut.connected:
                             print("Successfully reconnected to Chessnut Pro!")
                         else:
@@ -205,7 +218,7 @@ class GrandChessRealms:
             print("\nThe Chessnut Pro integration module may not be properly installed.")
             print("Please refer to the setup guide for instructions.")
         
-        input("\nPress Enter to continue...")
+        read_input("\nPress Enter to continue...")
     
     def enhanced_move_player(self, direction):
         """Enhanced move player function that checks for random encounters"""
@@ -234,13 +247,16 @@ class GrandChessRealms:
         
         if not npc_id:
             print(f"There's no one named {npc_name} here to challenge.")
-            input("Press Enter to continue...")
+            read_input("Press Enter to continue...")
             return
         
         npc = self.game.npcs[npc_id]
         
+        # Start the engine while the player reads the introduction
+        self.chess_manager.prewarm_engine()
+        
         # Chess match setup
-        os.system('cls' if os.name == 'nt' else 'clear')
+        get_screen().clear()
         print("=" * 60)
         print(f" CHESS CHALLENGE: {self.game.player['name']} vs. {npc['name']} ")
         print("=" * 60)
@@ -251,7 +267,7 @@ class GrandChessRealms:
         
         if has_chessnut:
             print("\n✓ Chessnut Pro board detected - you can make moves physically on your board")
-            print("  The game will instruct you when to update your board with opponent moves")
+            print("  The game will show you the opponent's moves to make on your board")
         
         # Narrative introduction to the match
         print(f"\n{npc['name']} accepts your challenge.")
@@ -262,40 +278,30 @@ class GrandChessRealms:
         else:
             print(f"\n{npc['name']}: \"May the best strategist win.\"")
         
-        input("\nPress Enter to begin the match...")
+        read_input("\nPress Enter to begin the match...")
         
-        # Use the chess manager to handle the match
-        if self.chess_manager.engine:
-            # Play a full chess match
-            result = self.chess_manager.play_match(
-                opponent_name=npc['name'],
-                opponent_elo=npc['chess_skill'],
-                time_control="90/30"  # Default time control
-            )
-        else:
-            # No chess engine, simulate the match
-            print("\nNo chess engine found. The match will be simulated.")
-            time.sleep(2)
-            
-            # Estimate player's skill level (could be more sophisticated)
-            player_skill = 1200 + (self.game.player["chess_wins"] * 50)
-            
-            # Simulate the match
-            result, narrative = self.chess_manager.simulate_match(
-                opponent_elo=npc['chess_skill'],
-                player_skill=player_skill
-            )
-            
-            # Display the narrative
-            print("\n" + narrative)
-            input("\nPress Enter to continue...")
+        # Use the chess manager to handle the match; without Stockfish the
+        # built-in engine plays
+        result = self.chess_manager.play_match(
+            opponent_name=npc['name'],
+            opponent_elo=npc['chess_skill'],
+            time_control="90/30",  # Default time control
+            repertoire=npc.get('opening_book')
+        )
+        
+        # Offer a move-by-move review of the game
+        if self.chess_manager.last_match_moves and self.chess_manager.has_engine():
+            review = read_input("\nWould you like to review the game? (y/n): ").lower()
+            if review.startswith('y'):
+                self.chess_manager.review_game(self.chess_manager.last_match_moves)
+                read_input("\nPress Enter to continue...")
         
         # Handle the result
         self.handle_chess_result(result, npc, npc_id)
     
     def handle_chess_result(self, result, npc, npc_id):
         """Handle the outcome of a chess match"""
-        os.system('cls' if os.name == 'nt' else 'clear')
+        get_screen().clear()
         print("=" * 60)
         print(f" MATCH RESULT: {self.game.player['name']} vs. {npc['name']} ")
         print("=" * 60)
@@ -362,11 +368,11 @@ class GrandChessRealms:
                 # Offer alignment choice
                 self.offer_alignment_choice()
         
-        input("\nPress Enter to continue...")
+        read_input("\nPress Enter to continue...")
     
     def offer_alignment_choice(self):
         """Offer the player a choice of alignment"""
-        os.system('cls' if os.name == 'nt' else 'clear')
+        get_screen().clear()
         print("=" * 60)
         print(" A CHOICE OF PATHS ")
         print("=" * 60)
@@ -383,7 +389,7 @@ class GrandChessRealms:
         choice = 0
         while choice < 1 or choice > 3:
             try:
-                choice = int(input("\nYour choice (1-3): "))
+                choice = int(read_input("\nYour choice (1-3): "))
             except:
                 pass
         
@@ -399,7 +405,7 @@ class GrandChessRealms:
         viewing_lore = True
         
         while viewing_lore:
-            os.system('cls' if os.name == 'nt' else 'clear')
+            get_screen().clear()
             print("=" * 60)
             print(" LORE CODEX ")
             print("=" * 60)
@@ -417,7 +423,7 @@ class GrandChessRealms:
             choice = 0
             while choice < 1 or choice > 6:
                 try:
-                    choice = int(input("\nSelect a category: "))
+                    choice = int(read_input("\nSelect a category: "))
                 except:
                     pass
             
@@ -444,11 +450,11 @@ class GrandChessRealms:
             
             if not entries:
                 print("\nYou haven't discovered any lore in this category yet.")
-                input("\nPress Enter to continue...")
+                read_input("\nPress Enter to continue...")
                 continue
             
             # Show entries in this category
-            os.system('cls' if os.name == 'nt' else 'clear')
+            get_screen().clear()
             print("=" * 60)
             print(f" {category.upper()} ")
             print("=" * 60)
@@ -461,7 +467,7 @@ class GrandChessRealms:
             entry_choice = 0
             while entry_choice < 1 or entry_choice > len(entries) + 1:
                 try:
-                    entry_choice = int(input("\nSelect an entry: "))
+                    entry_choice = int(read_input("\nSelect an entry: "))
                 except:
                     pass
             
@@ -473,17 +479,17 @@ class GrandChessRealms:
             entry = self.lore.get_lore_entry(category, entry_id)
             
             if entry:
-                os.system('cls' if os.name == 'nt' else 'clear')
+                get_screen().clear()
                 print("=" * 60)
                 print(f" {entry['title'].upper()} ")
                 print("=" * 60)
                 print()
                 print(entry['content'])
-                input("\nPress Enter to continue...")
+                read_input("\nPress Enter to continue...")
     
     def show_quests(self):
         """Show current quests"""
-        os.system('cls' if os.name == 'nt' else 'clear')
+        get_screen().clear()
         print("=" * 60)
         print(" QUESTS ")
         print("=" * 60)
@@ -512,7 +518,7 @@ class GrandChessRealms:
             for objective in side_objectives:
                 print(f"- {objective}")
         
-        input("\nPress Enter to continue...")
+        read_input("\nPress Enter to continue...")
     
     def read_item(self, item_name):
         """Read a book or scroll"""
@@ -525,7 +531,7 @@ class GrandChessRealms:
         
         if not item_id:
             print(f"You don't have {item_name} in your inventory.")
-            input("Press Enter to continue...")
+            read_input("Press Enter to continue...")
             return
         
         # Check if it's a readable item
@@ -541,7 +547,7 @@ class GrandChessRealms:
                 book = self.lore.get_book_content(book_id)
                 
                 if book:
-                    os.system('cls' if os.name == 'nt' else 'clear')
+                    get_screen().clear()
                     print("=" * 60)
                     print(f" {book['title'].upper()} ")
                     print("=" * 60)
@@ -553,19 +559,19 @@ class GrandChessRealms:
                         # Mark prophecy as discovered
                         self.story.trigger_story_event("discover_prophecy")
                     
-                    input("\nPress Enter to continue...")
+                    read_input("\nPress Enter to continue...")
                     return
             
             # Generic readable item
             print(f"You read the {item_id.replace('_', ' ')}. It contains some interesting information.")
-            input("Press Enter to continue...")
+            read_input("Press Enter to continue...")
         else:
             print(f"The {item_id.replace('_', ' ')} isn't something you can read.")
-            input("Press Enter to continue...")
+            read_input("Press Enter to continue...")
     
     def show_player_status(self):
         """Show detailed player status"""
-        os.system('cls' if os.name == 'nt' else 'clear')
+        get_screen().clear()
         print("=" * 60)
         print(" CHARACTER STATUS ")
         print("=" * 60)
@@ -581,18 +587,7 @@ class GrandChessRealms:
         print(f"Losses: {player['chess_losses']}")
         print(f"Draws: {player['chess_draws']}")
         
-        # Calculate a simple Elo rating
-        base_rating = 1200
-        k_factor = 32
-        
-        wins_adjustment = player['chess_wins'] * k_factor
-        losses_adjustment = player['chess_losses'] * k_factor
-        draws_adjustment = player['chess_draws'] * (k_factor / 2)
-        
-        estimated_rating = base_rating + wins_adjustment - losses_adjustment + draws_adjustment
-        estimated_rating = min(2200, max(800, estimated_rating))  # Cap between 800 and 2200
-        
-        print(f"Estimated Rating: {int(estimated_rating)}")
+        print(f"Estimated Rating: {self.estimate_player_rating()}")
         
         print("\nInventory:")
         if player["inventory"]:
@@ -615,11 +610,137 @@ class GrandChessRealms:
             else:
                 print("❌ Not connected (type 'chessnut' to check status)")
         
-        input("\nPress Enter to continue...")
+        read_input("\nPress Enter to continue...")
+    
+    def estimate_player_rating(self):
+        """Calculate a simple Elo rating from the player's chess record"""
+        player = self.game.player
+        base_rating = 1200
+        k_factor = 32
+        
+        wins_adjustment = player['chess_wins'] * k_factor
+        losses_adjustment = player['chess_losses'] * k_factor
+        draws_adjustment = player['chess_draws'] * (k_factor / 2)
+        
+        estimated_rating = base_rating + wins_adjustment - losses_adjustment + draws_adjustment
+        estimated_rating = min(2200, max(800, estimated_rating))  # Cap between 800 and 2200
+        
+        return int(estimated_rating)
+    
+    def run_tournament(self):
+        """Enter the Grand Tournament of Strategy against the champions of the realm"""
+        get_screen().clear()
+        print("=" * 60)
+        print(" THE GRAND TOURNAMENT OF STRATEGY ")
+        print("=" * 60)
+        
+        entrants = load_lorebook_entrants()
+        if not entrants:
+            print("\nThe heralds have no champions on their lists. The tournament cannot be held.")
+            read_input("\nPress Enter to continue...")
+            return
+        
+        print(f"\n{len(entrants)} champions of the realm have answered the call, among them:")
+        for entrant in sorted(entrants, key=lambda e: -e.elo)[:5]:
+            print(f"- {entrant.name} (Elo {entrant.elo})")
+        
+        print("\nChoose the format:")
+        print("1. Swiss - a few rounds against opponents with the same score")
+        print("2. Round robin - face every champion once")
+        print("3. Knockout - lose and you're out")
+        formats = {"1": "swiss", "2": "round_robin", "3": "knockout"}
+        choice = read_input("\nEnter your choice (1-3, or anything else to withdraw): ").strip()
+        if choice not in formats:
+            return
+        
+        player = Entrant(self.game.player["name"], self.estimate_player_rating(), is_player=True)
+        tournament = Tournament(entrants + [player], formats[choice])
+        
+        while not tournament.is_finished():
+            if player.eliminated:
+                # The remaining rounds are played out without the player
+                print("\nThe tournament continues without you...")
+                while not tournament.is_finished():
+                    tournament.play_round()
+                break
+            
+            round_number = tournament.current_round + 1
+            games = tournament.play_round(lambda opponent: self.play_tournament_game(opponent, round_number))
+            self.show_tournament_round(tournament, round_number, games, player)
+        
+        self.show_tournament_standings(tournament, player)
+    
+    def play_tournament_game(self, opponent, round_number):
+        """Play the player's game of a tournament round and update their record"""
+        get_screen().clear()
+        print("=" * 60)
+        print(f" ROUND {round_number}: YOU vs. {opponent.name.upper()} ")
+        print("=" * 60)
+        print(f"\nYour opponent: {opponent.name} (Elo {opponent.elo})")
+        read_input("\nPress Enter to take your seat...")
+        
+        result = self.chess_manager.play_match(opponent_name=opponent.name, opponent_elo=opponent.elo,
+                                               time_control="90/30")
+        
+        if result == "win":
+            self.game.player["chess_wins"] += 1
+        elif result == "loss":
+            self.game.player["chess_losses"] += 1
+        else:
+            self.game.player["chess_draws"] += 1
+        return result
+    
+    def show_tournament_round(self, tournament, round_number, games, player):
+        """Show the results of a tournament round and the leaders"""
+        get_screen().clear()
+        print("=" * 60)
+        print(f" ROUND {round_number} RESULTS ")
+        print("=" * 60)
+        
+        for game in games:
+            if game["black"] is None:
+                print(f"{game['white'].name} has a bye")
+            else:
+                print(f"{game['white'].name} {game['result']} {game['black'].name}")
+        
+        if tournament.format == "knockout":
+            remaining = [entrant.name for entrant in tournament.entrants if not entrant.eliminated]
+            print(f"\n{len(remaining)} champions remain: {', '.join(remaining)}")
+        else:
+            print("\nLeaders:")
+            for place, (entrant, _) in enumerate(tournament.standings()[:5], 1):
+                marker = " (you)" if entrant is player else ""
+                print(f"{place}. {entrant.name}{marker} - {entrant.points:g} points")
+        
+        read_input("\nPress Enter to continue...")
+    
+    def show_tournament_standings(self, tournament, player):
+        """Show the final standings and reward the winner"""
+        get_screen().clear()
+        print("=" * 60)
+        print(" FINAL STANDINGS ")
+        print("=" * 60)
+        
+        for place, (entrant, tiebreak) in enumerate(tournament.standings(), 1):
+            marker = " (you)" if entrant is player else ""
+            if tournament.format == "knockout":
+                print(f"{place:2d}. {entrant.name}{marker}")
+            else:
+                print(f"{place:2d}. {entrant.name}{marker} - {entrant.points:g} points (tiebreak {tiebreak:g})")
+        
+        winner = tournament.winner()
+        if winner is player:
+            print("\nThe crowd roars! You are the champion of the Grand Tournament of Strategy!")
+            self.game.player["inventory"].append("grand_tournament_trophy")
+            print("You received: Grand Tournament Trophy")
+        else:
+            print(f"\n{winner.name} is crowned champion of the Grand Tournament of Strategy.")
+        
+        read_input("\nPress Enter to continue...")
     
     def show_chess_tip(self):
         """Show a random chess tip"""
-        os.system('cls' if os.name == 'nt' else 'clear')
+        get_screen().clear()
         print("=" * 60)
         print(" CHESS TIP ")
         print("=" * 60)
@@ -627,11 +748,11 @@ class GrandChessRealms:
         tip = self.chess_manager.display_chess_tip()
         print(f"\n{tip}")
         
-        input("\nPress Enter to continue...")
+        read_input("\nPress Enter to continue...")
     
     def handle_dice_roll(self, roll_type):
         """Handle manual dice rolls"""
-        os.system('cls' if os.name == 'nt' else 'clear')
+        get_screen().clear()
         print("=" * 60)
         print(" DICE ROLL ")
         print("=" * 60)
@@ -641,7 +762,7 @@ class GrandChessRealms:
         
         if len(parts) != 2:
             print("\nInvalid roll format. Use 'd20' or '2d6', etc.")
-            input("Press Enter to continue...")
+            read_input("Press Enter to continue...")
             return
         
         num_dice = 1
@@ -655,21 +776,21 @@ class GrandChessRealms:
             sides = int(parts[1])
         except:
             print("\nInvalid number of sides. Try 'd20' or 'd6', etc.")
-            input("Press Enter to continue...")
+            read_input("Press Enter to continue...")
             return
         
         # Perform the roll
         roll = self.mechanics.roll_dice(num_dice, sides)
         
         print(f"\nRolling {num_dice}d{sides}...")
-        time.sleep(1)
+        get_screen().pause(1)
         print(f"Result: {roll}")
         
-        input("\nPress Enter to continue...")
+        read_input("\nPress Enter to continue...")
     
     def save_game(self):
         """Save the current game state"""
-        os.system('cls' if os.name == 'nt' else 'clear')
+        get_screen().clear()
         print("=" * 60)
         print(" SAVE GAME ")
         print("=" * 60)
@@ -677,12 +798,12 @@ class GrandChessRealms:
         # If no name yet, ask for one
         if not self.game.player["name"]:
             print("\nYou need to create a character before saving.")
-            input("Press Enter to continue...")
+            read_input("Press Enter to continue...")
             return
             
         # Get save filename
         default_filename = f"{self.game.player['name']}_save.dat"
-        filename = input(f"\nEnter filename to save as (default: {default_filename}): ").strip()
+        filename = read_input(f"\nEnter filename to save as (default: {default_filename}): ").strip()
         
         if not filename:
             filename = default_filename
@@ -694,11 +815,11 @@ class GrandChessRealms:
         # Call the game's save function
         self.game.save_game(filename)
         
-        input("\nPress Enter to continue...")
+        read_input("\nPress Enter to continue...")
     
     def load_game(self, filename):
         """Load a saved game"""
-        os.system('cls' if os.name == 'nt' else 'clear')
+        get_screen().clear()
         print("=" * 60)
         print(" LOAD GAME ")
         print("=" * 60)
@@ -710,7 +831,7 @@ class GrandChessRealms:
         # Check if the file exists
         if not os.path.exists(filename):
             print(f"\nSave file '{filename}' not found.")
-            input("Press Enter to continue...")
+            read_input("Press Enter to continue...")
             return
         
         # Call the game's load function
@@ -719,7 +840,7 @@ class GrandChessRealms:
         else:
             print("\nError loading game.")
         
-        input("Press Enter to continue...")
+        read_input("Press Enter to continue...")
     
     def run(self):
         """Run the game"""
@@ -748,12 +869,15 @@ class GrandChessRealms:
 # Main entry point
 if __name__ == "__main__":
     try:
+        # All output goes through the screen layer; no shell is spawned to clear the screen
+        get_screen().install()
+        
         # Create and run the game
         game = GrandChessRealms()
         game.run()
     except Exception as e:
         logger.error(f"An error occurred: {e}", exc_info=True)
         print(f"An error occurred: {e}")
-        if input("Show detailed error? (y/n): ").lower().startswith('y'):
+        if read_input("Show detailed error? (y/n): ").lower().startswith('y'):
             import traceback
             traceback.print_exc()
\ No newline at end of file
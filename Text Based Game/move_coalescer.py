@@ -0,0 +1,258 @@
+"""
+Move Coalescer Module for Grand Chess Realms
+A move on the Chessnut Pro arrives as a burst of sensor events: a piece
+lifted, a captured piece taken off, a rook carried around the king, a piece
+nudged and put back. The coalescer sits between the board's events and the
+game's move queue. It holds on to the newest board state until nothing has
+changed for a settle window, drops the states in between, and only then
+releases a move, if the settled board shows a legal one. It also counts how
+many raw events each move took and how much waiting the settling added.
+"""
+
+import time
+import logging
+
+from move_inference import MOVE, AMBIGUOUS, SYNCED
+
+logger = logging.getLogger("MoveCoalescer")
+
+# Seconds the board has to stay unchanged before its state is used
+SETTLE_WINDOW = 0.25
+
+
+class MoveCoalescer:
+    """
+    Settles bursts of board events into single moves.
+    """
+
+    def __init__(self, reactor, inference, release, settle_window=SETTLE_WINDOW):
+        """
+        Initialize the coalescer.
+
+        Args:
+            reactor: Reactor whose thread calls this object and runs its timers
+            inference: MoveInference holding the confirmed position
+            release: Function called with each settled UCI move; returns False
+                if the move can't be taken yet
+            settle_window: Seconds without events before the board counts as settled
+        """
+        self.reactor = reactor
+        self.inference = inference
+        self.release = release
+        self.settle_window = settle_window
+        # Called when the board settles on the confirmed position; returns
+        # True if that was expected (the player caught up with the game)
+        self.on_synced = None
+
+        self._timer = None
+        self._snapshot = None
+        self._legacy_move = None
+        self._held_move = None
+        self._burst_events = 0
+        self._burst_start = None
+        self._last_event_time = None
+
+        self.raw_events = 0
+        self.superseded = 0
+        self.moves_released = 0
+        self.nudges = 0
+        self.syncs = 0
+        self.unsettled = 0
+        self.total_move_events = 0
+        self.total_added_latency = 0.0
+        self.max_added_latency = 0.0
+        self.total_burst_time = 0.0
+
+    def snapshot(self, board_state, event_time=None):
+        """
+        Take a board snapshot; it replaces any snapshot still settling.
+
+        Args:
+            board_state: Board snapshot as reported by the board
+            event_time: time.monotonic() at which the board reported it
+        """
+        self._catch_up(event_time)
+        if self._snapshot is not None:
+            self.superseded += 1
+        self._snapshot = board_state
+        self._legacy_move = None
+        self._event(event_time)
+
+    def move(self, from_square, to_square, event_time=None):
+        """
+        Take a move reported as a from/to pair, by boards that don't send snapshots.
+
+        A piece moved on again before settling becomes one move (e2e3 then
+        e3e4 is e2e4), and a piece put back where it came from is no move.
+
+        Args:
+            from_square: Square name the piece left
+            to_square: Square name the piece arrived on
+            event_time: time.monotonic() at which the board reported it
+        """
+        self._catch_up(event_time)
+        if self._legacy_move is not None:
+            self.superseded += 1
+            previous_from, previous_to = self._legacy_move
+            if previous_to == from_square:
+                from_square = previous_from
+        self._legacy_move = None if from_square == to_square else (from_square, to_square)
+        self._snapshot = None
+        self._event(event_time)
+
+    @property
+    def holding(self):
+        """Whether a settled move is waiting for room in the game's move queue"""
+        return self._held_move is not None
+
+    def release_held(self):
+        """Try the held move again now, e.g. when the game has taken a move"""
+        if self._held_move is not None:
+            if self._timer:
+                self._timer.cancel()
+            self._settled()
+
+    def reset(self):
+        """Drop whatever is settling, e.g. when the game confirms a new position"""
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        self._snapshot = None
+        self._legacy_move = None
+        self._held_move = None
+        self._burst_events = 0
+        self._burst_start = None
+
+    def _catch_up(self, event_time):
+        """
+        Settle the board state an event replaces if the board had already
+        been still for the settle window when the event happened. Events
+        handled late, such as those held back while the game wasn't taking
+        moves, settle by when they happened rather than when they are handled.
+        """
+        if (self._timer is not None and self._held_move is None and event_time is not None and
+                self._last_event_time is not None and event_time - self._last_event_time >= self.settle_window):
+            self._timer.cancel()
+            self._settled()
+
+    def _event(self, event_time):
+        now = time.monotonic()
+        event_time = event_time or now
+        self.raw_events += 1
+        self._burst_events += 1
+        if self._burst_start is None:
+            self._burst_start = event_time
+        self._last_event_time = event_time
+
+        # Every event restarts the settle window
+        if self._timer:
+            self._timer.cancel()
+        self._timer = self.reactor.call_later(max(0.0, event_time + self.settle_window - now), self._settled)
+
+    def _settled(self):
+        """The board has been still for the settle window"""
+        self._timer = None
+
+        if self._held_move is None:
+            uci_move = self._settle()
+            if uci_move is None:
+                return
+            # Events from here on belong to the next move
+            self._held_move = (uci_move, self._burst_events, self._burst_start, self._last_event_time)
+            self._end_burst()
+
+        # The inference has already moved past a settled move, so it is kept
+        # until the game has room for it rather than worked out again
+        uci_move, burst_events, burst_start, last_event_time = self._held_move
+        if not self.release(uci_move):
+            # No room for the move yet; try again after another window
+            self._timer = self.reactor.call_later(self.settle_window, self._settled)
+            return
+        self._held_move = None
+
+        now = time.monotonic()
+        added_latency = now - last_event_time
+        self.moves_released += 1
+        self.total_move_events += burst_events
+        self.total_added_latency += added_latency
+        self.max_added_latency = max(self.max_added_latency, added_latency)
+        self.total_burst_time += now - burst_start
+
+        if self._timer is None and (self._snapshot is not None or self._legacy_move is not None):
+            # The board kept changing while the move waited
+            self._timer = self.reactor.call_later(0, self._settled)
+
+    def _settle(self):
+        """
+        Work out the move the settled board shows.
+
+        Returns:
+            The UCI move, or None if there is none to release
+        """
+        if self._snapshot is not None:
+            try:
+                result = self.inference.observe(self._snapshot)
+            except ValueError as e:
+                logger.warning(f"Ignoring board snapshot: {e}")
+                self._snapshot = None
+                self._end_burst()
+                return None
+            if result.status == MOVE:
+                # The move was made from the confirmed position, so the board got there
+                if self.on_synced:
+                    self.on_synced()
+                self._snapshot = None
+                return result.moves[0].uci()
+            if result.status == AMBIGUOUS and len({(m.from_square, m.to_square) for m in result.moves}) == 1:
+                # A promotion the board can't identify; the game asks for the piece
+                self._snapshot = None
+                return result.moves[0].uci()[:4]
+            if result.status == SYNCED:
+                if self.on_synced and self.on_synced():
+                    self.syncs += 1
+                else:
+                    # Everything was put back: a nudged piece, not a move
+                    self.nudges += 1
+                self._end_burst()
+                return None
+            # Half-made or illegal; keep the burst open for the next event
+            self.unsettled += 1
+            logger.debug(f"Board settled without a legal move ({result.status})")
+            return None
+
+        if self._legacy_move is not None:
+            uci_move = "".join(self._legacy_move)
+            self._legacy_move = None
+            return uci_move
+
+        self.nudges += 1
+        self._end_burst()
+        return None
+
+    def _end_burst(self):
+        self._burst_events = 0
+        self._burst_start = None
+
+    def stats(self):
+        """
+        Get coalescing statistics.
+
+        Returns:
+            Dictionary with event and move counts, the average number of raw
+            events per move, and the average and maximum seconds that settling
+            added after a move's last event
+        """
+        moves = self.moves_released
+        return {
+            "settle_window": self.settle_window,
+            "raw_events": self.raw_events,
+            "superseded_events": self.superseded,
+            "moves_released": moves,
+            "nudges": self.nudges,
+            "syncs": self.syncs,
+            "unsettled": self.unsettled,
+            "avg_events_per_move": self.total_move_events / moves if moves else 0.0,
+            "avg_added_latency": self.total_added_latency / moves if moves else 0.0,
+            "max_added_latency": self.max_added_latency,
+            "avg_move_duration": self.total_burst_time / moves if moves else 0.0,
+        }
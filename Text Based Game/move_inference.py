@@ -0,0 +1,251 @@
+"""
+Move Inference Module for Grand Chess Realms
+Works out which move was played on the Chessnut Pro from the board's own
+snapshots instead of trusting a from/to pair. The last confirmed position is
+kept as 64 squares; each snapshot is compared with it, and the squares that
+changed are looked up in an index of what every legal move changes. The
+index is built once per position, so castling, en passant, captures and
+promotions are all resolved with one lookup per event.
+"""
+
+from collections import OrderedDict, namedtuple
+
+import chess
+import chess.polyglot
+
+# Positions whose move index is kept
+INFERENCE_CACHE_SIZE = 16
+
+# Outcomes of comparing a snapshot with the confirmed position
+SYNCED = "synced"        # The board shows the confirmed position
+MOVE = "move"            # The board shows one legal move played
+AMBIGUOUS = "ambiguous"  # Several legal moves look like this (e.g. promotions on a presence-only board)
+UNCHANGED = "unchanged"  # Same as the last ambiguous snapshot, already reported
+UNKNOWN = "unknown"      # Half-made move or not a legal move
+
+# Outcome of a snapshot: the status, the candidate moves and the changed
+# squares as (square, contents) pairs
+InferenceResult = namedtuple("InferenceResult", ["status", "moves", "changed"])
+
+# Empty and occupied square markers in snapshots; boards that only sense
+# pieces send a "1"/"0" string or True/False
+_EMPTY = {None, "", ".", " ", "0", 0, False}
+_OCCUPIED = {True, 1, "1"}
+
+_index_cache = OrderedDict()
+
+
+def occupancy(board):
+    """
+    Get the contents of every square of a position.
+
+    Args:
+        board: chess.Board or chess.BaseBoard
+
+    Returns:
+        Tuple of 64 piece symbols (None for an empty square), indexed by square (a1 first)
+    """
+    squares = [None] * 64
+    for square, piece in board.piece_map().items():
+        squares[square] = piece.symbol()
+    return tuple(squares)
+
+
+def snapshot_occupancy(board_state):
+    """
+    Read a board snapshot as 64 squares.
+
+    A snapshot can be a FEN (or just its piece placement), 64 squares in
+    reading order (a8 to h8, down to a1) as a string or sequence, a mapping
+    of square names to pieces, or an object with a `fen` or `board`
+    attribute holding one of those; bytes are read as text. Squares may hold
+    piece symbols, or just True/1/"1" when the board only senses whether a
+    square is occupied.
+
+    Args:
+        board_state: The snapshot
+
+    Returns:
+        Tuple of 64 entries indexed by square (a1 first): a piece symbol,
+        True for an occupied square of unknown contents, or None
+
+    Raises:
+        ValueError: If the snapshot can't be read
+    """
+    for attribute in ("fen", "board"):
+        value = getattr(board_state, attribute, None)
+        if value is not None:
+            return snapshot_occupancy(value() if callable(value) else value)
+
+    if isinstance(board_state, (bytes, bytearray)):
+        board_state = board_state.decode()
+
+    if isinstance(board_state, str) and "/" in board_state:
+        return occupancy(chess.BaseBoard(board_state.split(" ")[0]))
+
+    if isinstance(board_state, dict):
+        squares = [None] * 64
+        for name, contents in board_state.items():
+            squares[chess.parse_square(name)] = _square_contents(contents)
+        return tuple(squares)
+
+    if isinstance(board_state, (str, list, tuple)) and len(board_state) == 64:
+        squares = [None] * 64
+        for index, contents in enumerate(board_state):
+            # Reading order: index 0 is a8
+            squares[chess.square(index % 8, 7 - index // 8)] = _square_contents(contents)
+        return tuple(squares)
+
+    raise ValueError(f"Unreadable board snapshot: {board_state!r}")
+
+
+def _square_contents(contents):
+    if isinstance(contents, bytes):
+        contents = contents.decode()
+    if contents in _EMPTY:
+        return None
+    if contents in _OCCUPIED:
+        return True
+    symbol = getattr(contents, "symbol", None)
+    if callable(symbol):
+        return symbol()
+    if isinstance(contents, str) and len(contents) == 1 and contents in "PNBRQKpnbrqk":
+        return contents
+    raise ValueError(f"Unreadable square contents: {contents!r}")
+
+
+def _presence(squares):
+    return tuple(True if contents else None for contents in squares)
+
+
+def move_changes(board, move):
+    """
+    Get the squares a legal move changes.
+
+    Args:
+        board: Position before the move
+        move: Legal move
+
+    Returns:
+        Dictionary mapping each changed square to its new piece symbol, or None if it is emptied
+    """
+    piece = board.piece_at(move.from_square)
+    changes = {move.from_square: None}
+    if move.promotion:
+        changes[move.to_square] = chess.Piece(move.promotion, piece.color).symbol()
+    else:
+        changes[move.to_square] = piece.symbol()
+
+    if board.is_en_passant(move):
+        # The captured pawn is beside the target square
+        changes[chess.square(chess.square_file(move.to_square), chess.square_rank(move.from_square))] = None
+    elif board.is_castling(move):
+        rank = chess.square_rank(move.from_square)
+        kingside = board.is_kingside_castling(move)
+        if board.piece_type_at(move.to_square) == chess.ROOK:
+            # Castling written as king takes rook
+            rook_square = move.to_square
+        else:
+            rook_square = chess.square(7 if kingside else 0, rank)
+        changes = {move.from_square: None, rook_square: None}
+        changes[chess.square(6 if kingside else 2, rank)] = piece.symbol()
+        changes[chess.square(5 if kingside else 3, rank)] = chess.Piece(chess.ROOK, piece.color).symbol()
+    return changes
+
+
+def _move_index(board):
+    """
+    Index of the legal moves of a position by the squares they change,
+    with and without telling pieces apart; cached per position.
+    """
+    key = chess.polyglot.zobrist_hash(board)
+    index = _index_cache.get(key)
+    if index is not None:
+        _index_cache.move_to_end(key)
+        return index
+
+    pieces, presence = {}, {}
+    before = occupancy(board)
+    for move in board.legal_moves:
+        changes = move_changes(board, move)
+        delta = tuple(sorted((square, contents) for square, contents in changes.items()
+                             if before[square] != contents))
+        pieces.setdefault(delta, []).append(move)
+
+        occupied = tuple(sorted((square, True if contents else None) for square, contents in changes.items()
+                                if bool(before[square]) != bool(contents)))
+        presence.setdefault(occupied, []).append(move)
+
+    index = _index_cache[key] = (pieces, presence)
+    if len(_index_cache) > INFERENCE_CACHE_SIZE:
+        _index_cache.popitem(last=False)
+    return index
+
+
+class MoveInference:
+    """
+    Infers moves from board snapshots against the last confirmed position.
+    """
+
+    def __init__(self, board=None):
+        """
+        Initialize the inference.
+
+        Args:
+            board: Confirmed position, defaults to the starting position
+        """
+        self.reset(board or chess.Board())
+
+    def reset(self, board):
+        """
+        Confirm a position, e.g. after the game has played a move the
+        physical board doesn't show yet.
+
+        Args:
+            board: The position (chess.Board)
+        """
+        self.board = board.copy(stack=False)
+        self.confirmed = occupancy(self.board)
+        self._reported = None
+
+    def observe(self, board_state):
+        """
+        Compare a snapshot with the confirmed position.
+
+        A single legal move becomes the new confirmed position, so the next
+        snapshot is compared with the board after it.
+
+        Args:
+            board_state: Board snapshot in any form snapshot_occupancy() reads
+
+        Returns:
+            An InferenceResult
+
+        Raises:
+            ValueError: If the snapshot can't be read
+        """
+        squares = snapshot_occupancy(board_state)
+        presence_only = all(contents in (None, True) for contents in squares)
+        confirmed = _presence(self.confirmed) if presence_only else self.confirmed
+
+        changed = tuple((square, squares[square]) for square in range(64) if squares[square] != confirmed[square])
+        if not changed:
+            self._reported = None
+            return InferenceResult(SYNCED, [], changed)
+
+        pieces, presence = _move_index(self.board)
+        moves = (presence if presence_only else pieces).get(changed)
+        if not moves:
+            return InferenceResult(UNKNOWN, [], changed)
+
+        if len(moves) == 1:
+            self.board.push(moves[0])
+            self.board = self.board.copy(stack=False)
+            self.confirmed = occupancy(self.board)
+            self._reported = None
+            return InferenceResult(MOVE, list(moves), changed)
+
+        if changed == self._reported:
+            return InferenceResult(UNCHANGED, list(moves), changed)
+        self._reported = changed
+        return InferenceResult(AMBIGUOUS, list(moves), changed)
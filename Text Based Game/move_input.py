@@ -0,0 +1,251 @@
+"""
+Move Input Module for Grand Chess Realms
+Turns what the player types (or what the Chessnut Pro board reports) into a
+legal move. All notations of every legal move are indexed once per position,
+so SAN (Nf3, exd8=Q+), UCI (g1f3, e7e8q), long algebraic (Ng1-f3) and
+castling written as O-O, 0-0 or e1h1 are all a single lookup. Incomplete
+input is answered with the moves it could be completed to.
+"""
+
+import re
+from collections import OrderedDict
+from typing import List
+
+import chess
+import chess.polyglot
+
+# Positions whose move index is kept
+RESOLVER_CACHE_SIZE = 16
+
+# Most completions listed in a message
+MAX_SUGGESTIONS = 8
+
+FORMAT_HELP = "Please use algebraic notation (e.g., Nf3, exd5) or UCI notation (e.g., g1f3)."
+
+# Check, capture, annotation and separator characters that don't change the move
+_DECORATIONS = str.maketrans("", "", "x:+#!?=-() ")
+_CASTLING = re.compile(r"^[0Oo]-?[0Oo](-?[0Oo])?[+#!?]*$")
+_EN_PASSANT = re.compile(r"\s*e\.?p\.?$")
+_SQUARE = re.compile(r"[a-h][1-8]")
+
+
+def normalize(text):
+    """
+    Strip the decorations from move input.
+
+    Args:
+        text: Move as typed, e.g. "Nxe5+" or "0-0-0"
+
+    Returns:
+        The move without checks, captures, separators and annotations,
+        e.g. "Ne5" or "OOO"
+    """
+    text = text.strip()
+    if _CASTLING.match(text):
+        return "OOO" if len(re.findall("[0Oo]", text)) == 3 else "OO"
+    return _EN_PASSANT.sub("", text).translate(_DECORATIONS)
+
+
+class AmbiguousMoveError(ValueError):
+    """Raised when move input matches more than one legal move"""
+
+    def __init__(self, message, candidates):
+        super().__init__(message)
+        self.candidates = candidates
+
+
+class MoveResolver:
+    """
+    Index of every way to write each legal move in one position.
+    """
+
+    _cache = OrderedDict()
+
+    def __init__(self, board: chess.Board):
+        """
+        Index the legal moves of a position.
+
+        Args:
+            board: The position
+        """
+        self.board = board.copy(stack=False)
+        self.san = {}
+        self._keys = []
+        self._exact = {}
+        self._folded = {}
+
+        for move in self.board.legal_moves:
+            # SAN is the expensive notation, so it is generated once per move
+            san = self.board.san(move)
+            self.san[move] = san
+            for key in self._notations(move, san):
+                self._add(key, move)
+
+    @classmethod
+    def for_board(cls, board: chess.Board) -> "MoveResolver":
+        """
+        Get the resolver for a position, reusing the index if the position
+        was seen recently.
+
+        Args:
+            board: The position
+
+        Returns:
+            A MoveResolver
+        """
+        key = chess.polyglot.zobrist_hash(board)
+        resolver = cls._cache.get(key)
+        if resolver is None:
+            resolver = cls(board)
+            cls._cache[key] = resolver
+            if len(cls._cache) > RESOLVER_CACHE_SIZE:
+                cls._cache.popitem(last=False)
+        else:
+            cls._cache.move_to_end(key)
+        return resolver
+
+    def _notations(self, move, san):
+        """Every normalized way to write a move"""
+        board = self.board
+        keys = {normalize(san), move.uci(), board.uci(move, chess960=True)}
+
+        from_name = chess.square_name(move.from_square)
+        to_name = chess.square_name(move.to_square)
+        piece = board.piece_type_at(move.from_square)
+        promotion = chess.piece_symbol(move.promotion).upper() if move.promotion else ""
+
+        if piece == chess.PAWN:
+            # Long algebraic (e7e8Q); pawn captures by file (ed5) come from the SAN
+            keys.add(from_name + to_name + promotion)
+            if move.promotion:
+                # Without the piece, these match all four promotions
+                keys.update({move.uci()[:4], to_name})
+                if board.is_capture(move):
+                    keys.add(from_name[0] + to_name)
+        else:
+            letter = chess.piece_symbol(piece).upper()
+            # Over-disambiguated moves like Ngf3, N1f3 or Ng1-f3
+            keys.update({letter + to_name, letter + from_name[0] + to_name,
+                         letter + from_name[1] + to_name, letter + from_name + to_name})
+            if board.is_castling(move):
+                keys.add("K" + chess.square_name(chess.square(6 if board.is_kingside_castling(move) else 2,
+                                                              chess.square_rank(move.from_square))))
+        return keys
+
+    def _add(self, key, move):
+        self._keys.append((key, move))
+        for index, name in ((self._exact, key), (self._folded, key.lower())):
+            moves = index.setdefault(name, [])
+            if move not in moves:
+                moves.append(move)
+
+    def matches(self, text: str) -> List[chess.Move]:
+        """
+        Get the legal moves that the input writes out in full.
+
+        Upper and lower case are only told apart where it matters (b4 is a
+        pawn move, Bb4 a bishop move); otherwise nf3 is as good as Nf3.
+
+        Args:
+            text: Move input
+
+        Returns:
+            List of matching moves (empty, one, or several if ambiguous)
+        """
+        key = normalize(text)
+        if not key:
+            return []
+        return list(self._exact.get(key) or self._folded.get(key.lower(), []))
+
+    def completions(self, text: str) -> List[str]:
+        """
+        Get the moves that the input is the beginning of.
+
+        Args:
+            text: Partial move input, e.g. "N" or "e7e"
+
+        Returns:
+            SAN of every matching move, sorted
+        """
+        key = normalize(text)
+        if not key:
+            return []
+        moves = {move for name, move in self._keys if name.startswith(key)}
+        if not moves:
+            folded = key.lower()
+            moves = {move for name, move in self._keys if name.lower().startswith(folded)}
+        return sorted(self.san[move] for move in moves)
+
+    def resolve(self, text: str) -> chess.Move:
+        """
+        Convert move input to a legal move.
+
+        Args:
+            text: Move in SAN, UCI or long algebraic notation
+
+        Returns:
+            The legal chess.Move
+
+        Raises:
+            AmbiguousMoveError: If the input matches several moves; the
+                candidates are attached
+            ValueError: If the input is not a legal move, with a message for the player
+        """
+        moves = self.matches(text)
+        if len(moves) == 1:
+            return moves[0]
+        if moves:
+            raise AmbiguousMoveError(f"'{text.strip()}' is ambiguous. Did you mean: "
+                                     f"{self._suggest(moves)}?", moves)
+
+        completions = self.completions(text)
+        if completions:
+            candidates = [move for move, san in self.san.items() if san in completions]
+            raise AmbiguousMoveError(f"'{text.strip()}' is incomplete. Did you mean: "
+                                     f"{self._suggest(candidates)}?", candidates)
+
+        key = normalize(text)
+        if key in ("OO", "OOO") or _SQUARE.search(key):
+            raise ValueError("Illegal move. Try again.")
+        raise ValueError(f"Invalid format. {FORMAT_HELP}")
+
+    def _suggest(self, moves):
+        names = sorted(self.san[move] for move in moves)
+        if len(names) > MAX_SUGGESTIONS:
+            names = names[:MAX_SUGGESTIONS] + ["..."]
+        return ", ".join(names)
+
+
+def resolve_move(board: chess.Board, text: str) -> chess.Move:
+    """
+    Convert move input to a legal move in a position.
+
+    Args:
+        board: Current position
+        text: Move in SAN, UCI or long algebraic notation
+
+    Returns:
+        The legal chess.Move
+
+    Raises:
+        AmbiguousMoveError: If the input matches several moves
+        ValueError: If the input is not a legal move, with a message for the player
+    """
+    return MoveResolver.for_board(board).resolve(text)
+
+
+def promotion_candidates(error: AmbiguousMoveError):
+    """
+    Check whether an ambiguous move only lacks its promotion piece.
+
+    Args:
+        error: The AmbiguousMoveError from resolve()
+
+    Returns:
+        Dictionary mapping promotion letters to the candidate moves, or None
+        if the candidates differ in more than the promotion piece
+    """
+    squares = {(move.from_square, move.to_square) for move in error.candidates}
+    if len(squares) != 1 or any(move.promotion is None for move in error.candidates):
+        return None
+    return {chess.piece_symbol(move.promotion): move for move in error.candidates}
@@ -0,0 +1,189 @@
+"""
+Opening Book Module for Grand Chess Realms
+Plays the first moves of a match from Polyglot opening books instead of
+asking the engine. Books are memory-mapped and probed by binary search, so a
+book move costs microseconds. Each NPC gets a personal weighting of the book
+moves, which gives them a recognisable repertoire.
+"""
+
+import os
+import zlib
+import random
+import logging
+import threading
+from typing import Optional
+
+import chess
+import chess.polyglot
+
+logger = logging.getLogger("OpeningBook")
+
+# Directory searched for Polyglot .bin books
+BOOKS_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "books")
+
+# Book used when an NPC has no repertoire of their own
+DEFAULT_BOOK = "default.bin"
+
+# Plies (half-moves) after which the book is no longer consulted
+DEFAULT_MAX_BOOK_PLIES = 12
+
+
+class OpeningBook:
+    """A single Polyglot book"""
+
+    def __init__(self, path: str):
+        """
+        Open a Polyglot book.
+
+        Args:
+            path: Path to the .bin file
+        """
+        self.path = path
+        self.reader = chess.polyglot.open_reader(path)
+        self.hits = 0
+        self.misses = 0
+
+    def choose_move(self, board: chess.Board, personality: Optional[str] = None,
+                    rng: Optional[random.Random] = None) -> Optional[chess.Move]:
+        """
+        Pick a book move for a position.
+
+        Args:
+            board: Position to probe
+            personality: Name whose personal preferences skew the book weights
+            rng: Random number generator to use
+
+        Returns:
+            A legal book move, or None if the position is not in the book
+        """
+        entries = list(self.reader.find_all(board))
+        if not entries:
+            self.misses += 1
+            return None
+
+        weights = [entry.weight * self._preference(personality, entry) for entry in entries]
+        choice = (rng or random).choices(entries, weights=weights)[0]
+        self.hits += 1
+        return choice.move
+
+    def _preference(self, personality, entry):
+        """
+        Stable per-personality multiplier (0.25-1.75) for a book entry, so the
+        same NPC keeps favouring the same lines from game to game.
+        """
+        if not personality:
+            return 1.0
+        digest = zlib.crc32(f"{personality}:{entry.key:016x}:{entry.raw_move}".encode())
+        return 0.25 + 1.5 * (digest / 0xFFFFFFFF)
+
+    def close(self):
+        """Close the memory-mapped book"""
+        self.reader.close()
+
+
+class BookLibrary:
+    """
+    The opening books available to the game, opened on first use.
+    """
+
+    def __init__(self, directory: str = BOOKS_DIRECTORY, default_book: str = DEFAULT_BOOK):
+        """
+        Initialize the library without opening any books.
+
+        Args:
+            directory: Directory containing .bin books
+            default_book: File name of the book used when no repertoire is given
+        """
+        self.directory = directory
+        self.default_book = default_book
+        self._books = {}
+        self._lock = threading.Lock()
+
+    def get_book(self, repertoire: Optional[str] = None) -> Optional[OpeningBook]:
+        """
+        Get a book by file name, falling back to the default book.
+
+        Args:
+            repertoire: File name of an NPC's personal book, or None
+
+        Returns:
+            The OpeningBook, or None if no book is installed
+        """
+        for name in (repertoire, self.default_book):
+            if not name:
+                continue
+            book = self._open(name)
+            if book:
+                return book
+        return None
+
+    def _open(self, name):
+        """Open a book once and cache it (None if it doesn't exist)"""
+        with self._lock:
+            if name not in self._books:
+                path = name if os.path.isabs(name) else os.path.join(self.directory, name)
+                book = None
+                if os.path.isfile(path):
+                    try:
+                        book = OpeningBook(path)
+                        logger.info(f"Opened opening book: {path}")
+                    except (OSError, ValueError) as e:
+                        logger.warning(f"Could not open opening book {path}: {e}")
+                self._books[name] = book
+            return self._books[name]
+
+    def close(self):
+        """Close all open books"""
+        with self._lock:
+            for book in self._books.values():
+                if book:
+                    book.close()
+            self._books.clear()
+
+
+class BookSession:
+    """
+    Book state for one match: stays in the book until the first miss or the
+    maximum book depth, whichever comes first.
+    """
+
+    def __init__(self, book: Optional[OpeningBook], personality: Optional[str] = None,
+                 max_plies: int = DEFAULT_MAX_BOOK_PLIES):
+        """
+        Initialize the session.
+
+        Args:
+            book: The book to play from, or None for no book
+            personality: Name whose preferences skew the book weights
+            max_plies: Plies after which the book is no longer consulted
+        """
+        self.book = book
+        self.personality = personality
+        self.max_plies = max_plies
+        self.in_book = book is not None
+        self.moves_played = 0
+
+    def probe(self, board: chess.Board) -> Optional[chess.Move]:
+        """
+        Get a book move for the position, if still in book.
+
+        Args:
+            board: Current position
+
+        Returns:
+            A book move, or None once the game has left the book
+        """
+        if not self.in_book:
+            return None
+        if board.ply() >= self.max_plies:
+            self.in_book = False
+            return None
+
+        move = self.book.choose_move(board, self.personality)
+        if move is None or move not in board.legal_moves:
+            # Don't drift back into the book by transposition
+            self.in_book = False
+            return None
+
+        self.moves_played += 1
+        return move
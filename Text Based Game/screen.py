@@ -0,0 +1,232 @@
+"""
+Screen Module for Grand Chess Realms
+The single output layer of the game. Clearing the screen is an ANSI
+sequence instead of a `cls`/`clear` subprocess, and everything printed for a
+new screen is collected in a frame buffer and written to the terminal in one
+go once the screen is complete (at the next prompt or pause). Fixed regions
+such as the live clock are only redrawn when their contents change. When
+output isn't a terminal, clearing is skipped, and in headless mode nothing
+is written at all.
+"""
+
+import os
+import sys
+import time
+import threading
+from contextlib import contextmanager
+
+# Output modes
+ANSI = "ansi"          # Terminal: clear, home and cursor movements
+PLAIN = "plain"        # Pipe or dumb terminal: text only
+HEADLESS = "headless"  # No output at all, e.g. for automated runs
+
+# Environment variable that forces a mode
+SCREEN_MODE_ENV = "GCR_SCREEN"
+
+CLEAR_SCREEN = "\033[H\033[2J"
+CLEAR_LINE = "\033[K"
+SAVE_CURSOR = "\0337"
+RESTORE_CURSOR = "\0338"
+
+_screen = None
+_screen_lock = threading.Lock()
+
+
+def supports_ansi(stream):
+    """
+    Check whether a stream is a terminal that understands ANSI sequences.
+
+    Args:
+        stream: Output stream
+
+    Returns:
+        True if cursor movements can be used
+    """
+    if not hasattr(stream, "isatty") or not stream.isatty():
+        return False
+    if os.environ.get("TERM") == "dumb":
+        return False
+    if os.name == "nt":
+        return _enable_windows_ansi()
+    return True
+
+
+def _enable_windows_ansi():
+    """Switch the Windows console to VT mode without spawning a process"""
+    try:
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.GetStdHandle(-11)  # STD_OUTPUT_HANDLE
+        mode = ctypes.c_uint32()
+        if not kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+            return False
+        # ENABLE_VIRTUAL_TERMINAL_PROCESSING
+        return bool(kernel32.SetConsoleMode(handle, mode.value | 0x0004))
+    except (AttributeError, OSError):
+        return False
+
+
+class Screen:
+    """
+    Buffered, file-like terminal output. Installed as sys.stdout, so the
+    game's print() calls go through it.
+    """
+
+    def __init__(self, stream=None, mode=None):
+        """
+        Initialize the screen.
+
+        Args:
+            stream: Terminal stream to write to, defaults to sys.stdout
+            mode: ANSI, PLAIN or HEADLESS; detected from the stream (and the
+                GCR_SCREEN environment variable) if None
+        """
+        self.stream = stream or sys.stdout
+        mode = mode or os.environ.get(SCREEN_MODE_ENV)
+        if mode not in (ANSI, PLAIN, HEADLESS):
+            mode = ANSI if supports_ansi(self.stream) else PLAIN
+        self.mode = mode
+
+        self._buffer = []
+        self._lock = threading.RLock()
+        # While a frame is being composed, nothing is written until it is complete
+        self._composing = False
+
+        # Fixed regions: name -> [line, column, text, dirty]
+        self._regions = {}
+
+        self.writes = 0
+        self.bytes_written = 0
+
+    # -- File interface -----------------------------------------------------
+
+    def write(self, text):
+        """Buffer text; outside a frame, complete lines are written right away"""
+        if self.mode == HEADLESS:
+            return len(text)
+        with self._lock:
+            self._buffer.append(text)
+            if not self._composing and "\n" in text:
+                self._write_out()
+        return len(text)
+
+    def flush(self):
+        """Write everything buffered in one call; ends the frame being composed"""
+        with self._lock:
+            self._composing = False
+            self._write_out()
+
+    def isatty(self):
+        return self.mode == ANSI
+
+    def __getattr__(self, name):
+        # encoding, fileno and the rest come from the real stream
+        return getattr(self.stream, name)
+
+    def _write_out(self):
+        if not self._buffer:
+            return
+        text = "".join(self._buffer)
+        self._buffer = []
+        self.stream.write(text)
+        self.stream.flush()
+        self.writes += 1
+        self.bytes_written += len(text)
+
+    # -- Screens ------------------------------------------------------------
+
+    def clear(self):
+        """
+        Start a new screen. The clear is sent together with the new screen's
+        contents at the next prompt, pause or flush.
+        """
+        if self.mode == HEADLESS:
+            return
+        with self._lock:
+            if self.mode == ANSI:
+                # Whatever hasn't been written yet would be cleared anyway
+                self._buffer = [CLEAR_SCREEN]
+                self._composing = True
+                for region in self._regions.values():
+                    region[3] = True
+            else:
+                self._write_out()
+
+    @contextmanager
+    def frame(self):
+        """Clear the screen and write everything printed in the block at once"""
+        self.clear()
+        try:
+            yield self
+        finally:
+            self.flush()
+
+    def pause(self, seconds):
+        """Show what has been printed so far, then wait"""
+        self.flush()
+        time.sleep(seconds)
+
+    # -- Regions ------------------------------------------------------------
+
+    def define_region(self, name, line, column=1):
+        """
+        Define a fixed one-line region of the screen.
+
+        Args:
+            name: Region name
+            line: Screen line (1-based)
+            column: Screen column (1-based)
+        """
+        with self._lock:
+            self._regions[name] = [line, column, "", False]
+
+    def update_region(self, name, text):
+        """Set a region's text; it is redrawn on the next refresh() only if it changed"""
+        with self._lock:
+            region = self._regions[name]
+            if region[2] != text:
+                region[2] = text
+                region[3] = True
+
+    def refresh(self):
+        """
+        Redraw the regions that changed, leaving the cursor (and any
+        half-typed input) where it is.
+        """
+        if self.mode != ANSI:
+            return
+        with self._lock:
+            if self._composing:
+                # Drawn once the new screen is out
+                return
+            parts = []
+            for region in self._regions.values():
+                line, column, text, dirty = region
+                if dirty:
+                    parts.append(f"\033[{line};{column}H{text}{CLEAR_LINE}")
+                    region[3] = False
+            if parts:
+                self._buffer.append(SAVE_CURSOR + "".join(parts) + RESTORE_CURSOR)
+                self._write_out()
+
+    def install(self):
+        """Route print() through this screen"""
+        if sys.stdout is not self:
+            sys.stdout = self
+        return self
+
+
+def get_screen():
+    """
+    Get the game's screen, creating it on first use.
+
+    Returns:
+        The shared Screen
+    """
+    global _screen
+    with _screen_lock:
+        if _screen is None:
+            stream = sys.stdout
+            # Don't wrap a screen in another screen
+            _screen = stream if isinstance(stream, Screen) else Screen(stream)
+        return _screen
@@ -0,0 +1,235 @@
+"""
+Tablebase Module for Grand Chess Realms
+Resolves endgames with few pieces from Syzygy tablebases instead of searching
+them. Probes are cached in memory, so replaying the same endgame position (or
+ranking all moves of a position) only touches the table files once.
+"""
+
+import os
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import chess
+import chess.engine
+import chess.polyglot
+import chess.syzygy
+
+logger = logging.getLogger("Tablebase")
+
+# Directory searched for Syzygy .rtbw/.rtbz files
+TABLEBASE_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "syzygy")
+
+# Positions with more pieces than this are never probed
+MAX_TABLEBASE_PIECES = 6
+
+# Number of probe results kept in memory
+DEFAULT_CACHE_SIZE = 100000
+
+# Centipawn score reported for a tablebase win, reduced by the distance to zeroing
+TABLEBASE_WIN_SCORE = 20000
+
+
+class TablebaseProber:
+    """
+    Syzygy tablebases with an LRU cache over WDL/DTZ probes.
+
+    WDL values are from the side to move's point of view: 2 win, 1 win that
+    the fifty-move rule turns into a draw, 0 draw, -1 saved loss, -2 loss.
+    """
+
+    def __init__(self, directory: str = TABLEBASE_DIRECTORY, cache_size: int = DEFAULT_CACHE_SIZE):
+        """
+        Initialize the prober without opening any tables.
+
+        Args:
+            directory: Directory containing the Syzygy tables
+            cache_size: Maximum number of cached probe results
+        """
+        self.directory = directory
+        self.cache_size = cache_size
+
+        self.hits = 0
+        self.misses = 0
+
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._tablebase = None
+        self._max_pieces = 0
+        self._opened = False
+
+    def _open(self):
+        """Open the tables on first use (None if there are none)"""
+        with self._lock:
+            if not self._opened:
+                self._opened = True
+                if os.path.isdir(self.directory):
+                    try:
+                        tablebase = chess.syzygy.open_tablebase(self.directory)
+                    except OSError as e:
+                        logger.warning(f"Could not open tablebases in {self.directory}: {e}")
+                    else:
+                        if tablebase.wdl:
+                            # Table names look like "KQvKR": one letter per piece
+                            loaded = max(len(name) - 1 for name in tablebase.wdl)
+                            self._max_pieces = min(MAX_TABLEBASE_PIECES, loaded)
+                            self._tablebase = tablebase
+                            logger.info(f"Opened {len(tablebase.wdl)} tablebases from {self.directory}")
+                        else:
+                            tablebase.close()
+            return self._tablebase
+
+    def is_available(self) -> bool:
+        """Check whether any tables are installed"""
+        return self._open() is not None
+
+    def covers(self, board: chess.Board) -> bool:
+        """Check whether a position can be probed"""
+        return (self.is_available()
+                and chess.popcount(board.occupied) <= self._max_pieces
+                and not board.castling_rights)
+
+    def probe(self, board: chess.Board) -> Optional[Tuple[int, int]]:
+        """
+        Look up a position.
+
+        Args:
+            board: Position to probe
+
+        Returns:
+            Tuple of (WDL, DTZ) for the side to move, or None if the position
+            is not covered by the installed tables
+        """
+        if not self.covers(board):
+            return None
+
+        key = chess.polyglot.zobrist_hash(board)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return self._cache[key]
+            self.misses += 1
+
+        try:
+            result = (self._tablebase.probe_wdl(board), self._tablebase.probe_dtz(board))
+        except KeyError:
+            # MissingTableError: this material combination isn't installed
+            result = None
+
+        with self._lock:
+            self._cache[key] = result
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return result
+
+    def best_move(self, board: chess.Board) -> Optional[chess.Move]:
+        """
+        Pick the move with the best tablebase result.
+
+        Winning sides mate, then prefer moves that reset the fifty-move
+        counter, then the shortest way to the next reset. Losing sides
+        prolong the game for as long as possible.
+
+        Args:
+            board: Position to play from
+
+        Returns:
+            The best legal move, or None if the position is not covered
+        """
+        if not self.covers(board) or self.probe(board) is None:
+            return None
+
+        best_key, best = None, None
+        for move in board.legal_moves:
+            zeroing = board.is_zeroing(move)
+            board.push(move)
+            try:
+                if board.is_checkmate():
+                    return move
+                probed = self.probe(board)
+            finally:
+                board.pop()
+            if probed is None:
+                return None
+
+            child_wdl, child_dtz = probed
+            result = -child_wdl
+            if result > 0:
+                key = (result, zeroing, -abs(child_dtz))
+            elif result < 0:
+                key = (result, not zeroing, abs(child_dtz))
+            else:
+                key = (result, False, 0)
+
+            if best_key is None or key > best_key:
+                best_key, best = key, move
+        return best
+
+    def evaluate(self, board: chess.Board) -> Tuple[Optional[chess.engine.Score], Optional[chess.Move]]:
+        """
+        Evaluate a position from the tables.
+
+        Args:
+            board: Position to evaluate
+
+        Returns:
+            Tuple of (score from White's point of view, best move), or
+            (None, None) if the position is not covered
+        """
+        probed = self.probe(board)
+        if probed is None:
+            return None, None
+
+        wdl, dtz = probed
+        if wdl == 2:
+            score = chess.engine.Cp(TABLEBASE_WIN_SCORE - abs(dtz))
+        elif wdl == -2:
+            score = chess.engine.Cp(-TABLEBASE_WIN_SCORE + abs(dtz))
+        else:
+            score = chess.engine.Cp(0)
+
+        best_move = self.best_move(board) if not board.is_game_over() else None
+        return chess.engine.PovScore(score, board.turn).white(), best_move
+
+    def adjudicate(self, board: chess.Board) -> Optional[str]:
+        """
+        Decide a match whose outcome is already fixed by the tables.
+
+        Args:
+            board: Current position
+
+        Returns:
+            "1-0", "0-1" or "1/2-1/2", or None if the position is not covered
+        """
+        probed = self.probe(board)
+        if probed is None:
+            return None
+
+        wdl = probed[0]
+        if abs(wdl) < 2:
+            # Cursed wins and blessed losses are drawn by the fifty-move rule
+            return "1/2-1/2"
+        winner = board.turn if wdl > 0 else not board.turn
+        return "1-0" if winner == chess.WHITE else "0-1"
+
+    def stats(self):
+        """Get cache statistics"""
+        with self._lock:
+            probes = self.hits + self.misses
+            return {
+                "cached": len(self._cache),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / probes if probes else 0.0,
+            }
+
+    def close(self):
+        """Close the table files and drop the cache"""
+        with self._lock:
+            if self._tablebase is not None:
+                self._tablebase.close()
+            self._tablebase = None
+            self._opened = False
+            self._cache.clear()
@@ -0,0 +1,118 @@
+"""
+Tests for the move coalescer, run with pytest from this directory.
+"""
+
+import heapq
+import itertools
+
+import chess
+
+from move_coalescer import MoveCoalescer
+from move_inference import MoveInference
+
+
+class ManualReactor:
+    """Runs the coalescer's timers when told to, in due order"""
+
+    def __init__(self):
+        self.timers = []
+        self._order = itertools.count()
+
+    def call_later(self, delay, callback):
+        timer = [delay, next(self._order), callback]
+        heapq.heappush(self.timers, timer)
+        return ManualTimer(timer)
+
+
+class ManualTimer:
+    def __init__(self, timer):
+        self.timer = timer
+
+    def cancel(self):
+        self.timer[2] = None
+
+
+def run_timers(reactor, limit=10):
+    """Fire up to limit due timers"""
+    for _ in range(limit):
+        if not reactor.timers:
+            return
+        _, _, callback = heapq.heappop(reactor.timers)
+        if callback:
+            callback()
+
+
+def after(board, uci):
+    board = board.copy()
+    board.push_uci(uci)
+    return board.board_fen()
+
+
+def test_move_released_once_room_frees_up():
+    reactor = ManualReactor()
+    released = []
+    answers = iter([False, True])
+
+    def release(uci_move):
+        if next(answers):
+            released.append(uci_move)
+            return True
+        return False
+
+    coalescer = MoveCoalescer(reactor, MoveInference(), release)
+    coalescer.snapshot(after(chess.Board(), "e2e4"))
+    run_timers(reactor)
+
+    assert released == ["e2e4"]
+    stats = coalescer.stats()
+    assert stats["moves_released"] == 1
+    assert stats["nudges"] == 0
+
+
+def test_board_changing_while_move_waits():
+    reactor = ManualReactor()
+    released = []
+    room = [False]
+
+    def release(uci_move):
+        if room[0]:
+            released.append(uci_move)
+        return room[0]
+
+    board = chess.Board()
+    coalescer = MoveCoalescer(reactor, MoveInference(board), release)
+    coalescer.snapshot(after(board, "e2e4"))
+    run_timers(reactor, limit=1)
+    board.push_uci("e2e4")
+    coalescer.snapshot(after(board, "e7e5"))
+    room[0] = True
+    run_timers(reactor)
+
+    assert released == ["e2e4", "e7e5"]
+    assert coalescer.stats()["moves_released"] == 2
+
+
+def test_nudged_piece_is_not_a_move():
+    reactor = ManualReactor()
+    released = []
+    coalescer = MoveCoalescer(reactor, MoveInference(), lambda uci_move: released.append(uci_move) or True)
+    coalescer.snapshot(chess.Board().board_fen())
+    run_timers(reactor)
+
+    assert released == []
+    assert coalescer.stats()["nudges"] == 1
+
+
+def test_late_events_settle_by_when_they_happened():
+    reactor = ManualReactor()
+    released = []
+    board = chess.Board()
+    coalescer = MoveCoalescer(reactor, MoveInference(board), lambda uci_move: released.append(uci_move) or True)
+
+    # Two moves' events held back and handled together, a second apart
+    coalescer.snapshot(after(board, "e2e4"), event_time=100.0)
+    board.push_uci("e2e4")
+    coalescer.snapshot(after(board, "e7e5"), event_time=101.0)
+    run_timers(reactor)
+
+    assert released == ["e2e4", "e7e5"]
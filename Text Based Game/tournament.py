@@ -0,0 +1,387 @@
+"""
+Tournament Module for Grand Chess Realms
+Runs the Grand Tournament of Strategy: round-robin, Swiss and knockout events
+between the champions of the realm. Games between NPCs are decided by the
+batched match simulator, a whole round at once; only the player's own games
+are played at the board.
+"""
+
+import os
+import math
+import json
+import logging
+from typing import Callable, List, Optional
+
+from match_simulator import simulate_matches, WIN, DRAW
+
+logger = logging.getLogger("Tournament")
+
+# Lorebook whose npc_characters are the tournament's champions
+LOREBOOK_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                             "Chess Lorebook JSON.ts")
+
+FORMATS = ("swiss", "round_robin", "knockout")
+
+# Rating points the first move is worth in simulated games
+WHITE_ADVANTAGE = 35
+
+# Extra games played after a drawn knockout game before the higher seed advances
+KNOCKOUT_PLAYOFFS = 2
+
+RESULT_POINTS = {"1-0": (1.0, 0.0), "0-1": (0.0, 1.0), "1/2-1/2": (0.5, 0.5)}
+
+
+class Entrant:
+    """A tournament participant and their running record"""
+
+    def __init__(self, name, elo, is_player=False, faction=None):
+        """
+        Initialize the entrant.
+
+        Args:
+            name: Display name
+            elo: Rating, used for seeding and simulated games
+            is_player: Whether this is the human player
+            faction: Optional faction from the lorebook
+        """
+        self.name = name
+        self.elo = elo
+        self.is_player = is_player
+        self.faction = faction
+
+        self.seed = None
+        self.points = 0.0
+        self.opponents = []
+        self.colors = []
+        self.had_bye = False
+        self.eliminated = False
+
+    def color_balance(self):
+        """Games with White minus games with Black"""
+        return self.colors.count("w") - self.colors.count("b")
+
+
+def load_lorebook_entrants(path=LOREBOOK_PATH):
+    """
+    Read the champions of the realm from the lorebook.
+
+    Args:
+        path: Path to the lorebook JSON
+
+    Returns:
+        List of Entrants, empty if the lorebook can't be read
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            lorebook = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not read lorebook {path}: {e}")
+        return []
+
+    return [Entrant(npc["name"], npc["elo"], faction=npc.get("faction"))
+            for npc in lorebook.get("npc_characters", []) if "elo" in npc]
+
+
+class Tournament:
+    """
+    A round-robin, Swiss or knockout tournament.
+
+    The player (if entered) always plays White, matching the game's chess
+    matches; colours are balanced among the other entrants.
+    """
+
+    def __init__(self, entrants: List[Entrant], format: str = "swiss", rounds: Optional[int] = None):
+        """
+        Initialize the tournament and seed the entrants by rating.
+
+        Args:
+            entrants: The participants
+            format: "swiss", "round_robin" or "knockout"
+            rounds: Number of Swiss rounds. Defaults to enough rounds to find a
+                clear winner. Ignored by the other formats.
+        """
+        if format not in FORMATS:
+            raise ValueError(f"Unknown tournament format: {format}")
+        if len(entrants) < 2:
+            raise ValueError("A tournament needs at least two entrants")
+
+        self.format = format
+        self.entrants = sorted(entrants, key=lambda e: -e.elo)
+        for seed, entrant in enumerate(self.entrants, 1):
+            entrant.seed = seed
+
+        count = len(self.entrants)
+        if format == "round_robin":
+            self.total_rounds = count - 1 if count % 2 == 0 else count
+        elif format == "knockout":
+            self.total_rounds = math.ceil(math.log2(count))
+        else:
+            self.total_rounds = rounds or math.ceil(math.log2(count)) + 1
+
+        self.rounds = []
+        self._schedule = self._round_robin_schedule() if format == "round_robin" else None
+        self._bracket = self._knockout_bracket() if format == "knockout" else None
+
+    @property
+    def current_round(self):
+        """Number of rounds played so far"""
+        return len(self.rounds)
+
+    def is_finished(self):
+        """Check whether every round has been played"""
+        if self.format == "knockout":
+            return len(self._bracket) <= 1
+        return self.current_round >= self.total_rounds
+
+    def pair_round(self):
+        """
+        Pair the next round.
+
+        Returns:
+            Tuple of (list of (White, Black) Entrant pairs, list of Entrants with a bye)
+        """
+        if self.format == "round_robin":
+            return self._pair_round_robin()
+        if self.format == "knockout":
+            return self._pair_knockout()
+        return self._pair_swiss()
+
+    def play_round(self, play_player_game: Optional[Callable[[Entrant], str]] = None):
+        """
+        Pair and play the next round.
+
+        All games between NPCs are simulated together; the player's game (if
+        any) is handed to play_player_game.
+
+        Args:
+            play_player_game: Function taking the opponent and returning the
+                player's result ("win", "loss", "draw"). Without it, the
+                player's games are simulated too.
+
+        Returns:
+            List of game dictionaries with white, black and result ("1-0",
+            "0-1" or "1/2-1/2"), plus the entrants who had a bye as black=None
+        """
+        pairs, byes = self.pair_round()
+
+        npc_pairs = [pair for pair in pairs if not (play_player_game and self._has_player(pair))]
+        results = dict(zip(npc_pairs, self._simulate(npc_pairs)))
+
+        for pair in pairs:
+            if pair not in results:
+                results[pair] = self._player_result(pair, play_player_game(self._opponent_of_player(pair)))
+
+        if self.format == "knockout":
+            for pair in pairs:
+                results[pair] = self._knockout_playoffs(pair, results[pair], play_player_game)
+
+        games = []
+        for white, black in pairs:
+            result = results[(white, black)]
+            self._record(white, black, result)
+            games.append({"white": white, "black": black, "result": result})
+
+        for entrant in byes:
+            # A Swiss bye is a free point; in the other formats it only means sitting out
+            if self.format == "swiss":
+                entrant.points += 1.0
+            entrant.had_bye = True
+            games.append({"white": entrant, "black": None, "result": "bye"})
+
+        if self.format == "knockout":
+            self._advance(games)
+
+        self.rounds.append(games)
+        return games
+
+    def standings(self):
+        """
+        Get the standings.
+
+        Returns:
+            List of (Entrant, tiebreak) sorted from first to last place.
+            The tiebreak is Sonneborn-Berger in round robins and Buchholz otherwise.
+        """
+        points = {entrant.name: entrant.points for entrant in self.entrants}
+
+        def tiebreak(entrant):
+            if self.format == "round_robin":
+                return sum(points[opponent] * score for opponent, score in self._scores_against(entrant))
+            return sum(points[opponent] for opponent in entrant.opponents)
+
+        table = [(entrant, tiebreak(entrant)) for entrant in self.entrants]
+        if self.format == "knockout":
+            # Survivors first, then by how far each got
+            table.sort(key=lambda row: (row[0].eliminated, -len(row[0].opponents), row[0].seed))
+        else:
+            table.sort(key=lambda row: (-row[0].points, -row[1], row[0].seed))
+        return table
+
+    def winner(self):
+        """The tournament winner, or None while it is still running"""
+        if not self.is_finished():
+            return None
+        return self.standings()[0][0]
+
+    # -- Pairing ------------------------------------------------------------
+
+    def _round_robin_schedule(self):
+        """Berger tables by the circle method"""
+        players = list(self.entrants)
+        if len(players) % 2:
+            players.append(None)
+
+        schedule = []
+        for round_number in range(len(players) - 1):
+            pairs = []
+            for i in range(len(players) // 2):
+                a, b = players[i], players[-1 - i]
+                pairs.append((a, b) if (round_number + i) % 2 == 0 else (b, a))
+            schedule.append(pairs)
+            # Keep the first player fixed and rotate the rest
+            players = [players[0], players[-1]] + players[1:-1]
+        return schedule
+
+    def _pair_round_robin(self):
+        pairs, byes = [], []
+        for white, black in self._schedule[self.current_round]:
+            if white is None or black is None:
+                byes.append(white or black)
+            else:
+                pairs.append(self._player_plays_white(white, black))
+        return pairs, byes
+
+    def _pair_swiss(self):
+        """Pair within score groups, avoiding rematches and balancing colours"""
+        ranked = sorted(self.entrants, key=lambda e: (-e.points, e.seed))
+
+        byes = []
+        if len(ranked) % 2:
+            # The lowest ranked entrant who hasn't had a bye yet sits out
+            bye = next((e for e in reversed(ranked) if not e.had_bye), ranked[-1])
+            ranked.remove(bye)
+            byes.append(bye)
+
+        matched = self._match_up(ranked, allow_rematch=False)
+        if matched is None:
+            matched = self._match_up(ranked, allow_rematch=True)
+        return [self._assign_colors(a, b) for a, b in matched], byes
+
+    def _match_up(self, ranked, allow_rematch):
+        """Pair each entrant with the closest-ranked available opponent, backtracking if stuck"""
+        if not ranked:
+            return []
+
+        first, rest = ranked[0], ranked[1:]
+        for i, opponent in enumerate(rest):
+            if not allow_rematch and opponent.name in first.opponents:
+                continue
+            remaining = self._match_up(rest[:i] + rest[i + 1:], allow_rematch)
+            if remaining is not None:
+                return [(first, opponent)] + remaining
+        return None
+
+    def _assign_colors(self, a, b):
+        """Give White to whoever has had it less often (the higher ranked on a tie)"""
+        if a.is_player or b.is_player:
+            return self._player_plays_white(a, b)
+        if a.color_balance() != b.color_balance():
+            return (a, b) if a.color_balance() < b.color_balance() else (b, a)
+        if a.colors and a.colors[-1] == "w":
+            return b, a
+        return a, b
+
+    def _player_plays_white(self, white, black):
+        return (black, white) if black.is_player else (white, black)
+
+    def _knockout_bracket(self):
+        """Seed the bracket so the top seeds can only meet in the late rounds"""
+        size = 1 << math.ceil(math.log2(len(self.entrants)))
+        order = [1]
+        while len(order) < size:
+            total = len(order) * 2 + 1
+            order = [seed for s in order for seed in (s, total - s)]
+        # Seeds beyond the field are byes
+        return [self.entrants[seed - 1] if seed <= len(self.entrants) else None for seed in order]
+
+    def _pair_knockout(self):
+        pairs, byes = [], []
+        for i in range(0, len(self._bracket), 2):
+            a, b = self._bracket[i], self._bracket[i + 1]
+            if a is None or b is None:
+                byes.append(a or b)
+            else:
+                pairs.append(self._assign_colors(a, b))
+        return pairs, byes
+
+    # -- Results ------------------------------------------------------------
+
+    def _simulate(self, pairs):
+        """Simulate a batch of games; returns results from White's point of view"""
+        if not pairs:
+            return []
+        outcomes = simulate_matches([white.elo + WHITE_ADVANTAGE for white, _ in pairs],
+                                    [black.elo for _, black in pairs])
+        return ["1-0" if outcome == WIN else "1/2-1/2" if outcome == DRAW else "0-1" for outcome in outcomes]
+
+    def _has_player(self, pair):
+        return pair[0].is_player or pair[1].is_player
+
+    def _opponent_of_player(self, pair):
+        return pair[1] if pair[0].is_player else pair[0]
+
+    def _player_result(self, pair, result):
+        """Convert the player's "win"/"loss"/"draw" to a result from White's point of view"""
+        player_is_white = pair[0].is_player
+        if result == "win":
+            return "1-0" if player_is_white else "0-1"
+        if result == "loss":
+            return "0-1" if player_is_white else "1-0"
+        return "1/2-1/2"
+
+    def _knockout_playoffs(self, pair, result, play_player_game):
+        """Replay drawn knockout games; the higher seed advances if they stay drawn"""
+        for _ in range(KNOCKOUT_PLAYOFFS):
+            if result != "1/2-1/2":
+                return result
+            if play_player_game and self._has_player(pair):
+                print("\nThe game was drawn. A playoff game will decide who advances.")
+                result = self._player_result(pair, play_player_game(self._opponent_of_player(pair)))
+            else:
+                result = self._simulate([pair])[0]
+
+        if result == "1/2-1/2":
+            white, black = pair
+            result = "1-0" if white.seed < black.seed else "0-1"
+        return result
+
+    def _record(self, white, black, result):
+        white_points, black_points = RESULT_POINTS[result]
+        white.points += white_points
+        black.points += black_points
+        white.opponents.append(black.name)
+        black.opponents.append(white.name)
+        white.colors.append("w")
+        black.colors.append("b")
+
+    def _scores_against(self, entrant):
+        """(opponent name, entrant's score) for each game the entrant played"""
+        for games in self.rounds:
+            for game in games:
+                if game["black"] is None:
+                    continue
+                white_points, black_points = RESULT_POINTS[game["result"]]
+                if game["white"] is entrant:
+                    yield game["black"].name, white_points
+                elif game["black"] is entrant:
+                    yield game["white"].name, black_points
+
+    def _advance(self, games):
+        """Move the winners of a knockout round into the next round"""
+        for game in games:
+            if game["black"] is not None:
+                loser = game["black"] if game["result"] == "1-0" else game["white"]
+                loser.eliminated = True
+
+        # The bracket keeps its order, so winners meet the winners next to them
+        self._bracket = [entrant for entrant in self._bracket if entrant is not None and not entrant.eliminated]